@@ -1,32 +1,11 @@
-import re
+#!/usr/bin/env python3
+"""Veraltet: ruft scripts/codemods/codemod.py mit der Regel 'chevron' auf (weitere Optionen werden durchgereicht)."""
+import os
+import sys
 
-files = [
-    r'c:\Users\mailt\OneDrive\KI Programme\wss-digital\module\src\pages\gamification\GamificationNutzen.tsx',
-    r'c:\Users\mailt\OneDrive\KI Programme\wss-digital\module\src\pages\gamification\DigitaleSpiele.tsx',
-    r'c:\Users\mailt\OneDrive\KI Programme\wss-digital\module\src\pages\gamification\Gesellschaftsspiele.tsx',
-]
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts', 'codemods'))
 
-# Matches: <span className={`...${CONDITION ? 'rotate-45' : ''}`}>➕</span>
-pattern = re.compile(
-    r'<span[^>]*\$\{([^?`]+?)\s*\?\s*\'rotate-45\'\s*:\s*\'\'\}[^`]*`\}>\u2795</span>'
-)
+import codemod  # noqa: E402
 
-def make_svg(condition):
-    cond = condition.strip()
-    return (
-        '<svg className={`w-5 h-5 text-slate-400 flex-shrink-0 ml-4 transform transition-transform '
-        '${' + cond + " ? 'rotate-180' : ''}"
-        '`} fill="none" viewBox="0 0 24 24" stroke="currentColor" strokeWidth={2}>'
-        '<path strokeLinecap="round" strokeLinejoin="round" d="M19 9l-7 7-7-7" /></svg>'
-    )
-
-for path in files:
-    with open(path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    matches = pattern.findall(content)
-    new_content = pattern.sub(lambda m: make_svg(m.group(1)), content)
-    with open(path, 'w', encoding='utf-8') as f:
-        f.write(new_content)
-    print(f'{len(matches)} replacements in {path.split(chr(92))[-1]}')
-
-print('Done.')
+if __name__ == '__main__':
+    sys.exit(codemod.main(['chevron'] + sys.argv[1:]))
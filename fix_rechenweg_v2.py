@@ -1,32 +1,11 @@
 #!/usr/bin/env python3
-# Advanced script to fix ALL rechenweg structures
+"""Veraltet: ruft scripts/codemods/codemod.py mit der Regel 'rechenweg-v2' auf (weitere Optionen werden durchgereicht)."""
+import os
+import sys
 
-import re
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts', 'codemods'))
 
-# Read the file
-with open(r"c:\Users\mailt\OneDrive\KI Programme\wss-digital\mathe-trainer\src\pages\rechnen_lernen\gleichungen\Generator_lineare.tsx", 'r', encoding='utf-8') as f:
-    lines = f.readlines()
+import codemod  # noqa: E402
 
-# Process each line
-new_lines = []
-for line in lines:
-    # Pattern: ['equation', 'equation  | op', ...
-    # Replace with: ['equation  | op', ...
-    
-    # More sophisticated pattern matching
-    match = re.search(r"\['([^']+)',\s*'(\1)\s+\|\s+([^']+)'", line)
-    if match:
-        equation = match.group(1)
-        operation = match.group(3)
-        # Replace in the line
-        old_pattern = f"['{equation}', '{equation}  | {operation}'"
-        new_pattern = f"['{equation}  | {operation}'"
-        line = line.replace(old_pattern, new_pattern)
-    
-    new_lines.append(line)
-
-# Write back
-with open(r"c:\Users\mailt\OneDrive\KI Programme\wss-digital\mathe-trainer\src\pages\rechnen_lernen\gleichungen\Generator_lineare.tsx", 'w', encoding='utf-8') as f:
-    f.writelines(new_lines)
-
-print("Fixed rechenweg structures")
+if __name__ == '__main__':
+    sys.exit(codemod.main(['rechenweg-v2'] + sys.argv[1:]))
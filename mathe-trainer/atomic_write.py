@@ -0,0 +1,60 @@
+"""Atomisches Schreiben für alle Generatoren (PDFs, GeoGebra/SVG-Seiten, Aufgabenbanken, Codemods).
+
+Geschrieben wird immer in eine temporäre Datei im Zielordner, die erst am Ende per
+os.replace an ihren Platz wandert - der Vite-Dev-Server (oder ein Webserver) sieht also
+entweder die alte oder die fertige neue Datei, nie eine halb geschriebene.
+
+    with atomic_output(path) as tmp:          # für Schreiber, die einen Dateinamen brauchen
+        c = canvas.Canvas(tmp); ...; c.save()
+    write_atomic(path, data, if_changed=True) # Bytes; gleiche Datei bleibt unberührt
+
+Ohne Abhängigkeiten außer der Standardbibliothek; die Skripte unter scripts/ nehmen
+mathe-trainer dafür in ihren sys.path auf.
+"""
+import hashlib
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+@contextmanager
+def atomic_output(path):
+    """
+    Liefert einen temporären Dateinamen im Zielordner. Erst wenn der Block ohne Fehler
+    durchläuft, wird die Datei per os.replace an `path` verschoben; die Rechte einer
+    schon vorhandenen Datei bleiben erhalten, neue Dateien bekommen 0644.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    os.close(fd)
+    try:
+        yield tmp
+        # mkstemp legt 0600 an - der Webserver muss die Datei aber lesen können
+        mode = os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def write_atomic(path, data, if_changed=False):
+    """
+    Schreibt data (Bytes) über atomic_output nach path. Mit if_changed=True bleibt eine
+    Datei, die schon genau diesen Inhalt hat (gleiche Größe und gleicher SHA-256), unberührt -
+    jede neu geschriebene Datei unter public/ löst sonst einen Vite-Build und ein Redeploy
+    aus. Liefert True, wenn die Datei geschrieben wurde.
+    """
+    if if_changed:
+        try:
+            if os.path.getsize(path) == len(data):
+                with open(path, 'rb') as f:
+                    if hashlib.sha256(f.read()).digest() == hashlib.sha256(data).digest():
+                        return False
+        except FileNotFoundError:
+            pass
+    with atomic_output(path) as tmp:
+        with open(tmp, 'wb') as f:
+            f.write(data)
+    return True
@@ -0,0 +1,393 @@
+"""
+Vorberechnete Aufgabenbanken für lineare Gleichungen als statische JSON-Shards
+
+Statt die Aufgaben als Literale in Generator_lineare.tsx mitzuliefern, erzeugt dieses
+Skript große, deduplizierte Banken mit vollständigem Rechenweg in exakter Bruchrechnung
+(fractions.Fraction) und schreibt sie nach public/aufgaben/<bank>/:
+
+    index.json                      Stufen mit Anzahl und Shard-Dateien (klein, ohne Hash)
+    einfach-000.3f2a9c41d0.json     bis zu SHARD_AUFGABEN Aufgaben, Name enthält den Inhalts-Hash
+    ...
+
+Eine Aufgabe hat dieselben Felder wie `Aufgabe` in Generator_lineare.tsx (id, aufgabe,
+loesung, rechenweg); der Rechenweg steht in der Schreibweise 'G  | op', 'G2', ... Die
+Web-App kann so die index.json laden und nur den Shard der gewählten Stufe holen; die
+Shards ändern mit dem Inhalt ihren Namen und dürfen unbegrenzt gecacht werden.
+
+Doppelte Aufgaben fallen über eine kanonische Form heraus: beide Seiten als (a, b) für
+a·x + b, ganzzahlig und gekürzt, Vorzeichen und Seitenreihenfolge normiert - '2x + 4 = 10',
+'4 + 2x = 10', '10 = 2x + 4' und 'x + 2 = 5' sind dieselbe Aufgabe.
+
+    python aufgaben_bank.py                          # 2000 Aufgaben pro Stufe
+    python aufgaben_bank.py --anzahl 20000 --seed 3
+    python aufgaben_bank.py --verify                 # jeden Rechenweg mit rechenweg_verify prüfen
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import sys
+from fractions import Fraction
+
+from atomic_write import write_atomic
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.join(HERE, 'public', 'aufgaben')
+# rechenweg_verify für --verify (erst in pruefen() importiert)
+CODEMODS = os.path.normpath(os.path.join(HERE, '..', 'scripts', 'codemods'))
+if CODEMODS not in sys.path:
+    sys.path.insert(0, CODEMODS)
+SHARD_AUFGABEN = 250
+ANZAHL = 2000
+# Versuche pro gewünschter Aufgabe, bevor eine Stufe mit weniger Aufgaben aufgibt
+VERSUCHE = 50
+
+
+# ============================================================================
+# FORMATIERUNG
+# ============================================================================
+
+def zahl(q):
+    """3, -1.5, 4/13 - endliche Dezimalbrüche als Dezimalzahl, sonst als Bruch."""
+    q = Fraction(q)
+    if q.denominator == 1:
+        return str(q.numerator)
+    d, stellen = q.denominator, 0
+    while d % 10 == 0 or d % 2 == 0 or d % 5 == 0:
+        d //= 10 if d % 10 == 0 else 2 if d % 2 == 0 else 5
+        stellen += 1
+    if d != 1:
+        return f'{q.numerator}/{q.denominator}'
+    # exakt, ohne den Umweg über float: 2.640625 statt 2.64062
+    ziffern = str(abs(q.numerator) * 10 ** stellen // q.denominator).rjust(stellen + 1, '0')
+    return f'{"-" if q < 0 else ""}{ziffern[:-stellen]}.{ziffern[-stellen:]}'.rstrip('0').rstrip('.')
+
+
+def term(a, var='x'):
+    """a·x als '2x', 'x', '-x'."""
+    if a == 1:
+        return var
+    if a == -1:
+        return '-' + var
+    return f'{zahl(a)}{var}'
+
+
+def seite(a, b, zahl_zuerst=False):
+    """a·x + b als Text, z.B. '2x - 3', '5 + x', '-x', '7'."""
+    if not a:
+        return zahl(b)
+    if not b:
+        return term(a)
+    if zahl_zuerst:
+        return f'{zahl(b)} {"+" if a > 0 else "-"} {term(abs(a))}'
+    return f'{term(a)} {"+" if b > 0 else "-"} {zahl(abs(b))}'
+
+
+def klammer(q):
+    """Zahl als Operand: negative in Klammern, ': (-4)'."""
+    return f'({zahl(q)})' if q < 0 else zahl(q)
+
+
+def loesung_text(x):
+    """'x = 5', 'x = 1.5' oder 'x = 4/13 ≈ 0.308' wie in den Generatoren."""
+    text = zahl(x)
+    if '/' in text:
+        return f'x = {text} ≈ {float(x):.3g}'
+    return f'x = {text}'
+
+
+# ============================================================================
+# RECHENWEG
+# ============================================================================
+
+def rechenweg(aufgabe, links, rechts, vorschritte=()):
+    """
+    Rechenweg für links = rechts mit links/rechts als (a, b) für a·x + b: erst alle x nach
+    links und alle Zahlen nach rechts (ein Schritt, '| -2x +7'), dann durch den Faktor
+    teilen. vorschritte sind (Umformung, neue Gleichung), z.B. Ausmultiplizieren.
+    Liefert (Lösung, Schritte) oder None, wenn die Gleichung keine oder jede Zahl löst.
+    """
+    (a, b), (c, d) = links, rechts
+    if a == c:
+        return None
+    schritte = []
+    aktuell = aufgabe
+    for op, neu in vorschritte:
+        schritte.append(f'{aktuell}  | {op}')
+        aktuell = neu
+
+    ops = []
+    if c:
+        ops.append(f'{"-" if c > 0 else "+"}{term(abs(c))}')
+    if b:
+        ops.append(f'{"-" if b > 0 else "+"}{zahl(abs(b))}')
+    if ops:
+        # einzelne Zahl wie in den Handaufgaben mit Leerzeichen: '| - 7'
+        op = f'{ops[0][0]} {ops[0][1:]}' if len(ops) == 1 and not c else ' '.join(ops)
+        a, b, c, d = a - c, 0, 0, d - b
+        schritte.append(f'{aktuell}  | {op}')
+        aktuell = f'{term(a)} = {zahl(d)}'
+
+    x = d / a
+    if a != 1:
+        if a == -1:
+            op = '· (-1)'
+        elif a.numerator == 1:
+            op = f'· {a.denominator}'
+        else:
+            op = f': {klammer(a)}'
+        schritte.append(f'{aktuell}  | {op}')
+    schritte.append(loesung_text(x))
+    return x, schritte
+
+
+# ============================================================================
+# VORLAGEN
+# ============================================================================
+# Jede Vorlage zieht zufällige ganze Koeffizienten und liefert (Aufgabe, links, rechts,
+# vorschritte, klammer) mit links/rechts als (a, b) der ausmultiplizierten Seiten.
+
+def _nz(rng, lo, hi):
+    """Zufallszahl in [lo, hi] ohne 0."""
+    while True:
+        v = rng.randint(lo, hi)
+        if v:
+            return v
+
+
+def _F(*werte):
+    return tuple(Fraction(w) for w in werte)
+
+
+def plus_minus(rng):
+    """x + b = c, x - b = c, b + x = c"""
+    b, c = _nz(rng, -50, 50), rng.randint(-50, 50)
+    zuerst = rng.random() < 0.3 and b > 0
+    return f'{seite(1, b, zuerst)} = {c}', _F(1, b), _F(0, c), (), False
+
+
+def mal(rng):
+    """ax = c"""
+    a = _nz(rng, -12, 12)
+    if a == 1:
+        a = 2
+    c = a * rng.randint(-12, 12)
+    return f'{term(a)} = {c}', _F(a, 0), _F(0, c), (), False
+
+
+def geteilt(rng):
+    """x : a = c"""
+    a, c = rng.randint(2, 12), _nz(rng, -12, 12)
+    return f'x : {a} = {c}', (Fraction(1, a), Fraction(0)), _F(0, c), (), False
+
+
+def minus_x(rng):
+    """b - x = c"""
+    b, c = rng.randint(1, 50), rng.randint(-50, 50)
+    return f'{b} - x = {c}', _F(-1, b), _F(0, c), (), False
+
+
+def ax_b(rng):
+    """ax + b = c"""
+    a, b = _nz(rng, -12, 12), _nz(rng, -30, 30)
+    if a == 1:
+        a = rng.randint(2, 12)
+    c = rng.randint(-60, 60)
+    return f'{seite(a, b)} = {c}', _F(a, b), _F(0, c), (), False
+
+
+def beidseitig(rng):
+    """ax + b = cx + d"""
+    a, c = _nz(rng, -12, 12), _nz(rng, -12, 12)
+    b, d = rng.randint(-30, 30), rng.randint(-30, 30)
+    return (f'{seite(a, b, rng.random() < 0.2)} = {seite(c, d, rng.random() < 0.2)}',
+            _F(a, b), _F(c, d), (), False)
+
+
+def _klammer_text(k, p, q):
+    """k(px + q) - mit k = -1 als -(px + q)."""
+    inner = seite(p, q)
+    return f'-({inner})' if k == -1 else f'{"" if k == 1 else k}({inner})'
+
+
+def klammern(rng):
+    """k(px + q) = c oder k(px + q) = m(rx + s) + e"""
+    k, p, q = _nz(rng, -9, 9), rng.randint(1, 5), _nz(rng, -12, 12)
+    links = _F(k * p, k * q)
+    if rng.random() < 0.5:
+        c = rng.randint(-60, 60)
+        rechts, rechts_text, rechts_aus = _F(0, c), str(c), str(c)
+    else:
+        m, r, s, e = _nz(rng, -9, 9), rng.randint(1, 5), _nz(rng, -12, 12), rng.randint(-20, 20)
+        rechts = _F(m * r, m * s + e)
+        rechts_text = _klammer_text(m, r, s) + (f' {"+" if e > 0 else "-"} {abs(e)}' if e else '')
+        aus = f'{term(m * r)} {"+" if m * s > 0 else "-"} {abs(m * s)}'
+        rechts_aus = aus + (f' {"+" if e > 0 else "-"} {abs(e)}' if e else '')
+    links_aus = f'{term(k * p)} {"+" if k * q > 0 else "-"} {abs(k * q)}'
+    aufgabe = f'{_klammer_text(k, p, q)} = {rechts_text}'
+    return aufgabe, links, rechts, (('Ausmultiplizieren', f'{links_aus} = {rechts_aus}'),), True
+
+
+def _ganz(x, grenze=20):
+    return x.denominator == 1 and abs(x) <= grenze
+
+
+# Stufe -> (Anzeigename, [(Vorlage, Gewicht)], Filter für "schöne" Lösungen)
+STUFEN = {
+    'einfach': ('Einfach', ((plus_minus, 4), (mal, 2), (geteilt, 1), (minus_x, 1)), lambda x: _ganz(x, 100)),
+    'mittel': ('Mittel', ((ax_b, 3), (beidseitig, 2)), lambda x: x.denominator in (1, 2) and abs(x) <= 20),
+    'schwer': ('Schwer', ((beidseitig, 1), (klammern, 3)), lambda x: x.denominator <= 12 and abs(x) <= 50),
+}
+
+
+# ============================================================================
+# BANK
+# ============================================================================
+
+def kanonisch(links, rechts, klammer=False):
+    """Schlüssel einer Gleichung: ganzzahlig, gekürzt, Vorzeichen und Seitenreihenfolge normiert."""
+    werte = links + rechts
+    nenner = math.lcm(*(w.denominator for w in werte))
+    ganz = [int(w * nenner) for w in werte]
+    teiler = math.gcd(*ganz) or 1
+    ganz = [w // teiler for w in ganz]
+    if next((w for w in ganz if w), 0) < 0:
+        ganz = [-w for w in ganz]
+    gedreht = ganz[2:] + ganz[:2]
+    if next((w for w in gedreht if w), 0) < 0:
+        gedreht = [-w for w in gedreht]
+    return klammer, min(tuple(ganz), tuple(gedreht))
+
+
+def stufe_erzeugen(stufe, anzahl, rng, gesehen=None):
+    """Bis zu anzahl Aufgaben der Stufe; gesehen (Menge kanonischer Schlüssel) gilt über Stufen hinweg."""
+    _, vorlagen, schoen = STUFEN[stufe]
+    funktionen = [f for f, _ in vorlagen]
+    gewichte = [g for _, g in vorlagen]
+    gesehen = set() if gesehen is None else gesehen
+    aufgaben = []
+    for _ in range(anzahl * VERSUCHE):
+        if len(aufgaben) >= anzahl:
+            break
+        vorlage = rng.choices(funktionen, gewichte)[0]
+        text, links, rechts, vorschritte, klammer = vorlage(rng)
+        schluessel = kanonisch(links, rechts, klammer)
+        if schluessel in gesehen:
+            continue
+        geloest = rechenweg(text, links, rechts, vorschritte)
+        if geloest is None or not schoen(geloest[0]):
+            continue
+        gesehen.add(schluessel)
+        x, schritte = geloest
+        aufgaben.append({
+            'id': f'{stufe[0]}{len(aufgaben) + 1}',
+            'aufgabe': text,
+            'loesung': int(x) if x.denominator == 1 else round(float(x), 6),
+            'rechenweg': schritte,
+        })
+    return aufgaben
+
+
+def erzeugen(anzahl=ANZAHL, seed=0, stufen=tuple(STUFEN)):
+    """{Stufe: [Aufgabe, ...]}; gleiche Argumente liefern dieselben Banken."""
+    rng = random.Random(seed)
+    gesehen = set()
+    return {stufe: stufe_erzeugen(stufe, anzahl, rng, gesehen) for stufe in stufen}
+
+
+def shard_bytes(aufgaben):
+    return json.dumps(aufgaben, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+SHARD_NAME = re.compile(r'(.+)-\d{3}\.[0-9a-f]{10}\.json')
+
+
+def index_laden(out_dir):
+    """Die Stufen der vorhandenen index.json in out_dir, {} wenn es keine (lesbare) gibt."""
+    try:
+        with open(os.path.join(out_dir, 'index.json'), encoding='utf-8') as f:
+            index = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return index.get('stufen', {}) if index.get('version') == 1 else {}
+
+
+def bank_schreiben(banken, out_dir, namen=None, shard_aufgaben=SHARD_AUFGABEN):
+    """
+    Schreibt {Stufe: Aufgaben} als Shards <stufe>-<nr>.<hash>.json nach out_dir und trägt sie
+    in index.json ein; Stufen, die banken nicht enthält, bleiben im Index und auf der Platte.
+    Nur geänderte Dateien werden geschrieben. Gelöscht werden nur Shard-Dateien der neu
+    geschriebenen Stufen, die der Index nicht mehr nennt - andere Dateien in out_dir bleiben
+    unberührt. Liefert (geschrieben, unverändert, gelöscht).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    index = {'version': 1, 'stufen': index_laden(out_dir)}
+    geschrieben, unveraendert = [], 0
+    for stufe, aufgaben in banken.items():
+        shards = []
+        for nr, start in enumerate(range(0, len(aufgaben), shard_aufgaben)):
+            data = shard_bytes(aufgaben[start:start + shard_aufgaben])
+            name = f'{stufe}-{nr:03d}.{hashlib.sha256(data).hexdigest()[:10]}.json'
+            if write_atomic(os.path.join(out_dir, name), data, if_changed=True):
+                geschrieben.append(name)
+            else:
+                unveraendert += 1
+            shards.append({'datei': name, 'anzahl': len(aufgaben[start:start + shard_aufgaben])})
+        index['stufen'][stufe] = {'name': (namen or {}).get(stufe, stufe), 'anzahl': len(aufgaben),
+                                  'shards': shards}
+    data = (json.dumps(index, ensure_ascii=False, indent=1) + '\n').encode('utf-8')
+    if write_atomic(os.path.join(out_dir, 'index.json'), data, if_changed=True):
+        geschrieben.append('index.json')
+    else:
+        unveraendert += 1
+
+    aktuell = {s['datei'] for eintrag in index['stufen'].values() for s in eintrag['shards']}
+    geloescht = []
+    for name in sorted(os.listdir(out_dir)):
+        m = SHARD_NAME.fullmatch(name)
+        if m and m.group(1) in banken and name not in aktuell:
+            os.remove(os.path.join(out_dir, name))
+            geloescht.append(name)
+    return geschrieben, unveraendert, geloescht
+
+
+def pruefen(banken):
+    """Rechnet jeden Rechenweg mit scripts/codemods/rechenweg_verify nach; liefert die fehlerhaften Aufgaben."""
+    from rechenweg_verify import OK, verify_steps
+    # Erzeugte Rechenwege müssen Schritt für Schritt stimmen, nicht nur äquivalent sein
+    return [a for aufgaben in banken.values() for a in aufgaben
+            if any(status != OK for status, _, _ in verify_steps(a['rechenweg']))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Aufgabenbank für lineare Gleichungen als JSON-Shards erzeugen.')
+    parser.add_argument('--anzahl', type=int, default=ANZAHL, help=f'Aufgaben pro Stufe (Standard: {ANZAHL})')
+    parser.add_argument('--seed', type=int, default=0, help='Zufallsstartwert')
+    parser.add_argument('--stufen', nargs='+', choices=list(STUFEN), default=list(STUFEN), help='nur diese Stufen')
+    parser.add_argument('--shard', type=int, default=SHARD_AUFGABEN, help='Aufgaben pro Shard')
+    parser.add_argument('--out', default=os.path.join(OUTPUT_DIR, 'lineare'), help='Zielordner')
+    parser.add_argument('--verify', action='store_true', help='Rechenwege exakt nachrechnen (rechenweg_verify)')
+    args = parser.parse_args(argv)
+
+    banken = erzeugen(args.anzahl, args.seed, args.stufen)
+    for stufe, aufgaben in banken.items():
+        print(f'{STUFEN[stufe][0]}: {len(aufgaben)} Aufgaben')
+    if args.verify:
+        fehler = pruefen(banken)
+        for a in fehler[:20]:
+            print(f'✗ {a["id"]}: {a["aufgabe"]} -> {a["rechenweg"]}')
+        if fehler:
+            print(f'{len(fehler)} Rechenwege fehlerhaft - nichts geschrieben')
+            return 1
+    namen = {stufe: STUFEN[stufe][0] for stufe in banken}
+    geschrieben, unveraendert, geloescht = bank_schreiben(banken, args.out, namen, args.shard)
+    print(f'{len(geschrieben)} Dateien geschrieben, {unveraendert} unverändert, {len(geloescht)} alte Shards gelöscht '
+          f'({args.out})')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,482 @@
+"""
+Aufgabenbanken für Bruchgleichungen und rein quadratische Gleichungen durch Aufzählung
+
+Anders als aufgaben_bank.py (Zufallsvorlagen) zählt dieses Skript alle Gleichungen einer
+Familie über die Koeffizientenbereiche auf, z.B. a/(x + p) = c/(x + q) für alle a, c, p, q
+mit |Koeffizient| <= --bereich. Pro Kandidat laufen nur billige Ganzzahl-Tests (Teilbarkeit,
+isqrt, ausgeschlossener Wert); erst die wenigen Treffer bekommen Text und Rechenweg in exakter
+Bruchrechnung. Kandidaten, die an einer gemeinsamen Bedingung scheitern, fallen als Block
+heraus, ohne aufgezählt zu werden; die Ausgabe nennt beide Zahlen getrennt:
+
+    Bruchgleichungen                          Quadratisch
+    einfach  b = x/a, b = a/x                 einfach  ax² + b = c mit ganzer Lösung, x² = k/d
+    mittel   a/(x + p) = b, a/x + b = c       mittel   ... mit a > 1 und b != 0 oder Dezimallösung
+    schwer   a/(x + p) = c/(x + q),           schwer   Bruch- und Wurzellösungen (x = ±√13 ≈ ±3.61)
+             (x + r)/(x + p) = c/(x + p) + b
+
+Verworfen werden Gleichungen ohne Lösung, Lösungen außerhalb von --max-loesung, nicht
+ganzzahlige Lösungen bei Bruchgleichungen und Lösungen, die einen ausgeschlossenen Wert
+treffen (x + 2 = 2(x + 2) + ... mit x = -2). Doppelte Gleichungen fallen über einen Index
+kanonischer Formen heraus (gekürzte Koeffizienten, normiertes Vorzeichen, Seitentausch).
+
+Aus allen Treffern einer Stufe wird mit --seed eine Stichprobe von --anzahl Aufgaben gezogen
+und wie in aufgaben_bank.py als Shards nach public/aufgaben/<bank>/ geschrieben. Die Felder
+entsprechen `Aufgabe` in Generator_Bruchgleichungen.tsx (loesung) und
+Generator_Quadratisch.tsx (loesungen).
+
+    python bruch_quadrat_bank.py                         # beide Banken, 2000 Aufgaben pro Stufe
+    python bruch_quadrat_bank.py --bank quadratisch --bereich 200 --seed 2026
+    python bruch_quadrat_bank.py --verify
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from fractions import Fraction
+
+from aufgaben_bank import ANZAHL, OUTPUT_DIR, SHARD_AUFGABEN, bank_schreiben, pruefen, seite, zahl
+
+BEREICH = 20
+MAX_LOESUNG = 50
+STUFEN = {'einfach': 'Einfach', 'mittel': 'Mittel', 'schwer': 'Schwer'}
+
+
+# ============================================================================
+# KANONISCHE FORM
+# ============================================================================
+
+def gekuerzt(werte):
+    """Ganze Zahlen durch ihren ggT geteilt, erste von 0 verschiedene positiv."""
+    teiler = math.gcd(*werte) or 1
+    if next((w for w in werte if w), 0) < 0:
+        teiler = -teiler
+    return tuple(w // teiler for w in werte)
+
+
+# ============================================================================
+# BRUCHGLEICHUNGEN
+# ============================================================================
+# Jede Familie hat eine Aufzählung (Bereich, Max. Lösung) -> (Stufe, Schlüssel, Parameter)
+# für die Treffer und einen Rechenweg (Parameter) -> Aufgabe. Die Aufzählungen rechnen nur
+# mit ganzen Zahlen und geben am Ende (einzeln geprüft, als Block verworfen) zurück: ein
+# Block sind alle Kandidaten, die an einer gemeinsamen Bedingung scheitern (z.B. a = c bei
+# a/(x + p) = c/(x + q)) und darum gar nicht erst aufgezählt werden.
+
+
+def _frac(zaehler, nenner):
+    return f'\\frac{{{zaehler}}}{{{nenner}}}'
+
+
+def _tex(text):
+    return f'${text}$'
+
+
+def _x_plus(p):
+    return seite(1, p)
+
+
+def _mal(k, p):
+    """k(x + p) - mit k = ±1 als (x + p) bzw. -(x + p)."""
+    return f'{"" if k == 1 else "-" if k == -1 else k}({_x_plus(p)})'
+
+
+def _nicht(p):
+    return f'Definitionsmenge: $x \\neq {zahl(-p)}$'
+
+
+def _linear(a1, b1, a2, b2):
+    """Schritte für a1·x + b1 = a2·x + b2 bis 'x = ...' (LaTeX), Umformung in Worten."""
+    k, m = a1 - a2, b2 - b1
+    schritte = []
+    if (a2, b1) != (0, 0):
+        schritte += ['Bringe alle x nach links und alle Zahlen nach rechts', _tex(f'{seite(k, 0)} = {zahl(m)}')]
+    if k == -1:
+        schritte += ['Multipliziere beide Seiten mit (-1)', _tex(f'x = {zahl(-m)}')]
+    elif k != 1:
+        schritte += [f'Teile beide Seiten durch {zahl(k) if k > 0 else f"({zahl(k)})"}', _tex(f'x = {zahl(m / k)}')]
+    return schritte
+
+
+def x_durch_a(bereich, max_loesung):
+    """b = x/a"""
+    n = 0
+    for a in range(2, bereich + 1):
+        for b in range(-bereich, bereich + 1):
+            n += 1
+            if b and abs(a * b) <= max_loesung:
+                yield 'einfach', ('x/a', a, b), (a, b)
+    return n, 0
+
+
+def x_durch_a_weg(a, b):
+    return _tex(f'{b} = {_frac("x", a)}'), a * b, [
+        _tex(f'{b} = {_frac("x", a)}'),
+        f'Multipliziere beide Seiten mit {a}',
+        _tex(f'{b} \\cdot {a} = {_frac("x", a)} \\cdot {a}'),
+        _tex(f'{a * b} = x'),
+        _tex(f'x = {a * b}'),
+    ]
+
+
+def a_durch_x(bereich, max_loesung):
+    """b = a/x"""
+    n = 0
+    for a in range(-bereich * 5, bereich * 5 + 1):
+        for b in range(-bereich, bereich + 1):
+            n += 1
+            if a and b and a % b == 0 and abs(a // b) <= max_loesung:
+                schluessel = ('a/x',) + gekuerzt((a, b))
+                yield 'einfach', schluessel, (a, b)
+    return n, 0
+
+
+def a_durch_x_weg(a, b):
+    aufgabe = _tex(f'{b} = {_frac(a, "x")}')
+    return aufgabe, a // b, [
+        aufgabe,
+        _nicht(0),
+        'Multipliziere beide Seiten mit x',
+        _tex(f'{seite(b, 0)} = {a}'),
+    ] + _linear(Fraction(b), Fraction(0), Fraction(0), Fraction(a))
+
+
+def verschoben(bereich, max_loesung):
+    """a/(x + p) = b  ->  x = a/b - p"""
+    n = block = 0
+    for a in range(1, bereich * 3 + 1):
+        for b in range(-bereich, bereich + 1):
+            if not b or a % b:
+                block += 2 * bereich + 1
+                continue
+            for p in range(-bereich, bereich + 1):
+                n += 1
+                # x = -p ist ausgeschlossen, a/b = 0 kommt mit a != 0 nicht vor
+                if p and abs(a // b - p) <= max_loesung:
+                    yield 'mittel', ('a/(x+p)',) + gekuerzt((a, b)) + (p,), (a, b, p)
+    return n, block
+
+
+def verschoben_weg(a, b, p):
+    aufgabe = _tex(f'{_frac(a, _x_plus(p))} = {b}')
+    return aufgabe, a // b - p, [
+        aufgabe,
+        _nicht(p),
+        f'Multipliziere beide Seiten mit $({_x_plus(p)})$',
+        _tex(f'{a} = {_mal(b, p)}'),
+        _tex(f'{a} = {seite(b, b * p)}'),
+    ] + _linear(Fraction(0), Fraction(a), Fraction(b), Fraction(b * p))
+
+
+def summe(bereich, max_loesung):
+    """a/x + b = c  ->  x = a/(c - b)"""
+    n = 0
+    for a in range(1, bereich * 3 + 1):
+        for b in range(-bereich, bereich + 1):
+            for c in range(-bereich, bereich + 1):
+                n += 1
+                d = c - b
+                if b and d and a % d == 0 and abs(a // d) <= max_loesung:
+                    yield 'mittel', ('a/x+b',) + gekuerzt((a, b, c)), (a, b, c)
+    return n, 0
+
+
+def summe_weg(a, b, c):
+    aufgabe = _tex(f'{_frac(a, "x")} {"+" if b > 0 else "-"} {abs(b)} = {c}')
+    return aufgabe, a // (c - b), [
+        aufgabe,
+        _nicht(0),
+        'Multipliziere beide Seiten mit x',
+        _tex(f'{seite(b, a, zahl_zuerst=True)} = {seite(c, 0)}'),
+    ] + _linear(Fraction(b), Fraction(a), Fraction(c), Fraction(0))
+
+
+def paar(bereich, max_loesung):
+    """a/(x + p) = c/(x + q)  ->  (a - c)x = cp - aq"""
+    n = block = 0
+    spanne = range(-bereich, bereich + 1)
+    for a in range(1, bereich + 1):
+        for c in range(1, bereich + 1):
+            k = a - c
+            if not k:
+                block += len(spanne) ** 2
+                continue
+            for p in spanne:
+                cp = c * p
+                for q in spanne:
+                    n += 1
+                    m = cp - a * q
+                    if m % k:
+                        continue
+                    x = m // k
+                    # ausgeschlossene Werte -p und -q
+                    if x == -p or x == -q or abs(x) > max_loesung:
+                        continue
+                    schluessel = min(gekuerzt((a, c)) + (p, q), gekuerzt((c, a)) + (q, p))
+                    yield 'schwer', ('paar',) + schluessel, (a, p, c, q)
+    return n, block
+
+
+def paar_weg(a, p, c, q):
+    aufgabe = _tex(f'{_frac(a, _x_plus(p))} = {_frac(c, _x_plus(q))}')
+    return aufgabe, (c * p - a * q) // (a - c), [
+        aufgabe,
+        f'Definitionsmenge: $x \\neq {zahl(-p)}$, $x \\neq {zahl(-q)}$',
+        f'Multipliziere beide Seiten mit $({_x_plus(p)})({_x_plus(q)})$',
+        _tex(f'{_mal(a, q)} = {_mal(c, p)}'),
+        _tex(f'{seite(a, a * q)} = {seite(c, c * p)}'),
+    ] + _linear(Fraction(a), Fraction(a * q), Fraction(c), Fraction(c * p))
+
+
+def falle(bereich, max_loesung):
+    """(x + r)/(x + p) = c/(x + p) + b  ->  (1 - b)x = c + bp - r"""
+    n = block = 0
+    spanne = range(-bereich, bereich + 1)
+    for b in spanne:
+        k = 1 - b
+        if not (b and k):
+            block += len(spanne) ** 2 * bereich
+            continue
+        for p in spanne:
+            bp = b * p
+            for r in spanne:
+                for c in range(1, bereich + 1):
+                    n += 1
+                    m = c + bp - r
+                    if m % k:
+                        continue
+                    x = m // k
+                    # x = -p macht den Nenner 0 - die typische Falle, die Lösung fällt weg
+                    if x == -p or not p or r == p or abs(x) > max_loesung:
+                        continue
+                    yield 'schwer', ('falle', r, p, c, b), (r, p, c, b)
+    return n, block
+
+
+def falle_weg(r, p, c, b):
+    aufgabe = _tex(f'{_frac(_x_plus(r), _x_plus(p))} = {_frac(c, _x_plus(p))} {"+" if b > 0 else "-"} {abs(b)}')
+    return aufgabe, (c + b * p - r) // (1 - b), [
+        aufgabe,
+        _nicht(p),
+        f'Multipliziere beide Seiten mit $({_x_plus(p)})$',
+        _tex(f'{_x_plus(r)} = {c} {"+" if b > 0 else "-"} {_mal(abs(b), p)}'),
+        _tex(f'{_x_plus(r)} = {seite(b, c + b * p)}'),
+    ] + _linear(Fraction(1), Fraction(r), Fraction(b), Fraction(c + b * p))
+
+
+BRUCH_FAMILIEN = {
+    'x/a': (x_durch_a, x_durch_a_weg),
+    'a/x': (a_durch_x, a_durch_x_weg),
+    'a/(x+p)': (verschoben, verschoben_weg),
+    'a/x+b': (summe, summe_weg),
+    'paar': (paar, paar_weg),
+    'falle': (falle, falle_weg),
+}
+
+
+def bruch_aufgabe(familie, parameter):
+    aufgabe, x, rechenweg = BRUCH_FAMILIEN[familie][1](*parameter)
+    return {'aufgabe': aufgabe, 'loesung': x, 'rechenweg': rechenweg}
+
+
+# ============================================================================
+# QUADRATISCH
+# ============================================================================
+
+# Nenner der Wurzel, bei denen die Lösung ein endlicher Dezimalbruch ist
+DEZIMAL = {1, 2, 4, 5, 8, 10, 20, 25, 50, 100}
+
+
+def _stufe_quadrat(a, n, b, max_loesung):
+    """
+    Stufe für ax² = n (n = c - b), ohne Text: einfach bei ganzer Lösung und a = 1 oder b = 0,
+    mittel bei ganzer Lösung sonst oder endlicher Dezimallösung, schwer bei Bruch- oder
+    Wurzellösung mit kleinem Nenner. None, wenn die Lösung nicht "schön" ist.
+    """
+    g = math.gcd(n, a)
+    zaehler, nenner = n // g, a // g
+    wz, wn = math.isqrt(zaehler), math.isqrt(nenner)
+    if zaehler > max_loesung ** 2 * nenner:
+        return None
+    if wz * wz == zaehler and wn * wn == nenner:
+        if wn == 1:
+            return 'einfach' if a == 1 or not b else 'mittel'
+        return 'mittel' if wn in DEZIMAL else 'schwer'
+    return 'schwer' if nenner <= 9 else None
+
+
+def rein(bereich, max_loesung):
+    """
+    ax² + b = c mit a = 1..bereich und |b|, |c| <= 5·bereich. Die Lösung hängt nur von a und
+    d = c - b ab: jedes d wird einmal eingestuft, nur für brauchbare d werden die Paare (b, c)
+    durchlaufen - die übrigen Kandidaten fallen als Ganzes heraus.
+    """
+    grenze = bereich * 5
+    n = block = 0
+    for a in range(1, bereich + 1):
+        # alle (b, c) mit c <= b: keine oder nur die Lösung 0
+        block += (grenze + 1) * (2 * grenze + 1)
+        for d in range(1, 2 * grenze + 1):
+            paare = 2 * grenze - d + 1
+            stufe = _stufe_quadrat(a, d, 1, max_loesung)
+            if stufe is None:
+                block += paare
+                continue
+            n += paare
+            teiler = math.gcd(a, d)
+            for b in range(-grenze, grenze - d + 1):
+                # ggT(a, b, c) = ggT(a, d, b): nur gekürzte Gleichungen
+                if math.gcd(teiler, b) == 1:
+                    yield (_stufe_quadrat(a, d, b, max_loesung) if not b else stufe), ('rein', a, b, b + d), (a, b, b + d)
+    return n, block
+
+
+def wurzel(q):
+    """Lösungstext für x² = q: '±3', '±1.5', '±1/3', '±√13 ≈ ±3.61', '±√(11/4) ≈ ±1.66'."""
+    wz, wn = math.isqrt(q.numerator), math.isqrt(q.denominator)
+    if wz * wz == q.numerator and wn * wn == q.denominator:
+        return f'±{zahl(Fraction(wz, wn))}'
+    radikand = str(q.numerator) if q.denominator == 1 else f'({q.numerator}/{q.denominator})'
+    return f'±√{radikand} ≈ ±{math.sqrt(q):.2f}'
+
+
+def quadrat_text(a, b):
+    x2 = 'x²' if a == 1 else f'{zahl(a)}x²'
+    return x2 if not b else f'{x2} {"+" if b > 0 else "-"} {zahl(abs(b))}'
+
+
+def rein_weg(a, b, c):
+    aufgabe = f'{quadrat_text(a, b)} = {zahl(c)}'
+    q = Fraction(c - b, a)
+    schritte = []
+    aktuell = aufgabe
+    if b:
+        schritte.append(f'{aktuell}  | {"-" if b > 0 else "+"}{zahl(abs(b))}')
+        aktuell = f'{quadrat_text(a, 0)} = {zahl(c - b)}'
+    if a != 1:
+        schritte.append(f'{aktuell}  | :{zahl(a)}')
+        aktuell = f'x² = {zahl(q)}'
+    schritte += [aktuell, f'x = {wurzel(q)}']
+    return aufgabe, q, schritte
+
+
+def bruchquadrat(bereich, max_loesung):
+    """x² = k/d mit quadratischem Zähler und Nenner"""
+    n = 0
+    for d in range(2, bereich * 5 + 1):
+        wd = math.isqrt(d)
+        for k in range(1, bereich * 10 + 1):
+            n += 1
+            if wd * wd != d:
+                continue
+            wk = math.isqrt(k)
+            if wk * wk == k and math.gcd(k, d) == 1 and k <= max_loesung ** 2 * d:
+                yield ('einfach' if wd in DEZIMAL else 'mittel'), ('k/d', k, d), (k, d)
+    return n, 0
+
+
+def bruchquadrat_weg(k, d):
+    q = Fraction(k, d)
+    aufgabe = f'x² = {zahl(q)}'
+    return aufgabe, q, [aufgabe, f'x = {wurzel(q)}']
+
+
+QUADRAT_FAMILIEN = {
+    'rein': (rein, rein_weg),
+    'k/d': (bruchquadrat, bruchquadrat_weg),
+}
+
+
+def quadrat_aufgabe(familie, parameter):
+    aufgabe, q, rechenweg = QUADRAT_FAMILIEN[familie][1](*parameter)
+    x = math.sqrt(q)
+    x = int(x) if x.is_integer() else round(x, 6)
+    return {'aufgabe': aufgabe, 'loesungen': [-x, x], 'rechenweg': rechenweg}
+
+
+BANKEN = {
+    'bruchgleichungen': (BRUCH_FAMILIEN, bruch_aufgabe),
+    'quadratisch': (QUADRAT_FAMILIEN, quadrat_aufgabe),
+}
+
+
+# ============================================================================
+# BANK
+# ============================================================================
+
+def durchsuchen(bank, bereich=BEREICH, max_loesung=MAX_LOESUNG):
+    """
+    Liefert ({Stufe: [(Familie, Parameter), ...]} aller Treffer ohne Dubletten,
+    {Familie: (einzeln geprüft, als Block verworfen)}).
+    """
+    familien, _ = BANKEN[bank]
+    treffer = {stufe: [] for stufe in STUFEN}
+    kandidaten = {}
+    gesehen = set()
+    for familie, (aufzaehlung, _) in familien.items():
+        suche = aufzaehlung(bereich, max_loesung)
+        while True:
+            try:
+                stufe, schluessel, parameter = next(suche)
+            except StopIteration as ende:
+                kandidaten[familie] = ende.value
+                break
+            if schluessel in gesehen:
+                continue
+            gesehen.add(schluessel)
+            treffer[stufe].append((familie, parameter))
+    return treffer, kandidaten
+
+
+def erzeugen(bank, treffer, anzahl=ANZAHL, seed=0):
+    """Zieht bis zu anzahl Treffer pro Stufe und baut daraus die Aufgaben mit Rechenweg."""
+    _, aufgabe = BANKEN[bank]
+    rng = random.Random(seed)
+    banken = {}
+    for stufe, kandidaten in treffer.items():
+        auswahl = rng.sample(kandidaten, min(anzahl, len(kandidaten)))
+        banken[stufe] = [{'id': f'{stufe[0]}{i}', **aufgabe(familie, parameter)}
+                         for i, (familie, parameter) in enumerate(auswahl, 1)]
+    return banken
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Bruchgleichungen und quadratische Gleichungen aufzählen und als JSON-Shards schreiben.')
+    parser.add_argument('--bank', nargs='+', choices=list(BANKEN), default=list(BANKEN), help='nur diese Banken')
+    parser.add_argument('--anzahl', type=int, default=ANZAHL, help=f'Aufgaben pro Stufe (Standard: {ANZAHL})')
+    parser.add_argument('--seed', type=int, default=0, help='Zufallsstartwert für die Auswahl')
+    parser.add_argument('--bereich', type=int, default=BEREICH, help=f'größter Betrag der Koeffizienten (Standard: {BEREICH})')
+    parser.add_argument('--max-loesung', type=int, default=MAX_LOESUNG, help=f'größter Betrag der Lösung (Standard: {MAX_LOESUNG})')
+    parser.add_argument('--shard', type=int, default=SHARD_AUFGABEN, help='Aufgaben pro Shard')
+    parser.add_argument('--out', default=OUTPUT_DIR, help='Zielordner, je Bank ein Unterordner')
+    parser.add_argument('--verify', action='store_true', help='Rechenwege exakt nachrechnen (rechenweg_verify)')
+    args = parser.parse_args(argv)
+
+    fehlerhaft = 0
+    for bank in args.bank:
+        start = time.perf_counter()
+        treffer, kandidaten = durchsuchen(bank, args.bereich, args.max_loesung)
+        sekunden = time.perf_counter() - start
+        geprueft = sum(n for n, _ in kandidaten.values())
+        block = sum(b for _, b in kandidaten.values())
+        print(f'{bank}: {geprueft + block:,} Kandidaten in {sekunden:.2f} s '
+              f'({geprueft:,} einzeln geprüft, {block:,} als Block verworfen), '
+              + ', '.join(f'{len(t):,} {stufe}' for stufe, t in treffer.items()))
+
+        banken = erzeugen(bank, treffer, args.anzahl, args.seed)
+        if args.verify:
+            fehler = pruefen(banken)
+            for a in fehler[:20]:
+                print(f'✗ {a["id"]}: {a["aufgabe"]} -> {a["rechenweg"]}')
+            if fehler:
+                print(f'{len(fehler)} Rechenwege fehlerhaft - {bank} nicht geschrieben')
+                fehlerhaft += len(fehler)
+                continue
+        geschrieben, unveraendert, geloescht = bank_schreiben(banken, os.path.join(args.out, bank), STUFEN, args.shard)
+        print(f'  {len(geschrieben)} Dateien geschrieben, {unveraendert} unverändert, {len(geloescht)} alte Shards gelöscht')
+    return 1 if fehlerhaft else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
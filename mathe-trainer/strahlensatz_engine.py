@@ -0,0 +1,802 @@
+"""
+Gemeinsame Engine für die Strahlensatz-Aufgaben unter public/geogebra.
+
+generate_geogebra_files.py (GeoGebra-Applet mit eingebetteter .ggb-Konstruktion) und
+generate_geogebra_simple.py (reines SVG) zeichnen dieselbe Figur: zwei Strahlen aus Z
+und zwei Parallelen, die sie in A/A' und B/B' schneiden. Hier wird die Geometrie einmal
+pro Aufgabe berechnet und für jedes Backend über Vorlagen ausgegeben, die einmal pro
+Lauf zu Python-Funktionen übersetzt werden (Vorlage).
+
+Dateien werden nur geschrieben, wenn sich ihr Inhalt geändert hat (atomic_write.write_atomic
+mit SHA-256-Vergleich) - jede neu geschriebene Datei unter public/ löst sonst einen
+kompletten Vite-Build und ein Redeploy aus.
+
+    python strahlensatz_engine.py                              # SVG-Seiten
+    python strahlensatz_engine.py --backends geogebra svg --jobs 4
+    python strahlensatz_engine.py --pool 5000 --seed 1 --out /tmp/pool   # zufälliger Pool
+    python strahlensatz_engine.py --backends svg geogebra --gallery galerie.html
+
+Mit mehreren Backends bekommt das erste Backend <name>.html, jedes weitere
+<name>.<backend>.html. Das GeoGebra-Backend schreibt zusätzlich <name>.ggb.
+
+--gallery schreibt stattdessen eine einzige Seite mit allen Aufgaben (gallery_html):
+SVG-Figuren erst beim Scrollen, höchstens ein GeoGebra-Applet für die ganze Seite.
+
+Die SVG-Figuren schreibt svg_writer kompakt (gerundete Koordinaten, zusammengefasste
+Pfade, CSS-Klassen); --precision setzt die Nachkommastellen, --report-svg zeigt die
+Ersparnis gegenüber der alten Figur.
+"""
+import argparse
+import base64
+import io
+import math
+import os
+import string
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import escape, quoteattr
+
+from atomic_write import write_atomic
+from svg_writer import SvgWriter, style_css
+
+# Zielverzeichnis
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'public', 'geogebra')
+# Aufgaben pro Auftrag an einen Worker
+BATCH_AUFGABEN = 200
+
+# Definiere 6 verschiedene Aufgaben; die Messwerte stammen aus strahlensatz_solver (passen zur Zeichnung)
+AUFGABEN = [
+    {
+        'name': 'aufgabe1',
+        'ray1_angle': 60,
+        'ray2_angle': 25,
+        'ray_length': 15,
+        'ray2_length': 12,
+        'parallel1_t': 0.35,
+        'parallel2_t': 0.70,
+        'measurements': {'ZA': 5, 'AB': 5, 'ZA_strich': 4, 'AB_strich': 'x'}
+    },
+    {
+        'name': 'aufgabe2',
+        'ray1_angle': 55,
+        'ray2_angle': 30,
+        'ray_length': 15,
+        'ray2_length': 12,
+        'parallel1_t': 0.35,
+        'parallel2_t': 0.75,
+        'measurements': {'ZA': 35, 'AB': 40, 'ZA_strich': 'y', 'AB_strich': 32}
+    },
+    {
+        'name': 'aufgabe3',
+        'ray1_angle': 65,
+        'ray2_angle': 20,
+        'ray_length': 15,
+        'ray2_length': 12.5,
+        'parallel1_t': 0.30,
+        'parallel2_t': 0.65,
+        'measurements': {'ZA': 36, 'AB': 42, 'ZA_strich': 30, 'AB_strich': 'x'}
+    },
+    {
+        'name': 'aufgabe4',
+        'ray1_angle': 50,
+        'ray2_angle': 35,
+        'ray_length': 15,
+        'ray2_length': 12,
+        'parallel1_t': 0.40,
+        'parallel2_t': 0.75,
+        'measurements': {'ZA': 40, 'AB': 35, 'ZA_strich': 32, 'AB_strich': 'x'}
+    },
+    {
+        'name': 'aufgabe5',
+        'ray1_angle': 58,
+        'ray2_angle': 28,
+        'ray_length': 15,
+        'ray2_length': 9,
+        'parallel1_t': 0.25,
+        'parallel2_t': 0.60,
+        'measurements': {'ZA': 25, 'AB': 35, 'ZA_strich': 'y', 'AB_strich': 21}
+    },
+    {
+        'name': 'aufgabe6',
+        'ray1_angle': 62,
+        'ray2_angle': 22,
+        'ray_length': 15,
+        'ray2_length': 10,
+        'parallel1_t': 0.35,
+        'parallel2_t': 0.70,
+        'measurements': {'ZA': 6, 'AB': 6, 'ZA_strich': 'y', 'AB_strich': 4}
+    }
+]
+
+
+class Vorlage:
+    """
+    Format-Vorlage wie bei str.format ({name}, {name:spec}, {{ und }} für Klammern), die beim
+    Anlegen einmal in einen f-String übersetzt wird. render(**werte) ist danach ein einziger
+    Funktionsaufruf ohne erneutes Parsen; überzählige Werte werden ignoriert.
+    """
+
+    def __init__(self, text):
+        stuecke, felder = [], []
+        for literal, feld, spec, conversion in string.Formatter().parse(text):
+            if literal:
+                stuecke.append('f' + repr(literal.replace('{', '{{').replace('}', '}}')))
+            if feld is None:
+                continue
+            if not feld.isidentifier() or conversion or '{' in spec:
+                raise ValueError(f'Vorlagenfeld {feld!r}: nur einfache Namen mit optionalem Format')
+            if feld not in felder:
+                felder.append(feld)
+            stuecke.append('f' + repr('{%s%s}' % (feld, ':' + spec if spec else '')))
+        self.felder = tuple(felder)
+        parameter = ', '.join(('*',) + self.felder + ('**_',)) if felder else '**_'
+        self.render = eval(compile(f"lambda {parameter}: {' '.join(stuecke) or repr('')}", '<vorlage>', 'eval'))
+
+
+class Geometrie:
+    """Richtungen der Strahlen und Lage der Parallelen einer Aufgabe - unabhängig vom Backend."""
+
+    def __init__(self, aufgabe):
+        self.aufgabe = aufgabe
+        ray1_angle = math.radians(aufgabe['ray1_angle'])
+        ray2_angle = math.radians(aufgabe['ray2_angle'])
+        self.richtung1 = math.cos(ray1_angle), math.sin(ray1_angle)
+        self.richtung2 = math.cos(ray2_angle), math.sin(ray2_angle)
+
+    def punkte(self, Z, massstab=1):
+        """Z, P1, P2, A, A', B, B' für ein Backend mit Zentrum Z und massstab Einheiten pro Längeneinheit."""
+        ray_length = self.aufgabe['ray_length'] * massstab
+        ray2_length = self.aufgabe.get('ray2_length', self.aufgabe['ray_length']) * massstab
+        P1 = Z[0] + ray_length * self.richtung1[0], Z[1] + ray_length * self.richtung1[1]
+        P2 = Z[0] + ray2_length * self.richtung2[0], Z[1] + ray2_length * self.richtung2[1]
+
+        def auf_strahl(P, t):
+            return Z[0] + t * (P[0] - Z[0]), Z[1] + t * (P[1] - Z[1])
+
+        # Parallele 1 schneidet in A und A', Parallele 2 in B und B'
+        t1 = self.aufgabe['parallel1_t']
+        t2 = self.aufgabe['parallel2_t']
+        return {
+            'Z': Z, 'P1': P1, 'P2': P2,
+            'A': auf_strahl(P1, t1), "A'": auf_strahl(P2, t1),
+            'B': auf_strahl(P1, t2), "B'": auf_strahl(P2, t2),
+        }
+
+
+# ---- Backend GeoGebra: Konstruktion als geogebra.xml, gepackt als .ggb und in die HTML-Seite eingebettet
+
+# Sichtbarer Ausschnitt (xmin, xmax, ymin, ymax) und Standardgröße des Applets in Pixeln
+VIEW = (-2, 18, -2, 25)
+APPLET_SIZE = (1000, 700)
+GGB_ZENTRUM = (2, 15)
+
+# Farben (r, g, b) der Längenlabels
+GRUEN = (0, 100, 0)
+ROT = (255, 0, 0)
+# Platzhalter der gesuchten Länge in 'measurements' - welche Strecke es ist, wechselt (solver.random_pool)
+GESUCHT = ('x', 'y')
+
+# Linientyp "kurz gestrichelt" steht als type="10" in GGB_XML (entspricht setLineStyle(..., 2))
+GGB_XML = Vorlage('''<?xml version="1.0" encoding="utf-8"?>
+<geogebra format="5.0">
+<euclidianView>
+<size width="{width}" height="{height}"/>
+<coordSystem xZero="{x_zero}" yZero="{y_zero}" scale="{xscale}" yscale="{yscale}"/>
+<evSettings axes="true" grid="true" gridIsBold="false" pointCapturing="3" rightAngleStyle="1" checkboxSize="26" gridType="3"/>
+</euclidianView>
+<kernel><decimals val="2"/></kernel>
+<construction title="" author="" date="">
+<element type="point" label="Z"><show object="true" label="true"/><objColor r="0" g="0" b="0" alpha="0"/><coords x="{z_x}" y="{z_y}" z="1"/><pointSize val="6"/></element>
+<element type="point" label="P1"><show object="false" label="false"/><objColor r="0" g="0" b="0" alpha="0"/><coords x="{p1_x}" y="{p1_y}" z="1"/><pointSize val="3"/></element>
+<element type="point" label="P2"><show object="false" label="false"/><objColor r="0" g="0" b="0" alpha="0"/><coords x="{p2_x}" y="{p2_y}" z="1"/><pointSize val="3"/></element>
+<command name="Line"><input a0="Z" a1="P1"/><output a0="Strahl1"/></command>
+<element type="line" label="Strahl1"><show object="true" label="false"/><objColor r="0" g="0" b="0" alpha="0"/><lineStyle thickness="2" type="0"/></element>
+<command name="Line"><input a0="Z" a1="P2"/><output a0="Strahl2"/></command>
+<element type="line" label="Strahl2"><show object="true" label="false"/><objColor r="0" g="0" b="0" alpha="0"/><lineStyle thickness="2" type="0"/></element>
+<element type="point" label="A"><show object="true" label="true"/><objColor r="0" g="0" b="139" alpha="0"/><coords x="{a_x}" y="{a_y}" z="1"/><pointSize val="5"/></element>
+<element type="point" label="A'"><show object="true" label="true"/><objColor r="0" g="0" b="139" alpha="0"/><coords x="{a_strich_x}" y="{a_strich_y}" z="1"/><pointSize val="5"/></element>
+<element type="point" label="B"><show object="true" label="true"/><objColor r="0" g="0" b="139" alpha="0"/><coords x="{b_x}" y="{b_y}" z="1"/><pointSize val="5"/></element>
+<element type="point" label="B'"><show object="true" label="true"/><objColor r="0" g="0" b="139" alpha="0"/><coords x="{b_strich_x}" y="{b_strich_y}" z="1"/><pointSize val="5"/></element>
+<command name="Line"><input a0="A" a1="A'"/><output a0="Parallele1"/></command>
+<element type="line" label="Parallele1"><show object="true" label="false"/><objColor r="0" g="0" b="255" alpha="0"/><lineStyle thickness="2" type="10"/></element>
+<command name="Line"><input a0="B" a1="B'"/><output a0="Parallele2"/></command>
+<element type="line" label="Parallele2"><show object="true" label="false"/><objColor r="0" g="0" b="255" alpha="0"/><lineStyle thickness="2" type="10"/></element>
+{labels}</construction>
+</geogebra>''')
+
+# Text-Objekte stehen als String-Ausdruck in der Konstruktion
+GGB_LABEL = Vorlage('''<expression label="{name}" exp={exp}/>
+<element type="text" label="{name}"><show object="true" label="true"/><objColor r="{r}" g="{g}" b="{b}" alpha="0"/><startPoint x="{x}" y="{y}" z="1"/></element>
+''')
+
+GGB_HTML = Vorlage('''<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8" />
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Strahlensatz Aufgabe</title>
+    <script src="https://www.geogebra.org/apps/deployggb.js"></script>
+</head>
+<body style="margin: 0; padding: 0; background: white;">
+    <div id="applet_container" style="width: 100%; height: 100vh; position: absolute;"></div>
+
+    <script>
+        const appletDiv = document.getElementById('applet_container');
+
+        var parameters = {{
+            "id": "ggbApplet",
+            "width": Math.min(window.innerWidth - 20, {width}),
+            "height": Math.min(window.innerHeight - 20, {height}),
+            "showToolBar": false,
+            "showAlgebraInput": false,
+            "showMenuBar": false,
+            "showResetIcon": true,
+            "enableLabelDrags": false,
+            "enableRightClick": true,
+            "errorDialogsActive": true,
+            "useBrowserForJS": true,
+            "allowStyleBar": false,
+            "preventFocus": false,
+            "showLogging": false,
+            "clientID": "strahlensatz",
+            "hostStyle": "iframe",
+            "scriptingLanguage": "geogebra",
+            "language": "de",
+            // kleineres Fenster als {width}x{height}: Ausschnitt an die tatsächliche Größe anpassen
+            "appletOnLoad": function(api) {{ api.setCoordSystem({xmin}, {xmax}, {ymin}, {ymax}); }},
+            "ggbBase64": "{ggb_base64}"
+        }};
+
+        var applet = new GGBApplet(parameters, true);
+        applet.inject(appletDiv);
+    </script>
+</body>
+</html>
+''')
+
+
+def _zahl(v):
+    return '%g' % round(v, 4)
+
+
+def _ansicht():
+    """Feste Werte der Ansicht (Ausschnitt VIEW bei APPLET_SIZE) - für alle Aufgaben gleich."""
+    xmin, xmax, ymin, ymax = VIEW
+    width, height = APPLET_SIZE
+    xscale = width / (xmax - xmin)
+    yscale = height / (ymax - ymin)
+    return dict(width=width, height=height, xmin=xmin, xmax=xmax, ymin=ymin, ymax=ymax,
+                x_zero=_zahl(-xmin * xscale), y_zero=_zahl(ymax * yscale), xscale=_zahl(xscale), yscale=_zahl(yscale))
+
+
+ANSICHT = _ansicht()
+
+
+def laengen_labels(punkte, measurements):
+    """Liefert (Name, Text, (x, y), Farbe) für jede vorhandene Messung - neben der Mitte der Strecke."""
+    def mitte(p, q, dx, dy=0):
+        return (p[0] + q[0]) / 2 + dx, (p[1] + q[1]) / 2 + dy
+
+    Z, A, A_s, B, B_s = punkte['Z'], punkte['A'], punkte["A'"], punkte['B'], punkte["B'"]
+    positionen = [
+        ('txtZA', 'ZA', mitte(Z, A, -1.5)),
+        ('txtAB', 'AB', mitte(A, B, -1.5, 0.8)),
+        ('txtZA_strich', 'ZA_strich', mitte(Z, A_s, 1)),
+        ('txtAB_strich', 'AB_strich', mitte(A_s, B_s, 1, 0.8)),
+    ]
+    labels = []
+    for name, key, pos in positionen:
+        wert = measurements.get(key)
+        if not wert:
+            continue
+        # gesuchte Größe (x/y) rot hervorheben
+        farbe = ROT if wert in GESUCHT else GRUEN
+        labels.append((name, f'{wert} cm', pos, farbe))
+    return labels
+
+
+def geogebra_xml(geo):
+    """Die fertige Konstruktion (Punkte, Strahlen, Parallelen, Längenlabels) als geogebra.xml."""
+    punkte = geo.punkte(GGB_ZENTRUM)
+    werte = {}
+    for label, key in (('Z', 'z'), ('P1', 'p1'), ('P2', 'p2'), ('A', 'a'), ("A'", 'a_strich'),
+                       ('B', 'b'), ("B'", 'b_strich')):
+        werte[key + '_x'], werte[key + '_y'] = map(_zahl, punkte[label])
+    labels = ''.join(
+        GGB_LABEL.render(name=name, exp=quoteattr('"' + text + '"'), r=r, g=g, b=b, x=_zahl(x), y=_zahl(y))
+        for name, text, (x, y), (r, g, b) in laengen_labels(punkte, geo.aufgabe['measurements']))
+    return GGB_XML.render(labels=labels, **werte, **ANSICHT)
+
+
+def ggb_bytes(geo):
+    """Packt die Konstruktion als .ggb (ZIP mit geogebra.xml); gleiche Aufgabe = gleiche Bytes."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as ggb:
+        info = zipfile.ZipInfo('geogebra.xml', date_time=(1980, 1, 1, 0, 0, 0))
+        info.compress_type = zipfile.ZIP_DEFLATED
+        ggb.writestr(info, geogebra_xml(geo))
+    return buffer.getvalue()
+
+
+def geogebra_html(ggb):
+    """HTML-Seite mit GeoGebra AppletJS, die Konstruktion ist als ggbBase64 eingebettet."""
+    return GGB_HTML.render(ggb_base64=base64.b64encode(ggb).decode('ascii'), **ANSICHT)
+
+
+def geogebra_dateien(geo, html_name, precision=None):
+    # precision betrifft nur SVG - die Konstruktion hat ihre eigene Rundung (_zahl)
+    ggb = ggb_bytes(geo)
+    return [(geo.aufgabe['name'] + '.ggb', ggb), (html_name, geogebra_html(ggb).encode('utf-8'))]
+
+
+# ---- Backend SVG: eigenständige HTML-Seite ohne GeoGebra
+
+SVG_ZENTRUM = (100, 300)  # Zentrum oben-mitte
+SVG_MASSSTAB = 15  # Skalierung für SVG
+SVG_GROESSE = 600
+# Nachkommastellen der SVG-Koordinaten (Bildschirmpixel); None = alte Figur mit vollen Floats
+SVG_PRECISION = 1
+
+# CSS-Klassen der kompakten Figur (svg_writer); Präfix sg-, damit sie in der Galerie nicht kollidieren
+SVG_STYLES = {
+    'sg-s': 'fill:none;stroke:#000;stroke-width:2',  # Strahlen
+    'sg-p': 'fill:none;stroke:#00f;stroke-width:2;stroke-dasharray:5,5',  # Parallelen
+    'sg-z': 'fill:#000',  # Zentrum
+    'sg-d': 'fill:#00008b',  # Schnittpunkte
+    'sg-lz': 'font-size:16px;font-weight:bold',
+    'sg-lp': 'font-size:16px;font-weight:bold;fill:#00008b',
+    'sg-m': 'font-size:13px;fill:green',  # Längen
+    'sg-x': 'font-size:13px;fill:red',  # gesuchte Länge
+}
+# Gittermuster (mit weißem Grund) und Punkt-Symbol - einmal pro Seite
+SVG_DEFS = ('<pattern id="sg-gitter" width="30" height="30" patternUnits="userSpaceOnUse">'
+            '<rect width="30" height="30" fill="#fff"/><path d="M30 0H0V30" fill="none" stroke="#f0f0f0"/>'
+            '</pattern><circle id="sg-pt" r="5"/>')
+SVG_HINTERGRUND = f'<rect width="{SVG_GROESSE}" height="{SVG_GROESSE}" fill="url(#sg-gitter)"/>'
+
+SVG_FIGUR = Vorlage('''<svg width="600" height="600" viewBox="0 0 600 600" xmlns="http://www.w3.org/2000/svg">
+        <!-- Hintergrund -->
+        <rect width="600" height="600" fill="white"/>
+
+        <!-- Gitternetz -->
+        <defs>
+            <pattern id="{grid_id}" width="30" height="30" patternUnits="userSpaceOnUse">
+                <path d="M 30 0 L 0 0 0 30" fill="none" stroke="#f0f0f0" stroke-width="1"/>
+            </pattern>
+        </defs>
+        <rect width="600" height="600" fill="url(#{grid_id})" />
+
+        <!-- Strahlen -->
+        <line x1="{z_x}" y1="{z_y}" x2="{p1_x}" y2="{p1_y}" stroke="black" stroke-width="2"/>
+        <line x1="{z_x}" y1="{z_y}" x2="{p2_x}" y2="{p2_y}" stroke="black" stroke-width="2"/>
+
+        <!-- Parallele Geraden (gestrichelt) -->
+        <line x1="{a_x}" y1="{a_y}" x2="{a_strich_x}" y2="{a_strich_y}"
+              stroke="blue" stroke-width="2" stroke-dasharray="5,5"/>
+        <line x1="{b_x}" y1="{b_y}" x2="{b_strich_x}" y2="{b_strich_y}"
+              stroke="blue" stroke-width="2" stroke-dasharray="5,5"/>
+
+        <!-- Punkte -->
+        <circle cx="{z_x}" cy="{z_y}" r="5" fill="black"/>
+        <circle cx="{a_x}" cy="{a_y}" r="5" fill="darkblue"/>
+        <circle cx="{a_strich_x}" cy="{a_strich_y}" r="5" fill="darkblue"/>
+        <circle cx="{b_x}" cy="{b_y}" r="5" fill="darkblue"/>
+        <circle cx="{b_strich_x}" cy="{b_strich_y}" r="5" fill="darkblue"/>
+
+        <!-- Punkt-Labels -->
+        <text x="{z_label_x}" y="{z_label_y}" font-size="16" font-weight="bold">Z</text>
+        <text x="{a_label_x}" y="{a_label_y}" font-size="16" font-weight="bold" fill="darkblue">A</text>
+        <text x="{a_strich_label_x}" y="{a_strich_label_y}" font-size="16" font-weight="bold" fill="darkblue">A'</text>
+        <text x="{b_label_x}" y="{b_label_y}" font-size="16" font-weight="bold" fill="darkblue">B</text>
+        <text x="{b_strich_label_x}" y="{b_strich_label_y}" font-size="16" font-weight="bold" fill="darkblue">B'</text>
+
+        <!-- Längenlabels -->
+        <text x="{za_x}" y="{za_y}" font-size="13" fill="{za_fill}">ZA: {za} cm</text>
+        <text x="{ab_x}" y="{ab_y}" font-size="13" fill="{ab_fill}">AB: {ab} cm</text>
+        <text x="{za_strich_x}" y="{za_strich_y}" font-size="13" fill="{za_strich_fill}">ZA': {za_strich} cm</text>
+        <text x="{ab_strich_x}" y="{ab_strich_y}" font-size="13" fill="{ab_strich_fill}">
+            A'B': {ab_strich} cm
+        </text>
+    </svg>''')
+
+SVG_HTML = Vorlage('''<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8" />
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Strahlensatz Aufgabe</title>
+    <style>
+        body {{
+            margin: 0;
+            padding: 20px;
+            background: white;
+            font-family: Arial, sans-serif;
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            min-height: 100vh;
+        }}
+        svg {{
+            border: 2px solid #cccccc;
+            border-radius: 8px;
+            max-width: 100%;
+            height: auto;
+        }}
+    </style>
+</head>
+<body>
+    {figur}
+</body>
+</html>
+''')
+
+
+def svg_figur(geo, precision=SVG_PRECISION, shared=False, grid_id='grid'):
+    """
+    Das <svg>-Element der Figur, gerundet auf precision Nachkommastellen (svg_writer).
+    shared=True lässt CSS und <defs> weg - die stehen dann einmal auf der Seite (Galerie).
+    precision=None liefert die alte, ausführliche Figur (svg_figur_voll).
+    """
+    if precision is None:
+        return svg_figur_voll(geo, grid_id)
+    p = geo.punkte(SVG_ZENTRUM, SVG_MASSSTAB)
+    Z, P1, P2, A, A_s, B, B_s = p['Z'], p['P1'], p['P2'], p['A'], p["A'"], p['B'], p["B'"]
+    m = geo.aufgabe['measurements']
+    w = SvgWriter(SVG_GROESSE, SVG_GROESSE, precision)
+    # Strahlen als ein Linienzug P1-Z-P2, Parallelen als zwei Teilpfade
+    w.line('sg-s', P1, Z, P2)
+    w.line('sg-p', A, A_s)
+    w.line('sg-p', B, B_s)
+    w.dot('sg-z', '#sg-pt', *Z)
+    for punkt in (A, A_s, B, B_s):
+        w.dot('sg-d', '#sg-pt', *punkt)
+    w.text('sg-lz', Z[0] - 20, Z[1] - 15, 'Z')
+    w.text('sg-lp', A[0] - 20, A[1] - 15, 'A')
+    w.text('sg-lp', A_s[0] + 10, A_s[1] - 15, "A'")
+    w.text('sg-lp', B[0] - 20, B[1] + 25, 'B')
+    w.text('sg-lp', B_s[0] + 10, B_s[1] + 25, "B'")
+    klasse = {key: 'sg-x' if wert in GESUCHT else 'sg-m' for key, wert in m.items()}
+    w.text(klasse['ZA'], (Z[0] + A[0]) / 2 - 40, (Z[1] + A[1]) / 2 - 5, f"ZA: {m['ZA']} cm")
+    w.text(klasse['AB'], (A[0] + B[0]) / 2 - 40, (A[1] + B[1]) / 2 + 20, f"AB: {m['AB']} cm")
+    w.text(klasse['ZA_strich'], (Z[0] + A_s[0]) / 2 + 20, (Z[1] + A_s[1]) / 2 - 5, f"ZA': {m['ZA_strich']} cm")
+    w.text(klasse['AB_strich'], (A_s[0] + B_s[0]) / 2 + 20, (A_s[1] + B_s[1]) / 2 + 20, f"A'B': {m['AB_strich']} cm")
+    if shared:
+        return w.svg(background=SVG_HINTERGRUND)
+    return w.svg(style=style_css(SVG_STYLES), defs=SVG_DEFS, background=SVG_HINTERGRUND)
+
+
+def svg_figur_voll(geo, grid_id='grid'):
+    """Die alte Figur: jedes Element einzeln, Koordinaten mit vollen Floats; grid_id pro Seite eindeutig."""
+    p = geo.punkte(SVG_ZENTRUM, SVG_MASSSTAB)
+    Z, P1, P2, A, A_s, B, B_s = p['Z'], p['P1'], p['P2'], p['A'], p["A'"], p['B'], p["B'"]
+    m = geo.aufgabe['measurements']
+    return SVG_FIGUR.render(
+        grid_id=grid_id, z_x=Z[0], z_y=Z[1], p1_x=P1[0], p1_y=P1[1], p2_x=P2[0], p2_y=P2[1],
+        a_x=A[0], a_y=A[1], a_strich_x=A_s[0], a_strich_y=A_s[1],
+        b_x=B[0], b_y=B[1], b_strich_x=B_s[0], b_strich_y=B_s[1],
+        z_label_x=Z[0] - 20, z_label_y=Z[1] - 15,
+        a_label_x=A[0] - 20, a_label_y=A[1] - 15,
+        a_strich_label_x=A_s[0] + 10, a_strich_label_y=A_s[1] - 15,
+        b_label_x=B[0] - 20, b_label_y=B[1] + 25,
+        b_strich_label_x=B_s[0] + 10, b_strich_label_y=B_s[1] + 25,
+        za_x=(Z[0] + A[0]) / 2 - 40, za_y=(Z[1] + A[1]) / 2 - 5,
+        ab_x=(A[0] + B[0]) / 2 - 40, ab_y=(A[1] + B[1]) / 2 + 20,
+        za_strich_x=(Z[0] + A_s[0]) / 2 + 20, za_strich_y=(Z[1] + A_s[1]) / 2 - 5,
+        ab_strich_x=(A_s[0] + B_s[0]) / 2 + 20, ab_strich_y=(A_s[1] + B_s[1]) / 2 + 20,
+        za=escape(str(m['ZA'])), ab=escape(str(m['AB'])),
+        za_strich=escape(str(m['ZA_strich'])), ab_strich=escape(str(m['AB_strich'])),
+        **{f'{key.lower()}_fill': 'red' if wert in GESUCHT else 'green' for key, wert in m.items()})
+
+
+def svg_html(geo, precision=SVG_PRECISION):
+    """Erstellt eine SVG-Visualisierung eines Strahlensatzes als HTML-Seite."""
+    return SVG_HTML.render(figur=svg_figur(geo, precision))
+
+
+def svg_dateien(geo, html_name, precision=SVG_PRECISION):
+    return [(html_name, svg_html(geo, precision).encode('utf-8'))]
+
+
+def svg_savings(aufgaben, precision=SVG_PRECISION):
+    """Bytes der SVG-Figuren aller Aufgaben: (alte Figur mit vollen Floats, kompakte Figur)."""
+    voll = kompakt = 0
+    for aufgabe in aufgaben:
+        geo = Geometrie(aufgabe)
+        voll += len(svg_figur_voll(geo).encode('utf-8'))
+        kompakt += len(svg_figur(geo, precision).encode('utf-8'))
+    return voll, kompakt
+
+
+# Backend-Name -> (Geometrie, HTML-Dateiname, precision) -> [(Dateiname, Bytes)]
+BACKENDS = {
+    'geogebra': geogebra_dateien,
+    'svg': svg_dateien,
+}
+
+
+# ---- Galerie: alle Aufgaben auf einer Seite
+
+# SVG-Figuren werden erst eingesetzt, wenn ihre Karte näher als GALERIE_VORLAUF am Sichtbereich ist
+GALERIE_VORLAUF = '400px'
+
+GALERIE_HTML = Vorlage("""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8" />
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{titel}</title>
+    <style>
+        body {{
+            margin: 0;
+            padding: 20px;
+            background: white;
+            font-family: Arial, sans-serif;
+        }}
+        main {{
+            display: flex;
+            gap: 20px;
+            align-items: flex-start;
+        }}
+        .aufgaben {{
+            flex: 1;
+            min-width: 0;
+        }}
+        .aufgabe {{
+            margin-bottom: 20px;
+            min-height: 200px;
+        }}
+        .aufgabe h2 {{
+            font-size: 18px;
+        }}
+        .aufgabe svg {{
+            border: 2px solid #cccccc;
+            border-radius: 8px;
+            max-width: 100%;
+            height: auto;
+        }}
+        #applet-panel {{
+            flex: 1;
+            position: sticky;
+            top: 20px;
+        }}
+        #applet {{
+            width: 100%;
+            height: {applet_height}px;
+            border: 2px solid #cccccc;
+            border-radius: 8px;
+        }}
+{svg_css}        @media (max-width: 900px) {{
+            main {{
+                flex-direction: column-reverse;
+            }}
+            #applet-panel {{
+                width: 100%;
+                background: white;
+                z-index: 1;
+            }}
+            #applet {{
+                height: 50vh;
+            }}
+        }}
+    </style>
+</head>
+<body>
+{svg_defs}    <main>
+        <div class="aufgaben">
+{karten}        </div>
+{panel}    </main>
+    <script>
+        const karten = document.querySelectorAll('.aufgabe');
+
+        // Figuren liegen als <template> vor und werden erst kurz vor dem Sichtbereich eingesetzt
+        const figuren = new IntersectionObserver(function(entries) {{
+            for (const entry of entries) {{
+                if (!entry.isIntersecting) continue;
+                const vorlage = entry.target.querySelector('template');
+                if (vorlage) {{
+                    entry.target.querySelector('.figur').appendChild(vorlage.content.cloneNode(true));
+                    vorlage.remove();
+                }}
+                figuren.unobserve(entry.target);
+            }}
+        }}, {{ rootMargin: '{vorlauf} 0px' }});
+        karten.forEach(function(karte) {{ figuren.observe(karte); }});
+{applet_skript}    </script>
+</body>
+</html>
+""")
+
+GALERIE_KARTE = Vorlage("""            <section class="aufgabe" id="{name}"{ggb_attr}>
+                <h2>{titel}</h2>
+                <div class="figur"></div>
+                <template>{figur}</template>
+            </section>
+""")
+
+GALERIE_PANEL = Vorlage("""        <div id="applet-panel">
+            <h2 id="applet-titel"></h2>
+            <div id="applet"></div>
+        </div>
+""")
+
+# Ein einziges Applet für die ganze Seite: deployggb.js wird erst beim ersten Bedarf geladen,
+# danach tauscht setBase64 nur die Konstruktion der Aufgabe in der Seitenmitte aus
+GALERIE_APPLET_SKRIPT = Vorlage("""
+        let appletLaden = null;
+        let aktiv = null;
+
+        function applet() {{
+            if (!appletLaden) {{
+                appletLaden = new Promise(function(resolve) {{
+                    const script = document.createElement('script');
+                    script.src = 'https://www.geogebra.org/apps/deployggb.js';
+                    script.onload = function() {{
+                        const container = document.getElementById('applet');
+                        new GGBApplet({{
+                            "id": "ggbApplet",
+                            "width": container.clientWidth,
+                            "height": container.clientHeight,
+                            "showToolBar": false,
+                            "showAlgebraInput": false,
+                            "showMenuBar": false,
+                            "showResetIcon": true,
+                            "enableLabelDrags": false,
+                            "enableRightClick": true,
+                            "useBrowserForJS": true,
+                            "allowStyleBar": false,
+                            "preventFocus": true,
+                            "clientID": "strahlensatz",
+                            "scriptingLanguage": "geogebra",
+                            "language": "de",
+                            "appletOnLoad": resolve
+                        }}, true).inject(container);
+                    }};
+                    document.head.appendChild(script);
+                }});
+            }}
+            return appletLaden;
+        }}
+
+        function zeige(karte) {{
+            if (karte === aktiv) return;
+            aktiv = karte;
+            document.getElementById('applet-titel').textContent = karte.querySelector('h2').textContent;
+            applet().then(function(api) {{
+                // inzwischen weitergescrollt: nur die zuletzt gewählte Aufgabe laden
+                if (aktiv !== karte) return;
+                api.setBase64(karte.dataset.ggb, function() {{
+                    api.setCoordSystem({xmin}, {xmax}, {ymin}, {ymax});
+                }});
+            }});
+        }}
+
+        // aktiv ist die Karte, die die Mitte des Fensters kreuzt
+        const mitte = new IntersectionObserver(function(entries) {{
+            for (const entry of entries) {{
+                if (entry.isIntersecting) zeige(entry.target);
+            }}
+        }}, {{ rootMargin: '-50% 0px -50% 0px' }});
+        karten.forEach(function(karte) {{ mitte.observe(karte); }});
+        if (karten.length) zeige(karten[0]);
+""")
+
+
+def gallery_html(aufgaben, backends=('svg',), titel='Strahlensatz Aufgaben', precision=SVG_PRECISION):
+    """
+    Eine Seite mit allen Aufgaben. Mit 'svg' bekommt jede Aufgabe ihre Figur (erst beim
+    Scrollen eingesetzt; CSS und <defs> der kompakten Figuren stehen einmal auf der Seite),
+    mit 'geogebra' teilt sich die Seite ein einziges Applet, das die Konstruktion der
+    Aufgabe in der Fenstermitte lädt.
+    """
+    unbekannt = [b for b in backends if b not in BACKENDS]
+    if unbekannt or not backends:
+        raise ValueError(f'Unbekannte Backends {unbekannt} - verfügbar: {", ".join(BACKENDS)}')
+    mit_svg, mit_applet = 'svg' in backends, 'geogebra' in backends
+    karten = []
+    for aufgabe in aufgaben:
+        geo = Geometrie(aufgabe)
+        name = aufgabe['name']
+        ggb_attr = f' data-ggb="{base64.b64encode(ggb_bytes(geo)).decode("ascii")}"' if mit_applet else ''
+        figur = svg_figur(geo, precision, shared=True, grid_id=f'grid-{name}') if mit_svg else ''
+        karten.append(GALERIE_KARTE.render(name=escape(name), titel=escape(name), ggb_attr=ggb_attr, figur=figur))
+    return GALERIE_HTML.render(
+        titel=escape(titel), karten=''.join(karten), vorlauf=GALERIE_VORLAUF,
+        svg_css=f'        {style_css(SVG_STYLES)}\n' if mit_svg and precision is not None else '',
+        svg_defs=(f'    <svg width="0" height="0" style="position: absolute"><defs>{SVG_DEFS}</defs></svg>\n'
+                  if mit_svg and precision is not None else ''),
+        applet_height=APPLET_SIZE[1],
+        panel=GALERIE_PANEL.render() if mit_applet else '',
+        applet_skript=GALERIE_APPLET_SKRIPT.render(**ANSICHT) if mit_applet else '')
+
+
+# ---- Ausgabe
+
+def dateien(aufgabe, backends, precision=SVG_PRECISION):
+    """Alle Dateien (Name, Bytes) einer Aufgabe; die Geometrie wird einmal für alle Backends berechnet."""
+    geo = Geometrie(aufgabe)
+    result = []
+    for i, backend in enumerate(backends):
+        html_name = aufgabe['name'] + ('.html' if i == 0 else f'.{backend}.html')
+        result.extend(BACKENDS[backend](geo, html_name, precision))
+    return result
+
+
+def generate_batch(aufgaben, backends, out_dir, precision=SVG_PRECISION):
+    """Worker: rendert und schreibt einen Block Aufgaben; liefert (geschriebene Dateinamen, Anzahl unveränderter)."""
+    geschrieben, unveraendert = [], 0
+    for aufgabe in aufgaben:
+        for name, data in dateien(aufgabe, backends, precision):
+            if write_atomic(os.path.join(out_dir, name), data, if_changed=True):
+                geschrieben.append(name)
+            else:
+                unveraendert += 1
+    return geschrieben, unveraendert
+
+
+def generate(aufgaben=AUFGABEN, out_dir=OUTPUT_DIR, backends=('svg',), jobs=1, batch_aufgaben=BATCH_AUFGABEN,
+             precision=SVG_PRECISION):
+    """
+    Erzeugt die Dateien aller Aufgaben für die gewählten Backends in out_dir. jobs > 1 (oder
+    None = ein Prozess pro Kern) verteilt Blöcke von batch_aufgaben Aufgaben auf Worker-
+    Prozesse. precision steuert die Rundung der SVG-Figuren (siehe svg_figur).
+    Liefert (geschriebene Dateinamen, Anzahl unveränderter Dateien).
+    """
+    unbekannt = [b for b in backends if b not in BACKENDS]
+    if unbekannt or not backends:
+        raise ValueError(f'Unbekannte Backends {unbekannt} - verfügbar: {", ".join(BACKENDS)}')
+    os.makedirs(out_dir, exist_ok=True)
+    batches = [aufgaben[i:i + batch_aufgaben] for i in range(0, len(aufgaben), batch_aufgaben)]
+    if jobs == 1 or len(batches) <= 1:
+        results = [generate_batch(batch, backends, out_dir, precision) for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(generate_batch, batches, [backends] * len(batches), [out_dir] * len(batches),
+                                    [precision] * len(batches)))
+    geschrieben = [name for names, _ in results for name in names]
+    return geschrieben, sum(count for _, count in results)
+
+
+def generate_gallery(aufgaben=AUFGABEN, path=os.path.join(OUTPUT_DIR, 'galerie.html'), backends=('svg',),
+                     precision=SVG_PRECISION):
+    """Schreibt die Galerie-Seite (gallery_html) nach path, falls sie sich geändert hat. Liefert True, wenn geschrieben."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    return write_atomic(path, gallery_html(aufgaben, backends, precision=precision).encode('utf-8'), if_changed=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Strahlensatz-Aufgaben für public/geogebra erzeugen.')
+    parser.add_argument('--backends', nargs='+', choices=sorted(BACKENDS), default=['svg'],
+                        help='Ausgabe(n); das erste Backend schreibt <name>.html (Standard: svg)')
+    parser.add_argument('--out', default=OUTPUT_DIR, help='Zielordner')
+    parser.add_argument('--jobs', type=int, default=1, help='Anzahl Worker-Prozesse (0 = ein Prozess pro Kern)')
+    parser.add_argument('--pool', type=int, metavar='N', help='statt AUFGABEN N zufällige Aufgaben (strahlensatz_solver)')
+    parser.add_argument('--seed', type=int, default=0, help='Zufallsstartwert für --pool')
+    parser.add_argument('--precision', type=int, default=SVG_PRECISION,
+                        help=f'Nachkommastellen der SVG-Koordinaten (Standard: {SVG_PRECISION})')
+    parser.add_argument('--full-svg', action='store_true', help='alte SVG-Figur mit vollen Floats schreiben')
+    parser.add_argument('--report-svg', action='store_true', help='Ersparnis der kompakten SVG-Figuren ausgeben')
+    parser.add_argument('--gallery', metavar='DATEI',
+                        help='statt einer Seite pro Aufgabe eine Galerie-Seite DATEI (im Zielordner) schreiben')
+    args = parser.parse_args(argv)
+
+    aufgaben = AUFGABEN
+    if args.pool:
+        from strahlensatz_solver import random_pool  # braucht NumPy - nur für Aufgabenpools
+        aufgaben = random_pool(args.pool, args.seed)
+    precision = None if args.full_svg else args.precision
+    if args.report_svg and precision is not None:
+        voll, kompakt = svg_savings(aufgaben, precision)
+        print(f'SVG-Figuren: {voll} -> {kompakt} Bytes, {voll - kompakt} gespart ({1 - kompakt / voll:.0%})')
+    if args.gallery:
+        path = os.path.join(args.out, args.gallery)
+        status = 'erstellt' if generate_gallery(aufgaben, path, args.backends, precision) else 'unverändert'
+        print(f'{path}: {len(aufgaben)} Aufgaben, {status}')
+        return
+    geschrieben, unveraendert = generate(aufgaben, args.out, args.backends, args.jobs or None, precision=precision)
+    for name in geschrieben:
+        print(f'✓ {name} erstellt')
+    print(f'{len(geschrieben)} Dateien geschrieben, {unveraendert} unverändert ({args.out})')
+
+
+if __name__ == '__main__':
+    main()
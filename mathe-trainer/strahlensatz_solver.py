@@ -0,0 +1,188 @@
+"""Vektorisierter Löser für Strahlensatz-Aufgaben (NumPy).
+
+Die Messwerte einer Aufgabe (ZA, AB, ZA_strich, AB_strich) folgen aus der Zeichnung:
+Strahl 1 hat die Länge ray_length, Strahl 2 ray2_length (Standard: ray_length), die
+Parallelen schneiden bei parallel1_t bzw. parallel2_t. Für N Aufgaben auf einmal werden
+hier die Streckenlängen berechnet, ein Maßstab gesucht, mit dem alle vier Werte ganze
+Zahlen werden, eine Strecke als Unbekannte (x/y) gewählt und schlecht gestellte Aufgaben
+(zu spitzer oder zu stumpfer Winkel, zu dicht liegende Parallelen, kein ganzzahliger
+Maßstab) verworfen.
+
+    sol = solve_arrays(ray1_angle, ray2_angle, ray_length, parallel1_t, parallel2_t)
+    aufgaben = aufgaben_from(sol)            # brauchbare Aufgaben im Format von AUFGABEN
+    pool = random_pool(10000, seed=1)        # direkt für strahlensatz_engine.generate
+    ok = check(strahlensatz_engine.AUFGABEN) # passen handgeschriebene Messwerte zur Zeichnung?
+"""
+import numpy as np
+
+SEGMENTS = ('ZA', 'AB', 'ZA_strich', 'AB_strich')
+# Name der Unbekannten je Strecke: Abschnitte vom Zentrum y, Abschnitte zwischen den Parallelen x
+VARIABLES = ('y', 'x', 'y', 'x')
+
+# Ganzzahlige Messwerte liegen in [MIN_VALUE, MAX_VALUE] (cm)
+MIN_VALUE = 3
+MAX_VALUE = 60
+# Mindestwinkel zwischen den Strahlen (Grad) und Mindestabstand der Parallelen (Anteil am Strahl)
+MIN_ANGLE = 12.0
+MIN_GAP = 0.15
+# Abweichung von einer ganzen Zahl, die noch als ganzzahlig gilt (Rundungsrauschen der Eingaben)
+TOL = 1e-6
+# Zeilen pro Block bei der Maßstabssuche (N x MAX_VALUE x 4 Werte pro Block)
+CHUNK = 4096
+
+
+def segment_lengths(ray_length, ray2_length, t1, t2):
+    """Längen von ZA, AB, ZA', A'B' in Zeichnungseinheiten als (N, 4)-Array."""
+    return np.stack([t1 * ray_length, (t2 - t1) * ray_length, t1 * ray2_length, (t2 - t1) * ray2_length], axis=1)
+
+
+def integer_scaling(lengths, min_value=MIN_VALUE, max_value=MAX_VALUE, tol=TOL):
+    """
+    Kleinster Maßstab k, mit dem alle vier Längen ganze Zahlen in [min_value, max_value]
+    werden. Kandidaten sind k = n / ZA für n = 1 .. max_value (ZA selbst muss ganzzahlig
+    werden). Liefert (k, Messwerte als int-Array (N, 4), gefunden-Maske); ohne Treffer ist
+    k = nan und die Messwerte sind 0.
+    """
+    lengths = np.asarray(lengths, dtype=float)
+    n = lengths.shape[0]
+    scale = np.full(n, np.nan)
+    values = np.zeros((n, 4), dtype=np.int64)
+    found = np.zeros(n, dtype=bool)
+    candidates = np.arange(1, max_value + 1, dtype=float)
+    for start in range(0, n, CHUNK):
+        block = lengths[start:start + CHUNK]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            k = candidates[None, :] / block[:, :1]
+        scaled = k[..., None] * block[:, None, :]
+        rounded = np.rint(scaled)
+        fits = ((np.abs(scaled - rounded) <= tol * np.maximum(1.0, rounded))
+                & (rounded >= min_value) & (rounded <= max_value)).all(axis=-1)
+        hit = fits.any(axis=1)
+        first = fits.argmax(axis=1)
+        rows = np.arange(block.shape[0])
+        scale[start:start + CHUNK] = np.where(hit, k[rows, first], np.nan)
+        values[start:start + CHUNK] = np.where(hit[:, None], rounded[rows, first], 0).astype(np.int64)
+        found[start:start + CHUNK] = hit
+    return scale, values, found
+
+
+def well_conditioned(ray1_angle, ray2_angle, ray_length, ray2_length, t1, t2, min_angle=MIN_ANGLE, min_gap=MIN_GAP):
+    """Maske der Aufgaben mit deutlich getrennten Strahlen und Parallelen, die beide auf den Strahlen liegen."""
+    spread = np.abs(ray2_angle - ray1_angle) % 360
+    spread = np.minimum(spread, 360 - spread)
+    finite = np.isfinite(np.stack([ray1_angle, ray2_angle, ray_length, ray2_length, t1, t2])).all(axis=0)
+    return (finite & (spread >= min_angle) & (spread <= 180 - min_angle) & (ray_length > 0) & (ray2_length > 0)
+            & (t1 >= min_gap) & (t2 - t1 >= min_gap) & (t2 <= 1))
+
+
+def solve_arrays(ray1_angle, ray2_angle, ray_length, parallel1_t, parallel2_t, ray2_length=None, unknown=None,
+                 seed=None, min_value=MIN_VALUE, max_value=MAX_VALUE, min_angle=MIN_ANGLE, min_gap=MIN_GAP):
+    """
+    Kern des Lösers, alle Argumente sind Arrays der Länge N (oder Skalare):
+    Winkel in Grad, Längen in Zeichnungseinheiten, unknown ist der Index (0..3, siehe
+    SEGMENTS) der gesuchten Strecke - ohne Angabe zufällig (seed).
+    Liefert ein dict von Arrays: lengths (N, 4), scale, measurements (N, 4), unknown,
+    solution (Wert der Unbekannten) und ok (brauchbare Aufgabe).
+    """
+    ray1_angle, ray2_angle, ray_length, t1, t2 = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (ray1_angle, ray2_angle, ray_length, parallel1_t, parallel2_t)))
+    ray1_angle, ray2_angle, ray_length, t1, t2 = (np.atleast_1d(a) for a in (ray1_angle, ray2_angle, ray_length, t1, t2))
+    n = ray1_angle.shape[0]
+    ray2_length = ray_length if ray2_length is None else np.broadcast_to(np.asarray(ray2_length, dtype=float), (n,))
+    if unknown is None:
+        unknown = np.random.default_rng(seed).integers(0, len(SEGMENTS), n)
+    unknown = np.broadcast_to(np.asarray(unknown, dtype=np.intp), (n,))
+
+    lengths = segment_lengths(ray_length, ray2_length, t1, t2)
+    conditioned = well_conditioned(ray1_angle, ray2_angle, ray_length, ray2_length, t1, t2, min_angle, min_gap)
+    scale, measurements, found = integer_scaling(np.where(conditioned[:, None], lengths, np.nan), min_value, max_value)
+    return dict(ray1_angle=ray1_angle, ray2_angle=ray2_angle, ray_length=ray_length, ray2_length=ray2_length,
+                parallel1_t=t1, parallel2_t=t2, lengths=lengths, scale=scale, measurements=measurements,
+                unknown=unknown, solution=measurements[np.arange(n), unknown], ok=conditioned & found)
+
+
+def _number(v):
+    """Zahl als int, wenn ganzzahlig, sonst float (für JSON und die Vorlagen)."""
+    return int(v) if float(v).is_integer() else float(v)
+
+
+def aufgaben_from(sol, indices=None, prefix='aufgabe', start=1):
+    """
+    Baut für die Aufgaben indices (Standard: alle mit ok) dicts im Format von
+    strahlensatz_engine.AUFGABEN, Namen fortlaufend ab prefix + start.
+    """
+    if indices is None:
+        indices = np.flatnonzero(sol['ok'])
+    columns = {key: sol[key][indices].tolist() for key in
+               ('ray1_angle', 'ray2_angle', 'ray_length', 'ray2_length', 'parallel1_t', 'parallel2_t')}
+    measurements = sol['measurements'][indices].tolist()
+    unknowns = sol['unknown'][indices].tolist()
+    aufgaben = []
+    for row, (values, unknown) in enumerate(zip(measurements, unknowns)):
+        aufgabe = {'name': f'{prefix}{start + row}'}
+        for key, column in columns.items():
+            aufgabe[key] = _number(column[row])
+        if aufgabe['ray2_length'] == aufgabe['ray_length']:
+            del aufgabe['ray2_length']
+        values = dict(zip(SEGMENTS, values))
+        values[SEGMENTS[unknown]] = VARIABLES[unknown]
+        aufgabe['measurements'] = values
+        aufgaben.append(aufgabe)
+    return aufgaben
+
+
+def aufgabe_at(sol, i, name):
+    """Baut für Aufgabe i das dict im Format von strahlensatz_engine.AUFGABEN."""
+    return dict(aufgaben_from(sol, [i])[0], name=name)
+
+
+def solve_aufgaben(aufgaben, **kwargs):
+    """solve_arrays für Aufgaben-dicts; die Unbekannte bleibt an der Stelle der ersten Variablen (x/y)."""
+    unknown = [next((j for j, seg in enumerate(SEGMENTS) if isinstance(a['measurements'].get(seg), str)), 3)
+               for a in aufgaben]
+    return solve_arrays(*_columns(aufgaben), unknown=unknown, **kwargs)
+
+
+def _columns(aufgaben):
+    return ([a['ray1_angle'] for a in aufgaben], [a['ray2_angle'] for a in aufgaben],
+            [a['ray_length'] for a in aufgaben], [a['parallel1_t'] for a in aufgaben],
+            [a['parallel2_t'] for a in aufgaben], [a.get('ray2_length', a['ray_length']) for a in aufgaben])
+
+
+def check(aufgaben, rel_tol=0.01):
+    """
+    Bool-Maske der Aufgaben, deren Messwerte zur Zeichnung passen: genau eine Unbekannte,
+    gut gestellt (well_conditioned) und alle bekannten Werte mit demselben Maßstab
+    (bis auf rel_tol) aus den gezeichneten Längen.
+    """
+    ray1_angle, ray2_angle, ray_length, t1, t2, ray2_length = (np.asarray(c, dtype=float) for c in _columns(aufgaben))
+    given = np.array([[a['measurements'].get(seg) for seg in SEGMENTS] for a in aufgaben], dtype=object)
+    known = np.vectorize(lambda v: isinstance(v, (int, float)) and not isinstance(v, bool), otypes=[bool])(given)
+    values = np.where(known, given, np.nan).astype(float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = values / segment_lengths(ray_length, ray2_length, t1, t2)
+    lo, hi = np.nanmin(np.where(known, ratio, np.inf), axis=1), np.nanmax(np.where(known, ratio, -np.inf), axis=1)
+    proportional = np.isfinite(lo) & np.isfinite(hi) & (hi <= lo * (1 + rel_tol))
+    return (known.sum(axis=1) == len(SEGMENTS) - 1) & proportional & well_conditioned(
+        ray1_angle, ray2_angle, ray_length, ray2_length, t1, t2)
+
+
+def random_pool(count, seed=0, ray_length=15, prefix='aufgabe'):
+    """
+    count zufällige, lösbare Aufgaben: Winkel in ganzen Grad, Parallelen in 0,05-Schritten,
+    Strahl 2 zwischen 60 % und 100 % von Strahl 1. Verworfene Kandidaten werden nachgezogen.
+    """
+    rng = np.random.default_rng(seed)
+    aufgaben = []
+    while len(aufgaben) < count:
+        n = max(2 * (count - len(aufgaben)), 64)
+        ray1_angle = rng.integers(45, 71, n)
+        ray2_angle = rng.integers(15, 41, n)
+        t1 = rng.integers(4, 10, n) * 0.05
+        t2 = t1 + rng.integers(4, 11, n) * 0.05
+        ray2_length = ray_length * rng.integers(6, 11, n) / 10
+        sol = solve_arrays(ray1_angle, ray2_angle, ray_length, np.round(t1, 2), np.round(t2, 2),
+                           ray2_length=ray2_length, unknown=rng.integers(0, len(SEGMENTS), n))
+        aufgaben.extend(aufgaben_from(sol, np.flatnonzero(sol['ok'])[:count - len(aufgaben)], prefix,
+                                      len(aufgaben) + 1))
+    return aufgaben
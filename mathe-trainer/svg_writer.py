@@ -0,0 +1,81 @@
+"""
+Kompakter SVG-Schreiber für die Strahlensatz-Figuren (strahlensatz_engine).
+
+Statt jedes Element mit allen Attributen einzeln zu schreiben:
+- Koordinaten werden auf precision Nachkommastellen gerundet (ohne überflüssige Nullen),
+- Linien eines Stils werden zu einem einzigen <path> zusammengefasst,
+- Punkte verweisen per <use> auf ein Symbol aus <defs>; Punkte und Texte eines Stils
+  teilen sich ein <g>,
+- Farben, Strichstärken und Schriften stehen nur einmal als CSS-Klasse (style_css), Muster
+  und Symbole einmal in <defs> - pro Seite, nicht pro Figur.
+
+    w = SvgWriter(600, 600, precision=1)
+    w.line('strahl', (100, 300), (212.5, 494.86))
+    w.dot('punkt', '#pt', 100, 300)
+    w.text('label', 80, 285, 'Z')
+    svg = w.svg(style=style_css(STYLES), defs=DEFS)
+"""
+from xml.sax.saxutils import escape
+
+
+def _number(v, precision):
+    """Zahl mit höchstens precision Nachkommastellen, ohne überflüssige Nullen und ohne '-0'."""
+    s = '%.*f' % (precision, v)
+    if '.' in s:
+        s = s.rstrip('0').rstrip('.')
+    return '0' if s == '-0' else s
+
+
+def style_css(styles):
+    """CSS-Regeln für {Klasse: Deklarationen}."""
+    return ''.join(f'.{name}{{{decl}}}' for name, decl in styles.items())
+
+
+class SvgWriter:
+    """Sammelt Linien, Punkte und Texte nach Stil (CSS-Klasse) und schreibt sie zusammengefasst."""
+
+    def __init__(self, width, height, precision=1):
+        self.width, self.height = width, height
+        self.precision = precision
+        # (Art, Klasse) -> Einträge; die Reihenfolge der ersten Verwendung ist die Zeichenreihenfolge
+        self.groups = {}
+
+    def _xy(self, x, y):
+        return f'{_number(x, self.precision)} {_number(y, self.precision)}'
+
+    def _add(self, kind, style, item):
+        self.groups.setdefault((kind, style), []).append(item)
+
+    def line(self, style, *points):
+        """Linienzug durch points; alle Linienzüge eines Stils landen in einem <path>."""
+        self._add('path', style, 'M' + 'L'.join(self._xy(*p) for p in points))
+
+    def dot(self, style, href, x, y):
+        """Punkt als <use> des Symbols href (z.B. '#pt'); Farbe kommt aus der Klasse."""
+        self._add('group', style, f'<use href="{href}" x="{_number(x, self.precision)}" y="{_number(y, self.precision)}"/>')
+
+    def text(self, style, x, y, text):
+        self._add('group', style, f'<text x="{_number(x, self.precision)}" y="{_number(y, self.precision)}">'
+                                 f'{escape(str(text))}</text>')
+
+    def elements(self):
+        out = []
+        for (kind, style), items in self.groups.items():
+            if kind == 'path':
+                out.append(f'<path class="{style}" d="{"".join(items)}"/>')
+            else:
+                out.append(f'<g class="{style}">{"".join(items)}</g>')
+        return ''.join(out)
+
+    def svg(self, style='', defs='', background=''):
+        """
+        Das fertige <svg>-Element. style (CSS) und defs gehören nur dann hinein, wenn die
+        Figur allein auf der Seite steht; background ist ein beliebiges erstes Element.
+        """
+        head = (f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.width}" height="{self.height}" '
+                f'viewBox="0 0 {self.width} {self.height}">')
+        if style:
+            head += f'<style>{style}</style>'
+        if defs:
+            head += f'<defs>{defs}</defs>'
+        return head + background + self.elements() + '</svg>'
@@ -0,0 +1,158 @@
+"""Benchmark und Regex-Sicherheitsprüfung für alle Codemod-Regeln (codemod_rules.RULES).
+
+Jede Regel läuft über jeden Fall aus codemod_corpus.CASES - realistische und adversariale
+TSX-Eingaben - in verdoppelten Größen, bis die größte Größe erreicht ist oder ein Lauf
+das Zeitbudget überschreitet. Aus den Messpunkten wird der Wachstumsexponent geschätzt
+(Steigung von log(Zeit) über log(Größe)); liegt er über --max-exponent, ist die Regel
+für diesen Fall auffällig (super-linear) und das Skript endet mit Exit-Code 1. So fällt
+ein Ausdruck, der zurückspringt, auf, bevor jemand einen Codemod über module/src laufen
+lässt.
+
+    python benchmark.py                              # alle Regeln, alle Fälle
+    python benchmark.py --rules chevron --cases span-offen akkordeon
+    python benchmark.py --legacy                     # zusätzlich die Ausdrücke der alten fix_*.py
+
+Mit --legacy laufen die alten Ausdrücke (LEGACY) mit, als Gegenprobe für die Erkennung;
+sie zählen nicht für den Exit-Code. Außerdem muss dann rechenweg (v1) auf dem Fall
+'lineare' dasselbe liefern wie die alte Fixpunkt-Schleife.
+"""
+import argparse
+import math
+import os
+import re
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
+
+from codemod_corpus import CASES, REALISTIC  # noqa: E402
+from codemod_rules import RULES, make_svg  # noqa: E402
+
+START = 1000
+MAX_SIZE = 64000
+BUDGET = 1.0
+REPEAT = 3
+MAX_EXPONENT = 1.3
+# Kürzere Läufe sind reines Rauschen und gehen nicht in die Schätzung ein
+MIN_TIME = 0.002
+
+# Die Ausdrücke der alten fix_*.py-Skripte
+OLD_CHEVRON = re.compile(r'<span[^>]*\$\{([^?`]+?)\s*\?\s*\'rotate-45\'\s*:\s*\'\'\}[^`]*`\}>➕</span>')
+OLD_RECHENWEG = re.compile(r"\['([^']+)',\s*'\1\s+\|\s+([^']+)'")
+OLD_RECHENWEG_V3 = re.compile(r"rechenweg:\s*\['([^']+)',\s*'([^']+)\s+\|\s+([^']+)'")
+
+
+def legacy_chevron(content):
+    return OLD_CHEVRON.sub(lambda m: make_svg(m.group(1)), content)
+
+
+def legacy_rechenweg(content, max_iterations=None):
+    """
+    Die Fixpunkt-Schleife von fix_rechenweg.py. Das Skript brach nach 100 Runden ab; als
+    Referenz läuft sie ohne Grenze bis zum Fixpunkt, sonst verdeckt die Grenze auf langen
+    Ketten (codemod_corpus.ketten) gerade die Kosten, um die es geht.
+    """
+    rounds = 0
+    while max_iterations is None or rounds < max_iterations:
+        content, n = OLD_RECHENWEG.subn(lambda m: f"['{m.group(1)}  | {m.group(2)}'", content)
+        if not n:
+            break
+        rounds += 1
+    return content
+
+
+def legacy_rechenweg_v3(content):
+    return OLD_RECHENWEG_V3.sub(lambda m: f"rechenweg: ['{m.group(1)}  | {m.group(3)}', '{m.group(2)}'", content)
+
+
+LEGACY = {
+    'alt-chevron': legacy_chevron,
+    'alt-rechenweg': legacy_rechenweg,
+    'alt-rechenweg-v3': legacy_rechenweg_v3,
+}
+
+
+def timed(func, text, repeat):
+    """Beste von repeat Laufzeiten; ein einzelner langer Lauf wird nicht wiederholt."""
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+        if best > BUDGET / 4:
+            break
+    return best
+
+
+def exponent(points):
+    """Steigung der Ausgleichsgeraden durch (log Länge, log Zeit); None bei zu wenig Punkten."""
+    points = [(math.log(size), math.log(t)) for size, t in points if t >= MIN_TIME]
+    if len(points) < 2:
+        return None
+    mx = sum(x for x, _ in points) / len(points)
+    my = sum(y for _, y in points) / len(points)
+    sxx = sum((x - mx) ** 2 for x, _ in points)
+    return sum((x - mx) * (y - my) for x, y in points) / sxx if sxx else None
+
+
+def measure(func, case, start=START, max_size=MAX_SIZE, budget=BUDGET, repeat=REPEAT):
+    """Misst func auf dem Fall in verdoppelten Größen. Liefert [(Textlänge, Sekunden), ...]."""
+    points = []
+    n = start
+    while n <= max_size:
+        text = CASES[case](n)
+        seconds = timed(func, text, repeat)
+        points.append((len(text), seconds))
+        if seconds > budget:
+            break
+        n *= 2
+    return points
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Codemod-Regeln auf generierten Eingaben vermessen und auf super-lineares Wachstum prüfen.')
+    parser.add_argument('--rules', nargs='+', choices=sorted(RULES) + sorted(LEGACY), help='nur diese Regeln')
+    parser.add_argument('--cases', nargs='+', choices=sorted(CASES), help='nur diese Fälle')
+    parser.add_argument('--legacy', action='store_true', help='die Ausdrücke der alten fix_*.py mitmessen')
+    parser.add_argument('--start', type=int, default=START, help='kleinste Größe (Einheiten des Falls)')
+    parser.add_argument('--max-size', type=int, default=MAX_SIZE, help='größte Größe')
+    parser.add_argument('--budget', type=float, default=BUDGET, help='Sekunden, ab denen nicht weiter verdoppelt wird')
+    parser.add_argument('--max-exponent', type=float, default=MAX_EXPONENT, help='Wachstumsexponent, ab dem eine Regel auffällt')
+    args = parser.parse_args(argv)
+
+    rules = {name: rule.apply for name, rule in RULES.items()}
+    if args.legacy:
+        rules.update(LEGACY)
+    if args.rules:
+        rules = {name: rules.get(name) or LEGACY[name] for name in args.rules}
+    cases = args.cases or list(CASES)
+
+    failed = []
+    for name, func in rules.items():
+        for case in cases:
+            points = measure(func, case, args.start, args.max_size, args.budget)
+            k = exponent(points)
+            flag = k is not None and k > args.max_exponent
+            if flag and name not in LEGACY:
+                failed.append((name, case))
+            largest, seconds = points[-1]
+            print(f'{name:17} {case:19} {"realistisch" if case in REALISTIC else "adversarial":11} '
+                  f'{len(points)} Größen, größte {largest / 1e6:6.2f} MB in {seconds * 1000:8.1f} ms, '
+                  f'Exponent {"-" if k is None else f"{k:4.2f}":>4}{"  SUPER-LINEAR" if flag else ""}')
+
+    if args.legacy and 'lineare' in cases:
+        text = CASES['lineare'](START)
+        if RULES['rechenweg'].apply(text)[0] != legacy_rechenweg(text):
+            print('rechenweg weicht auf "lineare" von der alten Fixpunkt-Schleife ab')
+            failed.append(('rechenweg', 'lineare'))
+
+    if failed:
+        print('\nAuffällig: ' + ', '.join(f'{name} auf {case}' for name, case in failed))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
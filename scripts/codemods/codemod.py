@@ -0,0 +1,181 @@
+"""Wendet Codemods (codemod_rules.py) auf die TSX/TS-Quellen von mathe-trainer und module an.
+
+Aufruf aus beliebigem Verzeichnis:
+    python scripts/codemods/codemod.py chevron                 # alle Dateien unter */src
+    python scripts/codemods/codemod.py rechenweg --dry-run     # nur Unified-Diffs ausgeben
+    python scripts/codemods/codemod.py rechenweg-v3 --glob 'mathe-trainer/src/**/Generator_*.tsx'
+    python scripts/codemods/codemod.py --list
+
+Ablauf pro Datei: Rohbytes lesen, SHA-256 bilden - kennt der Cache diesen Hash für die
+Regel schon als fertig migriert, ist die Datei erledigt. Sonst entscheidet ein
+Literal-Vorfilter (z.B. 'rechenweg', '➕'), ob die Regel überhaupt laufen muss; nur die
+übrigen Kandidaten gehen an den Prozess-Pool. Geänderte Dateien werden atomar ersetzt
+(mathe-trainer/atomic_write.py, wie bei den übrigen Generatoren), Zeilenenden bleiben erhalten.
+
+Der Cache (.codemod-cache.json neben diesem Skript) merkt sich pro Regel und Datei den
+Hash des migrierten Inhalts; ändern sich die Regeln (RULE_SOURCES), ist er ungültig. --force
+ignoriert ihn.
+"""
+import argparse
+import difflib
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(os.path.dirname(HERE))
+MATHE_TRAINER = os.path.join(ROOT, 'mathe-trainer')
+for _path in (HERE, MATHE_TRAINER):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+from atomic_write import write_atomic  # noqa: E402  (braucht MATHE_TRAINER in sys.path)
+from codemod_rules import RULES  # noqa: E402  (braucht HERE in sys.path)
+
+CACHE = os.path.join(HERE, '.codemod-cache.json')
+# Quelltexte, von denen das Ergebnis der Regeln abhängt
+RULE_SOURCES = ('codemod_rules.py', 'rechenweg_transform.py')
+
+
+def digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def rules_version():
+    """Hash über den Quelltext der Regeln - andere Regeln, anderer Cache."""
+    h = hashlib.sha256()
+    for name in RULE_SOURCES:
+        with open(os.path.join(HERE, name), 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def discover(globs, root=ROOT):
+    """Alle Dateien zu den Suchmustern (relativ zu root), sortiert und ohne Doppelte."""
+    paths = set()
+    for pattern in globs:
+        paths.update(p for p in glob.glob(os.path.join(root, pattern), recursive=True) if os.path.isfile(p))
+    return sorted(paths)
+
+
+def load_cache(path=CACHE):
+    try:
+        with open(path, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if cache.get('rules') == rules_version() else {}
+
+
+def save_cache(cache, path=CACHE):
+    cache['rules'] = rules_version()
+    write_atomic(path, (json.dumps(cache, indent=2, sort_keys=True) + '\n').encode('utf-8'))
+
+
+def migrate(rule_name, path, dry_run=False, root=ROOT):
+    """
+    Worker: wendet die Regel auf eine Datei an. Liefert (Pfad, Anzahl Ersetzungen,
+    Hash des Ergebnisses, Diff) - bei dry_run wird nichts geschrieben und der Hash ist None,
+    sofern sich etwas ändern würde.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    old = data.decode('utf-8')
+    new, count = RULES[rule_name].apply(old)
+    if new == old:
+        return path, 0, digest(data), ''
+    rel = os.path.relpath(path, root).replace(os.sep, '/')
+    if dry_run:
+        diff = ''.join(difflib.unified_diff(old.splitlines(keepends=True), new.splitlines(keepends=True),
+                                            f'a/{rel}', f'b/{rel}'))
+        return path, count, None, diff
+    data = new.encode('utf-8')
+    write_atomic(path, data)
+    return path, count, digest(data), ''
+
+
+def _migrate(args):
+    return migrate(*args)
+
+
+def run(rule_name, paths=None, dry_run=False, jobs=None, force=False, cache_path=CACHE, root=ROOT):
+    """
+    Führt die Regel über paths (Standard: die Suchmuster der Regel) aus.
+    Liefert eine Liste von (Pfad, Anzahl, Diff) der geänderten Dateien und eine Statistik.
+    """
+    rule = RULES[rule_name]
+    if paths is None:
+        paths = discover(rule.globs, root)
+    cache = {} if force else load_cache(cache_path)
+    done = cache.setdefault(rule_name, {})
+    stats = {'files': len(paths), 'cached': 0, 'filtered': 0, 'candidates': 0}
+
+    candidates = []
+    for path in paths:
+        rel = os.path.relpath(path, root).replace(os.sep, '/')
+        with open(path, 'rb') as f:
+            data = f.read()
+        h = digest(data)
+        if done.get(rel) == h:
+            stats['cached'] += 1
+        elif not rule.matches(data):
+            stats['filtered'] += 1
+            done[rel] = h
+        else:
+            candidates.append(path)
+    stats['candidates'] = len(candidates)
+
+    tasks = [(rule_name, path, dry_run, root) for path in candidates]
+    if jobs == 1 or len(tasks) < 2:
+        results = list(map(_migrate, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_migrate, tasks))
+
+    changed = []
+    for path, count, h, diff in results:
+        rel = os.path.relpath(path, root).replace(os.sep, '/')
+        if h is not None:
+            done[rel] = h
+        if count or diff:
+            changed.append((path, count, diff))
+    save_cache(cache, cache_path)
+    return changed, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Codemods auf die TSX/TS-Quellen (mathe-trainer/src, module/src) anwenden.')
+    parser.add_argument('rule', nargs='?', choices=sorted(RULES), help='Regel aus codemod_rules.py')
+    parser.add_argument('--glob', action='append', metavar='MUSTER',
+                        help='Suchmuster relativ zum Repo (mehrfach möglich, Standard: */src/**/*.tsx und *.ts)')
+    parser.add_argument('--dry-run', action='store_true', help='Nichts schreiben, Änderungen als Unified-Diff ausgeben')
+    parser.add_argument('--jobs', type=int, default=None, help='Anzahl Worker-Prozesse (Standard: ein Prozess pro Kern)')
+    parser.add_argument('--force', action='store_true', help='Cache ignorieren und alle Kandidaten neu prüfen')
+    parser.add_argument('--list', action='store_true', help='Verfügbare Regeln anzeigen')
+    args = parser.parse_args(argv)
+
+    if args.list or not args.rule:
+        for name, rule in sorted(RULES.items()):
+            print(f'{name:14} Vorfilter: {", ".join(n.decode("utf-8") for n in rule.needles)}')
+        return 0
+
+    start = time.perf_counter()
+    paths = discover(args.glob) if args.glob else None
+    changed, stats = run(args.rule, paths, args.dry_run, args.jobs, args.force)
+    for path, count, diff in changed:
+        if diff:
+            sys.stdout.write(diff)
+        else:
+            print(f'{count} Ersetzungen in {os.path.relpath(path, ROOT)}')
+    print(f'{args.rule}: {stats["files"]} Dateien, {stats["cached"]} aus dem Cache, {stats["filtered"]} vorgefiltert, '
+          f'{stats["candidates"]} geprüft, {len(changed)} {"zu ändern" if args.dry_run else "geändert"} '
+          f'({time.perf_counter() - start:.2f} s)', file=sys.stderr if args.dry_run else sys.stdout)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Generierte TSX-Eingaben für den Codemod-Benchmark (benchmark.py).
+
+Jeder Fall ist eine Funktion n -> Text, deren Länge linear in n wächst. Realistische Fälle
+bilden die echten Quellen nach (Aufgabenlisten wie Generator_lineare.tsx, Akkordeons wie
+module/src/pages/gamification/*.tsx), die adversarialen zielen auf die Stellen, an denen
+reguläre Ausdrücke zurückspringen: offene Tags und Arrays, viele Platzhalter ohne Treffer,
+lange Ketten, die eine Fixpunkt-Schleife Runde um Runde abarbeiten muss.
+
+    text = CASES['lineare'](10000)
+"""
+import math
+import random
+
+
+def aufgabe(i, rng):
+    """Eine Aufgabenzeile a·x + b = c in einer von vier Schreibweisen (migriert, doppelt, verkettet, verschoben)."""
+    a, x, b = rng.randint(2, 9), rng.randint(-20, 20), rng.randint(1, 30)
+    c = a * x + b
+    g1, g2, g3 = f'{a}x + {b} = {c}', f'{a}x = {c - b}', f'x = {x}'
+    kind = i % 4
+    if kind == 0:    # schon migriert
+        steps = [f'{g1}  | - {b}', f'{g2}  | :{a}', g3]
+    elif kind == 1:  # doppelter erster Schritt
+        steps = [g1, f'{g1}  | - {b}', f'{g2}  | :{a}', g3]
+    elif kind == 2:  # verkettet: erst nach zwei Zusammenführungen fertig
+        steps = [g1, f'{g1}  | - {b}', f'{g1}  | - {b}  | :{a}', g3]
+    else:            # Umformung steht an der Folgegleichung (v3)
+        steps = [g1, f'{g2}  | - {b}', f'{g2}  | :{a}', g3]
+    rechenweg = ', '.join(f"'{s}'" for s in steps)
+    return f"      {{ id: 'e{i}', aufgabe: '{g1}', loesung: {x}, rechenweg: [{rechenweg}] }},\n"
+
+
+def lineare(n, seed=0):
+    """n Aufgaben im Aufbau von Generator_lineare.tsx."""
+    rng = random.Random(seed)
+    return ('interface Aufgabe {\n  id: string;\n  rechenweg: string[];\n}\n\n'
+            'const aufgaben: Aufgabe[] = [\n' + ''.join(aufgabe(i, rng) for i in range(n)) + '];\n')
+
+
+def akkordeon(n):
+    """n aufklappbare Abschnitte wie in den Gamification-Seiten, mit ➕-Span und Text dazwischen."""
+    items = ''.join(
+        f'        <button onClick={{() => toggle({i})}} className="w-full flex justify-between items-center p-4">\n'
+        f'          <span className="font-semibold text-left">Frage {i}</span>\n'
+        f"          <span className={{`text-xl transition-transform ${{open[{i}] ? 'rotate-45' : ''}}`}}>➕</span>\n"
+        f'        </button>\n'
+        f'        {{open[{i}] && <p className="p-4 text-slate-600">Antwort {i} mit ${{Platzhalter}} im Text.</p>}}\n'
+        for i in range(n))
+    return 'export default function Seite() {\n  return (\n' + items + '  );\n}\n'
+
+
+def span_offen(n):
+    """Ein <span, das nie geschlossen wird, mit n Platzhaltern ohne '?' - Rückschritte über jeden."""
+    return '<span className={`' + '${a} ' * n + '\n'
+
+
+def spans_ohne_treffer(n):
+    """n Spans mit Bedingung, aber ohne ➕ am Ende - jeder Versuch scheitert erst spät."""
+    return "<span className={`x ${open ? 'rotate-45' : ''}`}>+</span>\n" * n
+
+
+def bedingungen(n):
+    """Ein Span mit n passenden Bedingungen, aber ohne schließendes `} - jede könnte bis zum Ende suchen."""
+    return "<span className={`" + "${open ? 'rotate-45' : ''} " * n + '}>➕</span>\n'
+
+
+def arrays_offen(n):
+    """rechenweg-Arrays, deren Elemente wieder wie `rechenweg: [` aussehen und die nie geschlossen werden."""
+    return "rechenweg: ['rechenweg: [', " * n + '\n'
+
+
+def lange_kette(n):
+    """
+    Ein Array, in dem jedes Element das vorige plus eine Umformung ist. Die Elemente werden
+    immer länger, daher hat die Kette isqrt(n) Glieder (Textlänge ~ n) - eine Fixpunkt-Schleife
+    braucht ebenso viele Runden über die ganze Datei.
+    """
+    steps = ['x = 1']
+    for i in range(math.isqrt(n)):
+        steps.append(f'{steps[-1]}  | + {i % 10}')
+    return 'rechenweg: [' + ', '.join(f"'{s}'" for s in steps) + ']\n'
+
+
+def ketten(n):
+    """
+    Eine Aufgabenliste (lineare) mit einer eingestreuten langen Kette (lange_kette). Die
+    Fixpunkt-Schleife braucht isqrt(n) Runden, und jede Runde versucht den Ausdruck an jedem
+    der ~n/25 Arrays der Liste - Runden mal Dateigröße, also ~n^1.5.
+    """
+    liste = lineare(max(n // 25, 1))
+    mitte = liste.index('      {', len(liste) // 2)
+    return liste[:mitte] + '      { ' + lange_kette(n).rstrip('\n') + ' },\n' + liste[mitte:]
+
+
+def strings_offen(n):
+    """Viele Array-Anfänge mit einem String, der bis zum Zeilenende offen bleibt."""
+    return "rechenweg: ['x = 1', 'x = 1 " * n + '\n'
+
+
+CASES = {
+    'lineare': lineare,
+    'akkordeon': akkordeon,
+    'span-offen': span_offen,
+    'spans-ohne-treffer': spans_ohne_treffer,
+    'bedingungen': bedingungen,
+    'arrays-offen': arrays_offen,
+    'lange-kette': lange_kette,
+    'ketten': ketten,
+    'strings-offen': strings_offen,
+}
+REALISTIC = ('lineare', 'akkordeon')
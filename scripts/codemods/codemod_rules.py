@@ -0,0 +1,82 @@
+"""Regeln für codemod.py - die Umformungen der früheren fix_*.py-Skripte.
+
+Jede Regel hat einen Namen, Suchmuster für die Dateien (relativ zum Repo), Literale für
+den Vorfilter und eine Funktion apply(text) -> (neuer Text, Anzahl Ersetzungen). Dateien,
+die keines der Literale enthalten, bekommt die Regel gar nicht erst zu sehen.
+
+    chevron        ➕-Span mit rotate-45 -> SVG-Chevron mit rotate-180 (fix_chevron.py)
+    rechenweg      ['G', 'G  | op', ...] -> ['G  | op', ...] (fix_rechenweg.py)
+    rechenweg-v2   dieselbe Regel, einmal pro Array und nur in exakter Schreibweise (fix_rechenweg_v2.py)
+    rechenweg-v3   rechenweg: ['G1', 'G2  | op' -> rechenweg: ['G1  | op', 'G2' (fix_rechenweg_v3.py)
+
+Die rechenweg-Regeln sind Modi von rechenweg_transform.transform (ein Durchlauf, linear).
+"""
+import re
+
+from rechenweg_transform import transform
+
+# Zielordner aller Codemods (TSX/TS-Quellen beider Web-Apps)
+SOURCE_GLOBS = ('mathe-trainer/src/**/*.tsx', 'mathe-trainer/src/**/*.ts',
+                'module/src/**/*.tsx', 'module/src/**/*.ts')
+
+
+class Rule:
+    """Eine Umformung: needles sind Literale, von denen mindestens eines in der Datei stehen muss."""
+
+    def __init__(self, name, needles, apply, globs=SOURCE_GLOBS):
+        self.name = name
+        self.needles = tuple(n.encode('utf-8') for n in needles)
+        self.apply = apply
+        self.globs = globs
+
+    def matches(self, data):
+        """Billiger Vorfilter auf den Rohbytes der Datei."""
+        return any(n in data for n in self.needles)
+
+
+# <span className={`...${CONDITION ? 'rotate-45' : ''}`}>➕</span>
+# In zwei linearen Schritten statt eines Ausdrucks, der über jedes `${` zurückspringt
+# (siehe benchmark.py, Fall span-offen): erst das ganze Span (Attribute ohne < und >), dann
+# im letzten Template-String der Attribute die letzte Bedingung - sie reicht bis zum
+# ersten '?' und enthält keine Klammern.
+CHEVRON_SPAN = re.compile(r'<span([^<>]*)>➕</span>')
+CHEVRON_CONDITION = re.compile(r"\$\{([^?`{}]+)\?\s*'rotate-45'\s*:\s*''\}")
+
+
+def make_svg(condition):
+    cond = condition.strip()
+    return (
+        '<svg className={`w-5 h-5 text-slate-400 flex-shrink-0 ml-4 transform transition-transform '
+        '${' + cond + " ? 'rotate-180' : ''}"
+        '`} fill="none" viewBox="0 0 24 24" stroke="currentColor" strokeWidth={2}>'
+        '<path strokeLinecap="round" strokeLinejoin="round" d="M19 9l-7 7-7-7" /></svg>'
+    )
+
+
+def fix_chevron(content):
+    count = 0
+
+    def replace(m):
+        nonlocal count
+        attrs = m.group(1)
+        if not attrs.endswith('`}'):
+            return m.group(0)
+        conditions = CHEVRON_CONDITION.findall(attrs, attrs.rfind('`', 0, len(attrs) - 2) + 1)
+        if not conditions:
+            return m.group(0)
+        count += 1
+        return make_svg(conditions[-1])
+
+    return CHEVRON_SPAN.sub(replace, content), count
+
+
+def rechenweg_rule(mode):
+    return lambda content: transform(content, mode)
+
+
+RULES = {rule.name: rule for rule in (
+    Rule('chevron', ('➕',), fix_chevron),
+    Rule('rechenweg', ('rechenweg',), rechenweg_rule('v1')),
+    Rule('rechenweg-v2', ('rechenweg',), rechenweg_rule('v2')),
+    Rule('rechenweg-v3', ('rechenweg',), rechenweg_rule('v3')),
+)}
@@ -0,0 +1,174 @@
+"""Einmaliger, linearer Umbau aller `rechenweg: [...]`-Arrays in TSX/TS-Quellen.
+
+Statt re.sub bis zu 100-mal über die ganze Datei laufen zu lassen (fix_rechenweg.py), wird
+der Text einmal durchsucht: ein linearer Ausdruck (ARRAY) findet jedes `rechenweg: [...]`,
+dessen Elemente nur String-Literale sind ('...' oder "...", Escapes erlaubt), und ein
+kleiner Tokenizer (parse_array) zerlegt es in Literale und die Trenner dazwischen. Arrays mit anderen Elementen (Variablen, Templates,
+Kommentare) bleiben unangetastet. Umgeschrieben werden nur die betroffenen Elemente, alle
+Trenner (Kommas, Zeilenumbrüche, Einrückung) bleiben erhalten.
+
+Kosten: gesucht wird zuerst nur mit einem kurzen Vorfilter pro Modus (HEADS); ganz zerlegt
+wird ein Array erst, wenn seine ersten beiden Literale passen. Auf schon migrierten Dateien
+ist das etwa so schnell wie eine Runde der alten Schleife. Wo tatsächlich umgeschrieben
+wird, kostet das Zerlegen in Python pro Array mehr als ein re.subn - auf 50 000 Aufgaben
+aus codemod_corpus.lineare rund 0,25 s gegen 0,07 s für die alte Schleife. Dafür ist die
+Laufzeit linear, auch bei langen Ketten, und Escapes, Anführungszeichen und ein zweiter Lauf
+(v3) werden richtig behandelt.
+
+Modi (die Regeln der früheren Skripte):
+    v1  ['G', 'G  | op', ...] -> ['G  | op', ...], wiederholt, solange das nächste
+        Element wieder mit dem ersten beginnt (fix_rechenweg.py, Fixpunkt in einem Durchlauf)
+    v2  dieselbe Zusammenführung einmal pro Array und nur in der Schreibweise
+        ['G', 'G  | op' mit ', ' und zwei Leerzeichen vor '|' (fix_rechenweg_v2.py)
+    v3  ['G1', 'G2  | op', ...] -> ['G1  | op', 'G2', ...] - die Umformung wandert an die
+        Gleichung, auf die sie angewendet wird (fix_rechenweg_v3.py). Anders als das alte
+        Skript nur, wenn G1 noch keine Umformung trägt und G2 nicht gleich G1 ist, sodass
+        ein zweiter Lauf nichts mehr ändert.
+
+    text, count = transform(source, 'v1')
+"""
+
+import re
+
+MODES = ('v1', 'v2', 'v3')
+# String-Literal '...' oder "..." als "unrolled loop": jedes Zeichen passt auf genau einen
+# Zweig, es gibt kein Backtracking - alle Ausdrücke hier laufen linear in der Eingabelänge.
+STRING = r"""'[^'\\\n]*(?:\\.[^'\\\n]*)*'|"[^"\\\n]*(?:\\.[^"\\\n]*)*\""""
+_WS = r'[ \t\r\n]*'
+# `rechenweg: [...]` (auch 'rechenweg' / "rechenweg") mit nur String-Literalen im Array. Der
+# Ausdruck beginnt mit dem Literal, damit re schnell vorsucht; die Wortgrenze davor prüft
+# transform().
+ARRAY = re.compile(rf"""rechenweg(['"]?){_WS}:{_WS}"""
+                   rf"""(\[{_WS}(?:(?:{STRING}){_WS}(?:,{_WS}(?:{STRING}){_WS})*(?:,{_WS})?)?\])""")
+# Ein Element im Array: Trenner davor (Kommas, Leerraum) und das Literal
+ITEM = re.compile(rf"""([^'"]*)({STRING})""")
+
+# Vorfilter je Modus: nur der Anfang eines Arrays, dessen erste beiden Literale überhaupt
+# umgeschrieben werden könnten - bei v1/v2 beginnt das zweite mit dem Inhalt des ersten
+# (Rückverweis), bei v3 prüft transform() die beiden Literale mit shift_operation. Schon
+# migrierte Arrays (der Normalfall) scheitern nach wenigen Zeichen; ARRAY, parse_array und
+# render laufen nur an diesen Stellen.
+_HEAD = rf"""rechenweg(['"]?){_WS}:{_WS}\[{_WS}"""
+_SINGLE, _DOUBLE = r"[^'\\\n]*(?:\\.[^'\\\n]*)*", r'[^"\\\n]*(?:\\.[^"\\\n]*)*'
+HEADS = {
+    'v1': re.compile(rf"""{_HEAD}(?:'({_SINGLE})'{_WS},{_WS}'\2|"({_DOUBLE})"{_WS},{_WS}"\3)"""),
+    'v3': re.compile(rf"""{_HEAD}({STRING}){_WS},{_WS}({STRING})"""),
+}
+HEADS['v2'] = HEADS['v1']
+SEPARATORS = ' \t\r\n,'
+
+
+def parse_array(array):
+    """
+    Zerlegt '[...]' in (items, gaps): items sind [quote, roh] (Inhalt ohne Anführungszeichen,
+    Escapes unverändert), gaps die Trenner - gaps[0] vor dem ersten Element, gaps[k]
+    zwischen Element k-1 und k, gaps[-1] vor ']'.
+    """
+    pairs = ITEM.findall(array, 1, len(array) - 1)
+    body = array[:-1]
+    gaps = [gap for gap, _ in pairs]
+    gaps.append(body[len(body.rstrip(SEPARATORS)):] if pairs else body[1:])
+    return [[literal[0], literal[1:-1]] for _, literal in pairs], gaps
+
+
+def _after_bar(rest):
+    """Aus '<Leerraum>|<Leerraum>op' die Umformung op, sonst None."""
+    if not rest or not rest[0].isspace():
+        return None
+    rest = rest.lstrip()
+    if not rest.startswith('|') or len(rest) < 2 or not rest[1].isspace():
+        return None
+    return rest[1:].lstrip() or None
+
+
+def split_step(step):
+    """'G  | op' -> ('G', 'op'), getrennt am letzten '|'; ohne Umformung None."""
+    bar = step.rfind('|')
+    if bar <= 0 or not step[bar - 1].isspace():
+        return None
+    op = _after_bar(step[bar - 1:])
+    equation = step[:bar].rstrip()
+    return (equation, op) if op and equation else None
+
+
+def merge_duplicates(items, gaps, once=False, strict=False):
+    """Modus v1/v2: ['G', 'G  | op', ...] -> ['G  | op', ...]. Liefert die Anzahl Zusammenführungen."""
+    count = 0
+    while len(items) >= 2 and items[0][0] == items[1][0]:
+        first, second = items[0][1], items[1][1]
+        if not second.startswith(first):
+            break
+        op = _after_bar(second[len(first):])
+        if op is None or (strict and (gaps[1] != ', ' or second != f'{first}  | {op}')):
+            break
+        items[0][1] = f'{first}  | {op}'
+        del items[1], gaps[1]
+        count += 1
+        if once:
+            break
+    return count
+
+
+def shift_operation(items, gaps):
+    """Modus v3: ['G1', 'G2  | op', ...] -> ['G1  | op', 'G2', ...]. Liefert 1 bei einer Änderung, sonst 0."""
+    if len(items) < 2 or items[0][0] != items[1][0] or split_step(items[0][1]) is not None:
+        return 0
+    split = split_step(items[1][1])
+    if split is None or split[0] == items[0][1]:
+        return 0
+    equation, op = split
+    items[0][1] = f'{items[0][1]}  | {op}'
+    items[1][1] = equation
+    return 1
+
+
+def rewrite(items, gaps, mode):
+    if mode == 'v1':
+        return merge_duplicates(items, gaps)
+    if mode == 'v2':
+        return merge_duplicates(items, gaps, once=True, strict=True)
+    if mode == 'v3':
+        return shift_operation(items, gaps)
+    raise ValueError(f'Unbekannter Modus {mode!r} (erlaubt: {", ".join(MODES)})')
+
+
+def render(items, gaps):
+    out = ['[', gaps[0]]
+    for (quote, raw), gap in zip(items, gaps[1:]):
+        out += (quote, raw, quote, gap)
+    out.append(']')
+    return ''.join(out)
+
+
+def transform(text, mode='v1'):
+    """Normalisiert alle rechenweg-Arrays in text in einem Durchlauf. Liefert (neuer Text, Anzahl Änderungen)."""
+    if mode not in MODES:
+        raise ValueError(f'Unbekannter Modus {mode!r} (erlaubt: {", ".join(MODES)})')
+    total = 0
+    out, last, end = [], 0, 0
+    for head in HEADS[mode].finditer(text):
+        start = head.start()
+        # liegt in einem schon gelesenen Array (z.B. in einem seiner Literale)
+        if start < end:
+            continue
+        before = text[start - 1] if start else ''
+        if (before != head.group(1)) if head.group(1) else (before.isalnum() or before == '_' or before == '$'):
+            continue
+        if mode == 'v3':
+            first, second = head.group(2), head.group(3)
+            if not shift_operation([[first[0], first[1:-1]], [second[0], second[1:-1]]], None):
+                continue
+        m = ARRAY.match(text, start)
+        if m is None:
+            continue
+        end = m.end()
+        items, gaps = parse_array(m.group(2))
+        count = rewrite(items, gaps, mode)
+        if count:
+            total += count
+            out += (text[last:m.start(2)], render(items, gaps))
+            last = m.end()
+    if not total:
+        return text, 0
+    out.append(text[last:])
+    return ''.join(out), total
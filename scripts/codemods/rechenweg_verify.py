@@ -0,0 +1,505 @@
+"""Prüft die Rechenwege der Gleichungs-Generatoren mit exakter Bruchrechnung.
+
+Jedes `rechenweg: [...]`-Array (gefunden wie in rechenweg_transform) wird in Schritte
+zerlegt: eine Gleichung und die Umformungen dahinter ('| - 7', '| :3', '| · (-1)',
+'| -2x +7', '| Ausmultiplizieren') bzw. Textschritte wie 'Multipliziere beide Seiten mit 3'
+(Generator_Bruchgleichungen, dort in LaTeX). Beide Seiten werden als gebrochen-rationale
+Ausdrücke in x mit fractions.Fraction-Koeffizienten gelesen (Klammern, implizite
+Multiplikation, x², gemischte Zahlen wie '3 2/3', Dezimalzahlen, 'x = ±2√5').
+
+Für jeden Übergang Gleichung k -> k+1:
+    ok            die Umformung von k, auf beide Seiten angewendet, ergibt Seite für Seite
+                  k+1 (ohne Umformung: k+1 ist k vereinfacht oder mit getauschten Seiten)
+    verschoben    die Umformung steht an k+1, gehört aber zu k (alte Schreibweise, siehe
+                  Codemod rechenweg-v3)
+    zusammengefasst  keine Umformung passt, die Gleichungen haben aber dieselbe Lösungsmenge
+    falsch        die Gleichungen sind nicht äquivalent
+    unlesbar      eine der beiden Gleichungen ließ sich nicht lesen
+
+Gleichungen und Umformungen werden pro Text nur einmal gelesen (lru_cache) - dieselben
+Zwischenschritte kommen in den Generatoren oft vor.
+
+    python rechenweg_verify.py                   # alle Generator_*.tsx unter gleichungen/
+    python rechenweg_verify.py --all             # auch verschoben/zusammengefasst/unlesbar zeigen
+    python rechenweg_verify.py --benchmark 20000 # synthetische Datei (codemod_corpus.lineare)
+"""
+import argparse
+import bisect
+import glob
+import os
+import re
+import sys
+import time
+from fractions import Fraction
+from functools import lru_cache
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(os.path.dirname(HERE))
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
+
+from rechenweg_transform import ARRAY, parse_array  # noqa: E402
+
+GLOBS = ('mathe-trainer/src/pages/rechnen_lernen/gleichungen/Generator_*.tsx',)
+OK, VERSCHOBEN, ZUSAMMENGEFASST, FALSCH, UNLESBAR = 'ok', 'verschoben', 'zusammengefasst', 'falsch', 'unlesbar'
+STATUS = (OK, VERSCHOBEN, ZUSAMMENGEFASST, FALSCH, UNLESBAR)
+
+
+class ParseError(ValueError):
+    pass
+
+
+# Polynome: Tupel von Fractions, Index = Grad, ohne führende Nullen (() ist das Nullpolynom).
+# Ausdrücke: (Zähler, Nenner) als gebrochen-rationale Funktion.
+
+def trim(p):
+    p = list(p)
+    while p and not p[-1]:
+        p.pop()
+    return tuple(p)
+
+
+def padd(a, b):
+    if len(a) < len(b):
+        a, b = b, a
+    return trim(tuple(c + (b[i] if i < len(b) else 0) for i, c in enumerate(a)))
+
+
+def pneg(a):
+    return tuple(-c for c in a)
+
+
+def pmul(a, b):
+    if not a or not b:
+        return ()
+    if len(b) == 1:
+        return trim(tuple(c * b[0] for c in a)) if b[0] != 1 else a
+    if len(a) == 1:
+        return pmul(b, a)
+    out = [Fraction(0)] * (len(a) + len(b) - 1)
+    for i, c in enumerate(a):
+        if c:
+            for j, d in enumerate(b):
+                out[i + j] += c * d
+    return trim(out)
+
+
+ONE = (Fraction(1),)
+X = (Fraction(0), Fraction(1))
+
+
+def ratio(num, den):
+    """Ausdruck num/den; ein konstanter Nenner wird in den Zähler gezogen (meist bleibt es ein Polynom)."""
+    if len(den) == 1 and den[0] != 1:
+        return tuple(c / den[0] for c in num), ONE
+    return num, den
+
+
+def const(value):
+    return trim((Fraction(value),)), ONE
+
+
+def add(a, b):
+    if a[1] == b[1]:
+        return padd(a[0], b[0]), a[1]
+    return ratio(padd(pmul(a[0], b[1]), pmul(b[0], a[1])), pmul(a[1], b[1]))
+
+
+def sub(a, b):
+    return add(a, (pneg(b[0]), b[1]))
+
+
+def mul(a, b):
+    return ratio(pmul(a[0], b[0]), pmul(a[1], b[1]))
+
+
+def div(a, b):
+    if not b[0]:
+        raise ParseError('Division durch 0')
+    return ratio(pmul(a[0], b[1]), pmul(a[1], b[0]))
+
+
+def same(a, b):
+    """Gleiche gebrochen-rationale Funktion (über Kreuz multipliziert)."""
+    if a[1] == b[1]:
+        return a[0] == b[0]
+    return pmul(a[0], b[1]) == pmul(b[0], a[1])
+
+
+def proportional(p, q):
+    """p = c·q mit c != 0 (beide Null zählt als gleich)."""
+    if not p or not q:
+        return not p and not q
+    return len(p) == len(q) and pmul(p, (q[-1],)) == pmul(q, (p[-1],))
+
+
+# Lesen
+
+# Zahl, Variable (ein Buchstabe - x, in manchen Aufgaben z), Hochzahl, Wurzel, Operator
+TOKEN = re.compile(r'\s*(?:(\d+(?:[.,]\d+)?)|([a-z])(?![a-zäöüß])|([²³])|\^(\d+)|(√)|([-+·*×:/()\[\]]))')
+LATEX = (
+    (re.compile(r'\\(?:left|right|displaystyle|,|;|!|quad)'), ''),
+    (re.compile(r'\\(?:cdot|times)'), '·'),
+    (re.compile(r'\\div'), ':'),
+    (re.compile(r'\\pm'), '±'),
+    (re.compile(r'\\approx'), '≈'),
+    (re.compile(r'\\sqrt'), '√'),
+)
+FRAC = re.compile(r'\\[dt]?frac\s*\{')
+
+
+def _group(text, start):
+    """Index hinter der schließenden Klammer der {...}-Gruppe, die bei text[start] == '{' beginnt."""
+    depth = 0
+    for i in range(start, len(text)):
+        if text[i] == '{':
+            depth += 1
+        elif text[i] == '}':
+            depth -= 1
+            if not depth:
+                return i + 1
+    raise ParseError('offene Klammer in LaTeX')
+
+
+def plain(text):
+    """LaTeX ($...$, \\frac, \\cdot, ...) in die Schreibweise der übrigen Generatoren."""
+    text = text.replace('$', '')
+    m = FRAC.search(text)
+    while m:
+        a_end = _group(text, m.end() - 1)
+        b_start = text.index('{', a_end)
+        b_end = _group(text, b_start)
+        text = (text[:m.start()] + '((' + text[m.end():a_end - 1] + ')/(' + text[b_start + 1:b_end - 1] + '))'
+                + text[b_end:])
+        m = FRAC.search(text)
+    for pattern, repl in LATEX:
+        text = pattern.sub(repl, text)
+    return text.replace('{', '(').replace('}', ')')
+
+
+def number(text):
+    return Fraction(text.replace(',', '.'))
+
+
+def tokenize(text):
+    tokens, pos = [], 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = TOKEN.match(text, pos)
+        if m is None:
+            raise ParseError(f'unbekanntes Zeichen {text[pos:].strip()[:1]!r}')
+        num, x, sup, power, root, op = m.groups()
+        if num is not None:
+            tokens.append(('n', number(num)))
+        elif x:
+            tokens.append(('x', None))
+        elif sup or power:
+            tokens.append(('^', {'²': 2, '³': 3}.get(sup) or int(power)))
+        elif root:
+            tokens.append(('√', None))
+        else:
+            tokens.append((op, None))
+        pos = m.end()
+    return tokens
+
+
+class Parser:
+    """Rekursiver Abstieg: expr = term (+|- term)*, term = factor ((·|:|/)? factor)*, factor = (+|-)* power."""
+
+    def __init__(self, text):
+        self.tokens = tokenize(text)
+        self.pos = 0
+
+    def peek(self, offset=0):
+        i = self.pos + offset
+        return self.tokens[i][0] if i < len(self.tokens) else None
+
+    def take(self):
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise ParseError('leer')
+        value = self.expr()
+        if self.pos != len(self.tokens):
+            raise ParseError(f'unerwartet {self.peek()!r}')
+        return value
+
+    def expr(self):
+        value = self.term()
+        while self.peek() in ('+', '-'):
+            op = self.take()[0]
+            right = self.term()
+            value = add(value, right) if op == '+' else sub(value, right)
+        return value
+
+    def term(self):
+        value = self.factor()
+        while True:
+            kind = self.peek()
+            if kind in ('·', '*', '×'):
+                self.take()
+                value = mul(value, self.factor())
+            elif kind in (':', '/'):
+                self.take()
+                value = div(value, self.factor())
+            elif kind in ('n', 'x', '(', '['):
+                value = mul(value, self.factor())
+            else:
+                return value
+
+    def factor(self):
+        kind = self.peek()
+        if kind in ('+', '-'):
+            self.take()
+            value = self.factor()
+            return (pneg(value[0]), value[1]) if kind == '-' else value
+        return self.power()
+
+    def power(self):
+        value = self.atom()
+        if self.peek() == '^':
+            exponent = self.take()[1]
+            result = const(1)
+            for _ in range(exponent):
+                result = mul(result, value)
+            value = result
+        return value
+
+    def atom(self):
+        if self.pos >= len(self.tokens):
+            raise ParseError('Ausdruck endet zu früh')
+        kind, value = self.take()
+        if kind == 'n':
+            # gemischte Zahl: 3 2/3
+            if (self.peek() == 'n' and self.peek(1) == '/' and self.peek(2) == 'n' and value.denominator == 1
+                    and self.peek(3) not in ('x', '(', '^')):
+                whole, numerator = value, self.take()[1]
+                self.take()
+                return const(whole + numerator / self.take()[1])
+            return const(value)
+        if kind == 'x':
+            return X, ONE
+        if kind in ('(', '['):
+            inner = self.expr()
+            if self.peek() not in (')', ']'):
+                raise ParseError('fehlende schließende Klammer')
+            self.take()
+            return inner
+        raise ParseError(f'unerwartet {kind!r}')
+
+
+@lru_cache(maxsize=None)
+def expression(text):
+    return Parser(text).parse()
+
+
+ROOT_SIDE = re.compile(r'^(.*?)√\s*(\d+(?:[.,]\d+)?|\(.*\))$')
+
+
+def square_side(text):
+    """Quadrat einer '±'-Seite: '2√5' -> 20, '√(7/3)' -> 7/3, '5/4' -> 25/16."""
+    m = ROOT_SIDE.match(text.strip())
+    if m:
+        coefficient = expression(m.group(1)) if m.group(1).strip() else const(1)
+        return mul(mul(coefficient, coefficient), expression(m.group(2)))
+    value = expression(text)
+    return mul(value, value)
+
+
+@lru_cache(maxsize=None)
+def equation(text):
+    """
+    Liest 'links = rechts' als (links, rechts); 'x = ±a' wird zu (x², a²). Näherungen ab '≈'
+    fallen weg, weitere '='-Glieder (x = ±5/4 = ±1.25) müssen dem zweiten gleich sein.
+    """
+    text = text.split('≈')[0]
+    sides = [s.strip() for s in text.split('=')]
+    if len(sides) < 2 or not all(sides):
+        raise ParseError('keine Gleichung')
+    if any(s.startswith('±') for s in sides[1:]):
+        if not all(s.startswith('±') for s in sides[1:]):
+            raise ParseError('± nur auf einer Seite der Kette')
+        left = expression(sides[0])
+        values = [square_side(s[1:]) for s in sides[1:]]
+        left = mul(left, left)
+    else:
+        left = expression(sides[0])
+        values = [expression(s) for s in sides[1:]]
+    if not all(same(values[0], v) for v in values[1:]):
+        raise ParseError('Gleichungskette ist nicht gleich')
+    return left, values[0]
+
+
+TEXT_OPERATION = re.compile(r'^(Multipliziere|Teile|Dividiere|Addiere|Subtrahiere)\s+beide\s+Seiten\s+(?:mit|durch)\s+(.+?)\.?$')
+TEXT_KIND = {'Multipliziere': 'mul', 'Teile': 'div', 'Dividiere': 'div', 'Addiere': 'add', 'Subtrahiere': 'sub'}
+
+
+@lru_cache(maxsize=None)
+def operation(text):
+    """
+    Liest eine Umformung: (Art, Ausdruck) mit Art 'add' ('- 7', '-2x +7'), 'mul' ('· 5', '×2'),
+    'div' (': (-20)'), oder ('text', None) für Wörter wie 'Ausmultiplizieren'.
+    """
+    text = text.strip()
+    m = TEXT_OPERATION.match(text)
+    if m:
+        return TEXT_KIND[m.group(1)], expression(m.group(2))
+    if not text:
+        return 'text', None
+    head = text[0]
+    try:
+        if head in ':/':
+            return 'div', expression(text[1:])
+        if head in '·*×':
+            return 'mul', expression(text[1:])
+        if head in '+-':
+            return 'add', expression(text)
+    except ParseError:
+        pass
+    return 'text', None
+
+
+def apply(eq, ops):
+    """Wendet die Umformungen auf beide Seiten an; None, wenn nur Text-Umformungen dabei sind."""
+    left, right = eq
+    arithmetic = False
+    for kind, value in ops:
+        if kind == 'text':
+            continue
+        arithmetic = True
+        if kind == 'add':
+            left, right = add(left, value), add(right, value)
+        elif kind == 'sub':
+            left, right = sub(left, value), sub(right, value)
+        elif kind == 'mul':
+            left, right = mul(left, value), mul(right, value)
+        else:
+            left, right = div(left, value), div(right, value)
+    return (left, right) if arithmetic else None
+
+
+def sidewise(a, b):
+    """Seite für Seite gleich, auch mit getauschten Seiten."""
+    return (same(a[0], b[0]) and same(a[1], b[1])) or (same(a[0], b[1]) and same(a[1], b[0]))
+
+
+def equivalent(a, b):
+    """Gleiche Lösungsmenge: die Zähler von links - rechts sind proportional."""
+    return proportional(sub(*a)[0], sub(*b)[0])
+
+
+def steps(elements):
+    """
+    Zerlegt die Texte eines Arrays in Schritte [Text, Gleichung oder None, Umformungen]. Reine
+    Textschritte ('Multipliziere beide Seiten mit 3') hängen als Umformung am Schritt davor.
+    """
+    out = []
+    for original in elements:
+        text = plain(original) if ('$' in original or '\\' in original) else original
+        parts = text.split('|')
+        head = parts[0].strip()
+        if '=' not in head:
+            if out and head:
+                out[-1][2].append(operation(head))
+            continue
+        try:
+            eq = equation(head)
+        except (ParseError, ZeroDivisionError):
+            eq = None
+        try:
+            ops = [operation(p) for p in parts[1:]]
+        except (ParseError, ZeroDivisionError):
+            ops = [('text', None)]
+        out.append([original, eq, ops])
+    return out
+
+
+def verify_steps(elements):
+    """Liefert (Status, Text k, Text k+1) für jeden Übergang der Schritte eines Arrays."""
+    result = []
+    items = steps(elements)
+    used = False  # Umformungen von k wurden schon rückwärts (verschoben) verbraucht
+    for (text_a, a, ops_a), (text_b, b, ops_b) in zip(items, items[1:]):
+        status = None
+        if a is None or b is None:
+            status = UNLESBAR
+        else:
+            forward = [] if used else ops_a
+            used = False
+            try:
+                if forward:
+                    moved = apply(a, forward)
+                    if moved is None:
+                        status = OK if equivalent(a, b) else None
+                    elif sidewise(moved, b):
+                        status = OK
+                elif sidewise(a, b):
+                    status = OK
+                if status is None and ops_b:
+                    moved = apply(a, ops_b)
+                    if moved is not None and sidewise(moved, b):
+                        status, used = VERSCHOBEN, True
+            except (ParseError, ZeroDivisionError):
+                pass
+            if status is None:
+                status = ZUSAMMENGEFASST if equivalent(a, b) else FALSCH
+        result.append((status, text_a, text_b))
+    return result
+
+
+def unescape(raw):
+    """Inhalt eines TS-String-Literals ohne Escapes."""
+    return re.sub(r'\\(.)', lambda m: {'n': '\n', 't': '\t'}.get(m.group(1), m.group(1)), raw) if '\\' in raw else raw
+
+
+def verify_text(text):
+    """Alle Übergänge aller rechenweg-Arrays in text als (Zeile, Schritt, Status, Text k, Text k+1)."""
+    newlines = [m.start() for m in re.finditer('\n', text)]
+    out = []
+    for m in ARRAY.finditer(text):
+        items, _ = parse_array(m.group(2))
+        line = bisect.bisect_left(newlines, m.start()) + 1
+        for i, (status, a, b) in enumerate(verify_steps([unescape(raw) for _, raw in items]), 1):
+            out.append((line, i, status, a, b))
+    return out
+
+
+def discover(globs=GLOBS, root=ROOT):
+    return sorted({p for pattern in globs for p in glob.glob(os.path.join(root, pattern), recursive=True)})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Rechenwege der Gleichungs-Generatoren exakt nachrechnen.')
+    parser.add_argument('files', nargs='*', help='TSX/TS-Dateien (Standard: gleichungen/Generator_*.tsx)')
+    parser.add_argument('--all', action='store_true', help='auch verschobene, zusammengefasste und unlesbare Schritte zeigen')
+    parser.add_argument('--benchmark', type=int, metavar='N', help='stattdessen eine synthetische Datei mit N Aufgaben prüfen')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.benchmark:
+        from codemod_corpus import lineare
+        sources = [('<synthetisch>', lineare(args.benchmark))]
+    else:
+        sources = []
+        for path in args.files or discover():
+            with open(path, encoding='utf-8') as f:
+                sources.append((os.path.relpath(path, ROOT), f.read()))
+    read = time.perf_counter() - start
+
+    counts = dict.fromkeys(STATUS, 0)
+    for name, text in sources:
+        for line, step, status, a, b in verify_text(text):
+            counts[status] += 1
+            if status == FALSCH or (args.all and status != OK):
+                print(f'{name}:{line}: Schritt {step} {status}: {a!r} -> {b!r}')
+    seconds = time.perf_counter() - start - read
+    print(f'{sum(counts.values())} Schritte in {seconds * 1000:.0f} ms: '
+          + ', '.join(f'{counts[s]} {s}' for s in STATUS), file=sys.stderr)
+    return 1 if counts[FALSCH] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
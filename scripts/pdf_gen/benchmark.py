@@ -0,0 +1,252 @@
+"""Benchmark für die Arbeitsblatt-Generatoren (gen_pdf*) und die Strahlensatz-Generatoren
+(mathe-trainer/generate_geogebra_*.py).
+
+Jeder Fall (Generator x Aufgabenzahl) läuft in einem frischen Prozess, damit die
+Spitzen-RSS nicht von vorherigen Fällen verfälscht wird. Gemessen werden Wandzeit,
+Spitzen-RSS, Bytes pro Seite bzw. pro Datei und - für die PDFs - die PDF-Operatoren
+pro Dreieck (ausgezählt am Content-Stream von draw_triangle).
+
+    python benchmark.py                              # 8, 100, 1000, 10000 Aufgaben
+    python benchmark.py --sizes 8 100 --only strecken geogebra
+    python benchmark.py --update-baseline            # Ergebnis als neue Basis speichern
+    python benchmark.py --sizes 100 --trace traces/  # zusätzlich Render-Traces (render_trace.py)
+    python benchmark.py --plain-canvas --out plain.json  # ohne compact_canvas, zum Vergleich
+    python benchmark.py --only winkel --chunk-pages 64   # streamende Ausgabe (pdf_stream.py)
+    python benchmark.py --only winkel --jobs 8           # Seiten parallel (parallel_pages.py)
+
+Liegt eine Basis vor (Standard: benchmark-baseline.json neben diesem Skript), wird
+verglichen und mit Exit-Code 1 beendet, sobald eine Kennzahl die Schwelle überschreitet
+(--threshold für Bytes/Operatoren, --time-threshold für Zeit und Speicher). Zeit und
+RSS hängen von der Maschine ab - die Basis also auf derselben Maschine erzeugen.
+"""
+import argparse
+import contextlib
+import importlib
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MATHE_TRAINER = os.path.normpath(os.path.join(HERE, '..', '..', 'mathe-trainer'))
+for _path in (HERE, MATHE_TRAINER):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+import reportlab  # noqa: E402
+from reportlab.pdfgen import canvas  # noqa: E402
+
+from compact_canvas import CompactCanvas  # noqa: E402
+from pdf_output import CHUNK_PAGES, atomic_output, new_canvas  # noqa: E402
+from problem_gen import GENERATORS  # noqa: E402
+from roster_batch import peak_rss_mb  # noqa: E402
+
+SIZES = (8, 100, 1000, 10000)
+SHEETS = {
+    'beschriften': 'gen_pdf1_beschriften',
+    'erkennen': 'gen_pdf2_erkennen',
+    'strecken': 'gen_pdf3_strecken',
+    'winkel': 'gen_pdf4_winkel',
+}
+STRAHLENSATZ = {
+    'geogebra': 'generate_geogebra_files',
+    'svg': 'generate_geogebra_simple',
+}
+BASELINE = os.path.join(HERE, 'benchmark-baseline.json')
+# Operatoren pro Dreieck hängen nicht von der Blattgröße ab - ausgezählt wird an so vielen Aufgaben
+OPS_SAMPLE = 100
+# Kennzahlen, die deterministisch sind bzw. von der Maschine abhängen
+EXACT_METRICS = ('bytes_per_page', 'bytes_per_file', 'ops_per_triangle')
+NOISY_METRICS = ('seconds', 'peak_rss_mb')
+# Zeitunterschiede unterhalb dieser Grenze (Sekunden) gelten nie als Regression
+MIN_SECONDS = 0.05
+
+_PDF_STRING = re.compile(r'\((?:\\.|[^\\)])*\)')
+_PDF_OPERATOR = re.compile(r"[A-Za-z'\"*]+$")
+
+
+def count_ops(code):
+    """Zählt die PDF-Operatoren (m, l, c, S, Tj, rg, ...) in Content-Stream-Zeilen des Canvas."""
+    total = 0
+    for entry in code:
+        total += sum(1 for tok in _PDF_STRING.sub(' ', entry).split() if _PDF_OPERATOR.match(tok))
+    return total
+
+
+def scaled_problems(sheet, count):
+    """count Aufgaben: Zufallsaufgaben, wo es einen Generator gibt, sonst PROBLEMS reihum."""
+    if sheet in GENERATORS:
+        return GENERATORS[sheet][1](1, count)
+    module = importlib.import_module(SHEETS[sheet])
+    return list(itertools.islice(itertools.cycle(module.PROBLEMS), count))
+
+
+def scaled_aufgaben(aufgaben, count):
+    return [dict(a, name=f'aufgabe{i}') for i, a in enumerate(itertools.islice(itertools.cycle(aufgaben), count), 1)]
+
+
+def count_triangle_ops(module, problems, reuse_forms, plain=False):
+    """
+    Rendert eine Stichprobe und zählt die Operatoren, die draw_triangle pro Aufruf erzeugt.
+    Beim CompactCanvas werden die gesammelten Beschriftungen nach jedem Dreieck geschrieben,
+    damit sie mitgezählt werden (im echten PDF teilen sie sich Textobjekte seitenweise).
+    """
+    draw = module.draw_triangle
+    stats = {'triangles': 0, 'ops': 0}
+
+    def counting(c, *args, **kwargs):
+        before = len(c._code)
+        draw(c, *args, **kwargs)
+        if not plain:
+            c.flush_text()
+        stats['triangles'] += 1
+        stats['ops'] += count_ops(c._code[before:])
+
+    module.draw_triangle = counting
+    try:
+        # wird nie gespeichert; bewusst kein new_canvas, damit die Stichprobe keinen Trace schreibt
+        c = (canvas.Canvas if plain else CompactCanvas)(os.devnull)
+        module.build(c, problems[:OPS_SAMPLE], reuse_forms)
+    finally:
+        module.draw_triangle = draw
+    return round(stats['ops'] / stats['triangles'], 2) if stats['triangles'] else None
+
+
+def run_sheet(sheet, count, reuse_forms=False, chunk_pages=None, jobs=None):
+    """Worker: ein Arbeitsblatt mit count Aufgaben rendern und vermessen."""
+    module = importlib.import_module(SHEETS[sheet])
+    problems = scaled_problems(sheet, count)
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, f'{sheet}.pdf')
+        start = time.perf_counter()
+        with atomic_output(out) as part:
+            if jobs and not chunk_pages:
+                chunk_pages = CHUNK_PAGES  # parallele Seiten brauchen die streamende Ausgabe
+            c = new_canvas(part, trace_name=f'{sheet}-{count}.pdf', chunk_pages=chunk_pages)
+            pages = module.build(c, problems, reuse_forms, jobs=jobs)
+            c.save()
+        seconds = time.perf_counter() - start
+        size = os.path.getsize(out)
+    return dict(seconds=round(seconds, 4), peak_rss_mb=peak_rss_mb(), pages=pages, bytes=size,
+                bytes_per_page=round(size / pages, 1),
+                ops_per_triangle=count_triangle_ops(module, problems, reuse_forms,
+                                                    plain=os.environ.get('PDF_PLAIN_CANVAS') == '1'))
+
+
+def run_strahlensatz(kind, count):
+    """Worker: count Strahlensatz-HTML-Dateien erzeugen und vermessen."""
+    module = importlib.import_module(STRAHLENSATZ[kind])
+    aufgaben = scaled_aufgaben(module.aufgaben, count)
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+            module.main(out_dir=tmp, aufgaben=aufgaben)
+        seconds = time.perf_counter() - start
+        size = sum(entry.stat().st_size for entry in os.scandir(tmp))
+    return dict(seconds=round(seconds, 4), peak_rss_mb=peak_rss_mb(), files=count, bytes=size,
+                bytes_per_file=round(size / count, 1))
+
+
+def run_isolated(func, *args):
+    """Führt func in einem frisch gestarteten Prozess aus (eigene Spitzen-RSS pro Fall)."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(func, *args).result()
+
+
+def compare(results, baseline, threshold, time_threshold):
+    """Liste der Regressionen (Fall, Kennzahl, alt, neu) gegenüber der Basis."""
+    regressions = []
+    for case, metrics in results['cases'].items():
+        old = baseline.get('cases', {}).get(case)
+        if not old:
+            continue
+        for metric in EXACT_METRICS + NOISY_METRICS:
+            before, after = old.get(metric), metrics.get(metric)
+            if before is None or after is None:
+                continue
+            limit = threshold if metric in EXACT_METRICS else time_threshold
+            if metric == 'seconds' and after - before < MIN_SECONDS:
+                continue
+            if after > before * (1 + limit):
+                regressions.append((case, metric, before, after))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generatoren in verschiedenen Größen vermessen.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES), help='Aufgabenzahlen')
+    parser.add_argument('--only', nargs='+', choices=sorted(SHEETS) + sorted(STRAHLENSATZ),
+                        help='nur diese Generatoren')
+    parser.add_argument('--reuse-forms', action='store_true', help='PDFs mit Form-XObjects rendern')
+    parser.add_argument('--plain-canvas', action='store_true',
+                        help='unveränderten reportlab-Canvas statt compact_canvas verwenden')
+    parser.add_argument('--chunk-pages', type=int, default=None,
+                        help='PDFs streamend schreiben (pdf_stream), Seiten pro Block')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Seiten eines PDFs mit so vielen Worker-Prozessen rendern (parallel_pages)')
+    parser.add_argument('--out', help='Ergebnis zusätzlich als JSON speichern')
+    parser.add_argument('--trace', metavar='ORDNER', help='pro PDF-Fall einen Render-Trace schreiben')
+    parser.add_argument('--baseline', default=BASELINE, help='JSON-Basis zum Vergleichen')
+    parser.add_argument('--update-baseline', action='store_true', help='Ergebnis als neue Basis speichern')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='erlaubter Anstieg für Bytes und Operatoren (0.10 = +10%%)')
+    parser.add_argument('--time-threshold', type=float, default=0.25,
+                        help='erlaubter Anstieg für Zeit und Spitzen-RSS')
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        os.makedirs(args.trace, exist_ok=True)
+        os.environ['PDF_TRACE'] = os.path.abspath(args.trace)  # erben die gestarteten Fall-Prozesse
+    if args.plain_canvas:
+        os.environ['PDF_PLAIN_CANVAS'] = '1'
+    selected = args.only or sorted(SHEETS) + sorted(STRAHLENSATZ)
+    results = dict(
+        meta=dict(python=platform.python_version(), reportlab=reportlab.Version, machine=platform.machine(),
+                  reuse_forms=args.reuse_forms, plain_canvas=args.plain_canvas,
+                  chunk_pages=args.chunk_pages, jobs=args.jobs),
+        cases={},
+    )
+    for name in selected:
+        for size in args.sizes:
+            if name in SHEETS:
+                metrics = run_isolated(run_sheet, name, size, args.reuse_forms, args.chunk_pages, args.jobs)
+                detail = (f"{metrics['pages']:>5} S.  {metrics['bytes_per_page']:>9.0f} B/S.  "
+                          f"{metrics['ops_per_triangle']} Ops/Dreieck")
+            else:
+                metrics = run_isolated(run_strahlensatz, name, size)
+                detail = f"{metrics['files']:>5} Dat. {metrics['bytes_per_file']:>9.0f} B/Dat."
+            results['cases'][f'{name}/{size}'] = metrics
+            print(f"{name:<12} {size:>6}  {metrics['seconds']:>8.3f}s  {metrics['peak_rss_mb']} MB  {detail}")
+
+    for path in filter(None, [args.out, args.baseline if args.update_baseline else None]):
+        with atomic_output(path) as tmp:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2, sort_keys=True)
+                f.write('\n')
+        print('Gespeichert:', path)
+    if args.update_baseline or not os.path.exists(args.baseline):
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('meta', {}).get('reuse_forms') != args.reuse_forms:
+        print('Hinweis: Basis wurde mit anderem --reuse-forms erzeugt, PDF-Kennzahlen sind nicht vergleichbar.')
+    if baseline.get('meta', {}).get('plain_canvas', False) != args.plain_canvas:
+        print('Hinweis: Basis wurde mit anderem Canvas erzeugt (--plain-canvas), PDF-Kennzahlen unterscheiden sich.')
+    regressions = compare(results, baseline, args.threshold, args.time_threshold)
+    for case, metric, before, after in regressions:
+        print(f'REGRESSION {case} {metric}: {before} -> {after} (+{(after / before - 1) * 100:.0f}%)')
+    if regressions:
+        return 1
+    print(f'Keine Regression gegenüber {args.baseline}.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
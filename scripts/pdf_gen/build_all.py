@@ -0,0 +1,111 @@
+"""Erzeugt alle Arbeitsblätter (gen_pdf*.py) parallel - ein Worker-Prozess pro PDF.
+
+Aufruf aus beliebigem Verzeichnis:
+    python scripts/pdf_gen/build_all.py              # alle Arbeitsblätter
+    python scripts/pdf_gen/build_all.py gen_pdf3     # nur passende Generatoren
+    python scripts/pdf_gen/build_all.py --jobs 2
+
+Jeder Generator schreibt über pdf_output.atomic_output, d.h. erst in eine temporäre
+Datei und dann per Umbenennen an den endgültigen Ort.
+
+Generatoren, deren Eingaben sich seit dem letzten Lauf nicht geändert haben, werden
+übersprungen (Manifest siehe build_cache.py); --force erzeugt trotzdem alle neu.
+--trace <ordner> schreibt zu jedem PDF einen Render-Trace (siehe render_trace.py),
+--previews <ordner> im selben Lauf die SVG-Skizzen jedes Blatts für die Web-App
+(<pdf-name>.previews.json, siehe pdf_output.write_previews).
+"""
+import argparse
+import glob
+import importlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
+
+import build_cache  # noqa: E402  (braucht HERE in sys.path)
+
+
+def discover(patterns=None):
+    """Findet alle Generator-Module (gen_pdf*.py) im Skriptordner, optional gefiltert."""
+    names = sorted(os.path.splitext(os.path.basename(p))[0]
+                   for p in glob.glob(os.path.join(HERE, 'gen_pdf*.py')))
+    if patterns:
+        names = [n for n in names if any(pat in n for pat in patterns)]
+    return names
+
+
+def render(module_name, reuse_forms=False, previews_dir=None):
+    """Worker: importiert den Generator und ruft dessen main() auf."""
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    previews = None
+    if previews_dir:
+        previews = os.path.join(previews_dir, os.path.splitext(os.path.basename(module.OUT))[0] + '.previews.json')
+    module.main(reuse_forms=reuse_forms, previews=previews)
+    return module_name, module.OUT, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Alle PDF-Arbeitsblätter parallel erzeugen.')
+    parser.add_argument('generators', nargs='*', help='Filter auf Modulnamen (z.B. gen_pdf3)')
+    parser.add_argument('--jobs', type=int, default=None, help='Anzahl Worker-Prozesse (Standard: ein Prozess pro PDF)')
+    parser.add_argument('--reuse-forms', action='store_true',
+                        help='Dreiecks-Geometrie als Form-XObject wiederverwenden (triangle_draw)')
+    parser.add_argument('--force', action='store_true', help='Build-Cache ignorieren und alle PDFs neu erzeugen')
+    parser.add_argument('--trace', metavar='ORDNER', help='Render-Traces (JSON) in diesen Ordner schreiben')
+    parser.add_argument('--previews', metavar='ORDNER', help='SVG-Vorschauen (JSON) der Skizzen in diesen Ordner schreiben')
+    parser.add_argument('--trace-malloc', action='store_true', help='Traces mit tracemalloc-Snapshots pro Phase')
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        # Worker erben die Umgebung; pdf_output.new_canvas schaltet darüber das Tracing ein
+        os.makedirs(args.trace, exist_ok=True)
+        os.environ['PDF_TRACE'] = os.path.abspath(args.trace)
+        if args.trace_malloc:
+            os.environ['PDF_TRACE_MALLOC'] = '1'
+
+    names = discover(args.generators)
+    if not names:
+        print('Keine Generatoren gefunden.')
+        return 1
+
+    start = time.perf_counter()
+    manifest = build_cache.load_manifest()
+    digests, stale = {}, []
+    for name in names:
+        module = importlib.import_module(name)
+        digests[name] = build_cache.input_digest(module, reuse_forms=args.reuse_forms)
+        if not (args.force or args.trace or args.previews) and build_cache.is_fresh(manifest, name, digests[name], module.OUT):
+            print(f'{name}: unverändert, übersprungen')
+        else:
+            stale.append(name)
+
+    failed = []
+    jobs = max(1, args.jobs or min(len(stale), os.cpu_count() or 1))
+    if stale:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {pool.submit(render, name, args.reuse_forms, args.previews): name for name in stale}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    _, out, duration = future.result()
+                except Exception as exc:  # Fehler eines Blatts soll die anderen nicht abbrechen
+                    failed.append(name)
+                    manifest.pop(name, None)
+                    print(f'FEHLER {name}: {exc!r}')
+                    continue
+                build_cache.record(manifest, name, digests[name], out)
+                print(f'{name}: {duration:.2f}s  ->  {out}')
+        build_cache.save_manifest(manifest)
+
+    print(f'{len(stale) - len(failed)}/{len(names)} PDFs neu erzeugt, {len(names) - len(stale)} übersprungen '
+          f'in {time.perf_counter() - start:.2f}s ({jobs} Worker)')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""Inhaltsadressierter Build-Cache für build_all.py.
+
+Für jeden Generator wird ein Hash über alle Eingaben gebildet: die Quelltexte des
+Generators und aller lokalen Module, die er (auch indirekt) importiert (triangle_draw,
+text_flow, ...), repr(PROBLEMS), die reportlab-Version und die Build-Optionen. Stimmt
+der Hash mit dem Manifest überein und liegt das PDF noch unverändert am Zielort, wird
+der Generator übersprungen. Zusammen mit pdf_output.new_canvas (invariant-Modus)
+liefert ein erneuter Lauf ohnehin dieselben Bytes - der Cache spart nur die Zeit.
+"""
+import ast
+import hashlib
+import json
+import os
+
+import reportlab
+
+from pdf_output import HERE, atomic_output
+
+MANIFEST = os.path.join(HERE, '.build-manifest.json')
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def local_imports(path):
+    """Namen der Module aus dem Skriptordner, die die Datei direkt importiert."""
+    with open(path, 'rb') as f:
+        tree = ast.parse(f.read(), path)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split('.')[0])
+    return {n for n in names if os.path.exists(os.path.join(HERE, n + '.py'))}
+
+
+def source_closure(module_name):
+    """Der Generator und alle lokalen Module, die er transitiv importiert (sortiert)."""
+    todo, seen = [module_name], set()
+    while todo:
+        name = todo.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        todo.extend(local_imports(os.path.join(HERE, name + '.py')))
+    return sorted(seen)
+
+
+def input_digest(module, **options):
+    """Hash über alle Eingaben, die das PDF eines Generators bestimmen."""
+    h = hashlib.sha256()
+    for name in source_closure(module.__name__):
+        h.update(name.encode('utf-8') + b'\0')
+        with open(os.path.join(HERE, name + '.py'), 'rb') as f:
+            h.update(f.read())
+        h.update(b'\0')
+    h.update(repr(getattr(module, 'PROBLEMS', None)).encode('utf-8') + b'\0')
+    h.update(f'reportlab {reportlab.Version}\0'.encode('utf-8'))
+    h.update(json.dumps(options, sort_keys=True).encode('utf-8'))
+    return h.hexdigest()
+
+
+def load_manifest(path=MANIFEST):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest, path=MANIFEST):
+    with atomic_output(path) as tmp:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+
+def is_fresh(manifest, name, digest, out):
+    """True, wenn das Manifest denselben Eingabe-Hash kennt und das PDF unverändert vorliegt."""
+    entry = manifest.get(name)
+    if not entry or entry.get('inputs') != digest or not os.path.exists(out):
+        return False
+    return entry.get('output') == file_digest(out)
+
+
+def record(manifest, name, digest, out):
+    manifest[name] = {'inputs': digest, 'output': file_digest(out), 'path': os.path.relpath(out, HERE)}
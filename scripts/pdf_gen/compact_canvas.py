@@ -0,0 +1,236 @@
+"""Canvas mit schlankerem Content-Stream: Zustandswechsel werden erst geschrieben, wenn sie
+gebraucht werden, und Beschriftungen landen gesammelt in wenigen BT/ET-Textobjekten.
+
+Der normale reportlab-Canvas schreibt jeden setFillColorRGB/setFont/setLineWidth-Aufruf
+sofort in den Stream - auch wenn sich nichts ändert (draw_triangle setzt z.B. am Ende
+immer wieder Schwarz) - und jedes drawString wird ein eigenes Textobjekt mit absolutem
+Tm und überflüssigem T*. CompactCanvas merkt sich den zuletzt geschriebenen Zustand und
+synchronisiert erst vor der nächsten Zeichenoperation; Texte werden mit relativem Td in
+einem gemeinsamen Textobjekt gesammelt.
+
+Gesammelte Texte werden vor jeder "Barriere" geschrieben: saveState/restoreState,
+Änderungen der Transformationsmatrix, beginForm/endForm, clipPath, eigene Textobjekte
+(drawText) und showPage/save. Zwischen zwei Barrieren liegen Texte also über den Pfaden -
+bei den Arbeitsblättern überlappen sich Beschriftung und Linien nicht.
+
+Nur für bottom-up-Canvas und eingebaute Type-1-Schriften; alles andere (TrueType, Text-
+Render-Modi, Zeichenabstände) geht unverändert an reportlab.
+"""
+from reportlab.lib.rl_accel import fp_str
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfgen import canvas
+from reportlab.pdfgen.textobject import PDFTextObject
+
+# Werte, die das Preamble jeder Seite setzt (siehe Canvas._make_preamble)
+PREAMBLE_FONT_SIZE = 12
+PREAMBLE_LEADING = 14.4
+# reportlab-Methoden, die einen Pfad zeichnen und dafür Farbe/Linienbreite brauchen
+PATH_METHODS = ('drawPath', 'line', 'lines', 'grid', 'bezier', 'arc', 'rect', 'ellipse', 'wedge', 'circle',
+                'roundRect')
+
+
+class CompactCanvas(canvas.Canvas):
+    """
+    Drop-in-Ersatz für reportlab.pdfgen.canvas.Canvas (siehe Moduldoku).
+    Der gewünschte Zustand steht wie gewohnt in _fillColorObj, _strokeColorObj, _lineWidth,
+    _fontname/_fontsize/_leading (von reportlab bei saveState/restoreState mitgesichert);
+    _emitted hält fest, was davon tatsächlich im Stream steht (None = unbekannt).
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._texts = []
+        self._emitted_stack = []
+        super().__init__(*args, **kwargs)
+        self._emitted = self._page_state()
+
+    def _page_state(self):
+        """Stream-Zustand am Seitenanfang: PDF-Standard plus das reportlab-Preamble."""
+        font = pdfmetrics.getFont(self._initialFontName)
+        return dict(fill=self._fillColorObj, stroke=self._strokeColorObj, width=1,
+                    font=None if font._dynamicFont else (self._initialFontName, PREAMBLE_FONT_SIZE),
+                    leading=PREAMBLE_LEADING)
+
+    # ---- Zustand: nur merken, geschrieben wird in _sync_paint / flush_text
+
+    def setFillColor(self, aColor, alpha=None):
+        if alpha is not None:
+            self._passthrough(super().setFillColor, aColor, alpha)
+        else:
+            self._fillColorObj = aColor
+
+    def setStrokeColor(self, aColor, alpha=None):
+        if alpha is not None:
+            self._passthrough(super().setStrokeColor, aColor, alpha)
+        else:
+            self._strokeColorObj = aColor
+
+    def setFillGray(self, gray, alpha=None):
+        self._passthrough(super().setFillGray, gray, alpha)
+
+    def setStrokeGray(self, gray, alpha=None):
+        self._passthrough(super().setStrokeGray, gray, alpha)
+
+    def setLineWidth(self, width):
+        self._lineWidth = width
+
+    def setFont(self, psfontname, size, leading=None):
+        if pdfmetrics.getFont(psfontname)._dynamicFont:
+            self.flush_text()
+            super().setFont(psfontname, size, leading)
+            self._emitted['font'] = None
+            return
+        self._fontname = psfontname
+        self._fontsize = size
+        self._leading = size * 1.2 if leading is None else leading
+
+    def _passthrough(self, method, *args):
+        """Seltene Setter (Alpha, Graustufen) direkt schreiben und den Stand übernehmen."""
+        self.flush_text()
+        method(*args)
+        self._emitted['fill'] = self._fillColorObj
+        self._emitted['stroke'] = self._strokeColorObj
+
+    def _sync_paint(self):
+        emitted = self._emitted
+        if self._fillColorObj != emitted['fill']:
+            super().setFillColor(self._fillColorObj)
+            emitted['fill'] = self._fillColorObj
+        if self._strokeColorObj != emitted['stroke']:
+            super().setStrokeColor(self._strokeColorObj)
+            emitted['stroke'] = self._strokeColorObj
+        if self._lineWidth != emitted['width']:
+            super().setLineWidth(self._lineWidth)
+            emitted['width'] = self._lineWidth
+
+    def _sync_text_state(self):
+        """Vor fremden Textobjekten: Schrift (wie reportlab als BT .. Tf .. TL ET) und Farbe nachziehen."""
+        emitted = self._emitted
+        if (self._fontname, self._fontsize) != emitted['font'] or self._leading != emitted['leading']:
+            super().setFont(self._fontname, self._fontsize, self._leading)
+            emitted['font'], emitted['leading'] = (self._fontname, self._fontsize), self._leading
+        self._sync_paint()
+
+    # ---- Text sammeln
+
+    def _can_batch(self, mode, charSpace, direction, wordSpace, shaping):
+        return (self.bottomup and mode is None and not charSpace and direction is None and wordSpace is None
+                and not shaping and not pdfmetrics.getFont(self._fontname)._dynamicFont)
+
+    def _add_text(self, x, y, text):
+        self._texts.append((x, y, text, self._fontname, self._fontsize, self._fillColorObj))
+
+    def drawString(self, x, y, text, mode=None, charSpace=0, direction=None, wordSpace=None, shaping=False):
+        if not self._can_batch(mode, charSpace, direction, wordSpace, shaping):
+            return super().drawString(x, y, text, mode, charSpace, direction, wordSpace, shaping)
+        self._add_text(x, y, text)
+
+    def drawCentredString(self, x, y, text, mode=None, charSpace=0, direction=None, wordSpace=None, shaping=False):
+        if not self._can_batch(mode, charSpace, direction, wordSpace, shaping):
+            return super().drawCentredString(x, y, text, mode, charSpace, direction, wordSpace, shaping)
+        self._add_text(x - 0.5 * self.stringWidth(text), y, text)
+
+    def drawRightString(self, x, y, text, mode=None, charSpace=0, direction=None, wordSpace=None, shaping=False):
+        if not self._can_batch(mode, charSpace, direction, wordSpace, shaping):
+            return super().drawRightString(x, y, text, mode, charSpace, direction, wordSpace, shaping)
+        self._add_text(x - self.stringWidth(text), y, text)
+
+    def drawText(self, aTextObject):
+        self.flush_text()
+        self._sync_text_state()
+        super().drawText(aTextObject)
+        # das Textobjekt kann Schrift, Zeilenabstand und Farbe beliebig geändert haben
+        self._emitted.update(font=None, leading=None, fill=None)
+
+    def flush_text(self):
+        """Schreibt alle gesammelten Texte als ein BT/ET-Objekt."""
+        texts = self._texts
+        if not texts:
+            return
+        self._texts = []
+        emitted = self._emitted
+        formatter = PDFTextObject(self)  # nur für _formatText (Kodierung, Ersatzschriften wie Symbol)
+        code = ['BT']
+        tx = ty = 0.0  # Textmatrix steht nach BT auf der Identität
+        for x, y, text, fontname, size, fill in texts:
+            if fill != emitted['fill']:
+                if isinstance(fill, tuple) and len(fill) == 3:
+                    code.append('%s rg' % fp_str(fill))
+                else:
+                    formatter._code = []
+                    formatter.setFillColor(fill)
+                    code.extend(formatter._code)
+                emitted['fill'] = fill
+            if (fontname, size) != emitted['font']:
+                code.append('%s %s Tf' % (self._doc.getInternalFontName(fontname), fp_str(size)))
+                emitted['font'] = (fontname, size)
+            move = fp_str(x - tx, y - ty)
+            dx, dy = move.split()
+            tx, ty = tx + float(dx), ty + float(dy)  # gerundete Werte, damit sich nichts aufsummiert
+            code.append(move + ' Td')
+            formatter._fontname, formatter._fontsize = fontname, size
+            formatter._leading = emitted['leading'] if emitted['leading'] is not None else size * 1.2
+            shown = formatter._formatText(text)
+            if ' TL' in shown:  # Ersatzschrift: _formatText schaltet mit Tf/TL zurück
+                emitted['leading'] = formatter._leading
+            code.append(shown)
+        code.append('ET')
+        self._code.append(' '.join(code))
+
+    # ---- Barrieren
+
+    def saveState(self):
+        self.flush_text()
+        self._emitted_stack.append(dict(self._emitted))
+        super().saveState()
+
+    def restoreState(self):
+        self.flush_text()
+        super().restoreState()
+        self._emitted = self._emitted_stack.pop()
+
+    def transform(self, a, b, c, d, e, f):
+        self.flush_text()
+        super().transform(a, b, c, d, e, f)
+
+    def clipPath(self, aPath, stroke=1, fill=0, fillMode=None):
+        self.flush_text()
+        self._sync_paint()
+        super().clipPath(aPath, stroke, fill, fillMode)
+
+    def beginForm(self, name, lowerx=0, lowery=0, upperx=None, uppery=None):
+        self.flush_text()
+        self._emitted_stack.append(self._emitted)
+        super().beginForm(name, lowerx, lowery, upperx, uppery)
+        # Das Form bekommt das Preamble, erbt Farben und Linienbreite aber vom Aufrufer
+        self._emitted = dict(self._page_state(), fill=None, stroke=None, width=None)
+
+    def endForm(self, **extra_attributes):
+        self.flush_text()
+        super().endForm(**extra_attributes)
+        self._emitted = self._emitted_stack.pop()
+
+    def showPage(self):
+        self.flush_text()
+        super().showPage()
+        self._emitted_stack = []
+        self._emitted = self._page_state()
+
+    def save(self):
+        self.flush_text()
+        super().save()
+
+
+def _painting(name):
+    method = getattr(canvas.Canvas, name)
+
+    def wrapper(self, *args, **kwargs):
+        self._sync_paint()
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+for _name in PATH_METHODS:
+    setattr(CompactCanvas, _name, _painting(_name))
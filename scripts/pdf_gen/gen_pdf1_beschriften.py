@@ -1,11 +1,13 @@
 """PDF 1: Rechtwinklige Dreiecke beschriften - Hypotenuse/Gegenkathete/Ankathete zuordnen."""
-import math
-from reportlab.pdfgen import canvas
+import os
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
-from triangle_draw import draw_triangle, BLACK, RED, GRAY
+from pdf_output import CHUNK_PAGES, DOWNLOADS, atomic_output, draw_pages, new_canvas, write_previews
+from problem_plan import ROLE_SIDES, ResolvedProblem, angle_keys, plan, symbol
+from text_flow import draw_lines, paginate, with_gap, wrapped_lines
+from triangle_draw import draw_triangle, BLACK, RED, GRAY, GREEK
 
-OUT = '../../mathe-trainer/public/downloads/rechtwinklige-dreiecke-beschriften-uebungen.pdf'
+OUT = os.path.join(DOWNLOADS, 'rechtwinklige-dreiecke-beschriften-uebungen.pdf')
 PAGE_W, PAGE_H = A4
 
 # (rightAngle, markedAngleVertex)
@@ -20,9 +22,6 @@ PROBLEMS = [
     ('B', 'C'),
 ]
 
-ANGLE_AT = {'A': 'alpha', 'B': 'beta', 'C': 'gamma'}
-GREEK = {'alpha': 'α', 'beta': 'β', 'gamma': 'γ'}
-
 # Leg-Längen pro right_vertex Layout, generisch (nur für hübsche Proportionen, keine echten Werte nötig)
 LEG_LENGTHS = {
     'C': {'a': 7, 'b': 5},
@@ -30,13 +29,7 @@ LEG_LENGTHS = {
     'B': {'a': 5, 'c': 7},
 }
 
-
-def hyp_side(right_vertex):
-    return {'C': 'c', 'A': 'a', 'B': 'b'}[right_vertex]
-
-
-def opposite_side(vertex):
-    return {'A': 'a', 'B': 'b', 'C': 'c'}[vertex]
+SIDE_DISPLAY = {s: (s, BLACK) for s in ('a', 'b', 'c')}
 
 
 def header(c, title, subtitle=None):
@@ -57,8 +50,11 @@ def footer(c, page_num):
     c.setFillColorRGB(*BLACK)
 
 
-def draw_cover(c):
+def draw_cover(c, student=None):
     header(c, 'Rechtwinklige Dreiecke beschriften', 'Übungsblatt: Hypotenuse, Gegenkathete, Ankathete')
+    if student:
+        c.setFont('Helvetica', 11)
+        c.drawString(20 * mm, PAGE_H - 36 * mm, f'Name: {student}')
     c.setFont('Helvetica', 11)
     text = c.beginText(20 * mm, PAGE_H - 45 * mm)
     text.setLeading(15)
@@ -85,101 +81,99 @@ def draw_cover(c):
     c.showPage()
 
 
-def draw_problem_page(c, page_num, problems_on_page, start_index):
-    header(c, 'Übungsaufgaben', f'Aufgaben {start_index + 1}-{start_index + len(problems_on_page)}')
+def resolve(problem, idx):
+    """Löst eine Aufgabe (rechter Winkel, markierter Winkel) vollständig auf."""
+    right_vertex, marked_vertex = problem
+    sides = ROLE_SIDES[(right_vertex, marked_vertex)]
+    hyp, gegen, anka = sides['hyp'], sides['opp'], sides['adj']
+    marked_key, other_key, right_key = angle_keys(right_vertex, marked_vertex)
+    sym = symbol(marked_vertex)
+
+    explanation = (
+        f'Rechter Winkel liegt bei {right_vertex} → Hypotenuse = {hyp}. '
+        f'Markierter Winkel {sym} liegt bei {marked_vertex} → Gegenkathete '
+        f'(gegenüber {marked_vertex}) = {gegen}. Damit ist Ankathete = {anka}.'
+    )
+    title = f'Aufgabe {idx}: Hypotenuse = {hyp}, Gegenkathete = {gegen}, Ankathete = {anka}'
+    return ResolvedProblem(
+        idx=idx, right=right_vertex, marked=marked_vertex, flip=(idx % 2 == 0), sides=sides,
+        leg_lengths=LEG_LENGTHS[right_vertex],
+        side_display=SIDE_DISPLAY,
+        angle_display={marked_key: (sym, RED), other_key: (GREEK[other_key], GRAY), right_key: None},
+        prompt=((-8, f'Vom Winkel {sym} aus:'),
+                (-22, 'Hypotenuse = __________'),
+                (-36, 'Gegenkathete = __________'),
+                (-50, 'Ankathete = __________')),
+        solution=tuple([(20 * mm, 'Helvetica-Bold', 11, BLACK, title, 13)]
+                       + with_gap(wrapped_lines(22 * mm, 'Helvetica', 9.5, GRAY, explanation, 170 * mm, 12), 10)),
+    )
+
+
+def draw_problem_page(c, page_num, plans_on_page, reuse_forms=False):
+    header(c, 'Übungsaufgaben', f'Aufgaben {plans_on_page[0].idx}-{plans_on_page[-1].idx}')
     box_w, box_h = 80 * mm, 55 * mm
     cols_x = [18 * mm, 110 * mm]
     rows_y = [PAGE_H - 50 * mm - box_h, PAGE_H - 50 * mm - box_h - 105 * mm]
 
-    for i, (right_vertex, marked_vertex) in enumerate(problems_on_page):
-        idx = start_index + i + 1
-        col = i % 2
-        row = i // 2
-        x = cols_x[col]
-        y = rows_y[row]
-        flip = (idx % 2 == 0)
-
-        marked_key = ANGLE_AT[marked_vertex]
-        other_vertex = [v for v in ('A', 'B', 'C') if v not in (right_vertex, marked_vertex)][0]
-        other_key = ANGLE_AT[other_vertex]
-
-        side_display = {s: (s, BLACK) for s in ('a', 'b', 'c')}
-        angle_display = {marked_key: (f'{GREEK[marked_key]}', RED), other_key: (GREEK[other_key], GRAY)}
-        angle_display[ANGLE_AT[right_vertex]] = None
+    for i, rp in enumerate(plans_on_page):
+        x, y = cols_x[i % 2], rows_y[i // 2]
 
         c.setFont('Helvetica-Bold', 12)
         c.setFillColorRGB(*BLACK)
-        c.drawString(x, y + box_h + 8, f'Aufgabe {idx}')
+        c.drawString(x, y + box_h + 8, f'Aufgabe {rp.idx}')
 
-        draw_triangle(c, x, y, box_w, box_h, right_vertex, LEG_LENGTHS[right_vertex],
-                       side_display, angle_display, flip=flip)
+        draw_triangle(c, x, y, box_w, box_h, rp.right, rp.leg_lengths,
+                       rp.side_display, rp.angle_display, flip=rp.flip, reuse_form=reuse_forms)
 
-        ty = y - 8
         c.setFont('Helvetica', 10)
-        c.drawString(x, ty, f'Vom Winkel {GREEK[marked_key]} aus:')
-        c.drawString(x, ty - 14, 'Hypotenuse = __________')
-        c.drawString(x, ty - 28, 'Gegenkathete = __________')
-        c.drawString(x, ty - 42, 'Ankathete = __________')
+        for dy, text in rp.prompt:
+            c.drawString(x, y + dy, text)
 
     footer(c, page_num)
     c.showPage()
 
 
-def solution_text(right_vertex, marked_vertex):
-    hyp = hyp_side(right_vertex)
-    gegen = opposite_side(marked_vertex)
-    anka = [s for s in ('a', 'b', 'c') if s not in (hyp, gegen)][0]
-    marked_key = ANGLE_AT[marked_vertex]
-    return (
-        f'Rechter Winkel liegt bei {right_vertex}  →  Hypotenuse = {hyp}.  '
-        f'Markierter Winkel {GREEK[marked_key]} liegt bei {marked_vertex}  →  Gegenkathete '
-        f'(gegenüber {marked_vertex}) = {gegen}.  Damit ist Ankathete = {anka}.',
-        hyp, gegen, anka,
-    )
+def solution_pages(plans):
+    """Verteilt die Rechenwege auf Lösungsseiten (automatischer Seitenumbruch)."""
+    return paginate([rp.solution for rp in plans], PAGE_H - 45 * mm, 20 * mm)
 
 
-def draw_solutions(c, page_num):
+def draw_solution_page(c, page_num, placed):
     header(c, 'Lösungen', 'Hypotenuse, Gegenkathete und Ankathete')
-    y = PAGE_H - 45 * mm
-    c.setFont('Helvetica', 10.5)
-    for i, (right_vertex, marked_vertex) in enumerate(PROBLEMS):
-        idx = i + 1
-        explanation, hyp, gegen, anka = solution_text(right_vertex, marked_vertex)
-        c.setFont('Helvetica-Bold', 11)
-        c.drawString(20 * mm, y, f'Aufgabe {idx}: Hypotenuse = {hyp}, Gegenkathete = {gegen}, Ankathete = {anka}')
-        y -= 13
-        c.setFont('Helvetica', 9.5)
-        c.setFillColorRGB(*GRAY)
-        # einfacher Zeilenumbruch
-        words = explanation.split(' ')
-        line = ''
-        for word in words:
-            test = (line + ' ' + word).strip()
-            if c.stringWidth(test, 'Helvetica', 9.5) > 170 * mm:
-                c.drawString(22 * mm, y, line)
-                y -= 12
-                line = word
-            else:
-                line = test
-        if line:
-            c.drawString(22 * mm, y, line)
-            y -= 12
-        c.setFillColorRGB(*BLACK)
-        y -= 10
+    draw_lines(c, placed)
     footer(c, page_num)
     c.showPage()
 
 
-def main():
-    c = canvas.Canvas(OUT, pagesize=A4)
-    draw_cover(c)
+def pages(plans, reuse_forms=False, student=None):
+    """Alle Seiten des Blatts in Reihenfolge: (Phase, Zeichenfunktion, Argumente nach c)."""
+    yield 'cover', draw_cover, (student,)
     page = 2
-    for start in range(0, len(PROBLEMS), 4):
-        draw_problem_page(c, page, PROBLEMS[start:start + 4], start)
+    for start in range(0, len(plans), 4):
+        yield 'problems', draw_problem_page, (page, plans[start:start + 4], reuse_forms)
         page += 1
-    draw_solutions(c, page)
-    c.save()
-    print('PDF erstellt:', OUT)
+    for placed in solution_pages(plans):
+        yield 'solutions', draw_solution_page, (page, placed)
+        page += 1
+
+
+def build(c, problems=PROBLEMS, reuse_forms=False, student=None, jobs=None):
+    """Zeichnet das komplette Arbeitsblatt auf c und liefert die Seitenzahl (jobs > 1: Seiten parallel)."""
+    return draw_pages(c, pages(plan(problems, resolve), reuse_forms, student), jobs)
+
+
+def main(out=OUT, reuse_forms=False, problems=PROBLEMS, chunk_pages=None, jobs=None, previews=None):
+    if jobs and jobs > 1 and not chunk_pages:
+        chunk_pages = CHUNK_PAGES  # parallele Seiten werden streamend zusammengesetzt
+    with atomic_output(out) as tmp:
+        c = new_canvas(tmp, trace_name=out, chunk_pages=chunk_pages)
+        if previews:
+            c.previews = []  # SVG-Skizzen aus demselben Layout-Durchlauf
+        build(c, problems, reuse_forms, jobs=jobs)
+        c.save()
+    if previews:
+        write_previews(previews, out, c.previews)
+    print('PDF erstellt:', out)
 
 
 if __name__ == '__main__':
@@ -1,33 +1,21 @@
 """PDF 2: Sinus, Kosinus und Tangens erkennen."""
-from reportlab.pdfgen import canvas
+import os
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
-from triangle_draw import draw_triangle, BLACK, RED, GRAY
+from pdf_output import CHUNK_PAGES, DOWNLOADS, atomic_output, draw_pages, new_canvas, write_previews
+from problem_plan import ROLE_SIDES, ResolvedProblem, angle_keys, plan, symbol
+from text_flow import draw_lines, paginate, with_gap, wrapped_lines
+from triangle_draw import draw_triangle, BLACK, RED, GRAY, GREEK
 
-OUT = '../../mathe-trainer/public/downloads/sinus-kosinus-tangens-erkennen-uebungen.pdf'
+OUT = os.path.join(DOWNLOADS, 'sinus-kosinus-tangens-erkennen-uebungen.pdf')
 PAGE_W, PAGE_H = A4
 
-ANGLE_AT = {'A': 'alpha', 'B': 'beta', 'C': 'gamma'}
-GREEK = {'alpha': 'α', 'beta': 'β', 'gamma': 'γ'}
 LEG_LENGTHS = {
     'C': {'a': 7, 'b': 5},
     'A': {'b': 7, 'c': 5},
     'B': {'a': 5, 'c': 7},
 }
-
-
-def hyp_side(rv):
-    return {'C': 'c', 'A': 'a', 'B': 'b'}[rv]
-
-
-def opposite_side(v):
-    return {'A': 'a', 'B': 'b', 'C': 'c'}[v]
-
-
-def adjacent_side(right_vertex, marked_vertex):
-    hyp = hyp_side(right_vertex)
-    opp = opposite_side(marked_vertex)
-    return [s for s in ('a', 'b', 'c') if s not in (hyp, opp)][0]
+SIDE_DISPLAY = {s: (s, BLACK) for s in ('a', 'b', 'c')}
 
 
 # Aufgaben 1-3: Funktion -> Bruch.  Aufgaben 4-6: Bruch -> Funktion.
@@ -65,8 +53,11 @@ def footer(c, page_num):
     c.setFillColorRGB(*BLACK)
 
 
-def draw_cover(c):
+def draw_cover(c, student=None):
     header(c, 'Sinus, Kosinus und Tangens erkennen', 'Übungsblatt: Seitenverhältnisse im rechtwinkligen Dreieck')
+    if student:
+        c.setFont('Helvetica', 11)
+        c.drawString(20 * mm, PAGE_H - 36 * mm, f'Name: {student}')
     text = c.beginText(20 * mm, PAGE_H - 45 * mm)
     text.setLeading(15)
     c.setFont('Helvetica', 11)
@@ -92,63 +83,8 @@ def draw_cover(c):
     c.showPage()
 
 
-def triangle_for(problem, idx):
-    right_vertex = problem['right']
-    marked_vertex = problem['marked']
-    marked_key = ANGLE_AT[marked_vertex]
-    other_vertex = [v for v in ('A', 'B', 'C') if v not in (right_vertex, marked_vertex)][0]
-    other_key = ANGLE_AT[other_vertex]
-
-    side_display = {s: (s, BLACK) for s in ('a', 'b', 'c')}
-    angle_display = {marked_key: (GREEK[marked_key], RED), other_key: (GREEK[other_key], GRAY)}
-    angle_display[ANGLE_AT[right_vertex]] = None
-    return right_vertex, side_display, angle_display, (idx % 2 == 0)
-
-
-def draw_problem_page(c, page_num, problems_on_page, start_index):
-    header(c, 'Übungsaufgaben', f'Aufgaben {start_index + 1}-{start_index + len(problems_on_page)}')
-    box_w, box_h = 80 * mm, 55 * mm
-    cols_x = [18 * mm, 110 * mm]
-    rows_y = [PAGE_H - 50 * mm - box_h, PAGE_H - 50 * mm - box_h - 100 * mm]
-
-    for i, problem in enumerate(problems_on_page):
-        idx = start_index + i + 1
-        col, row = i % 2, i // 2
-        x, y = cols_x[col], rows_y[row]
-
-        right_vertex, side_display, angle_display, flip = triangle_for(problem, idx)
-        marked_sym = GREEK[ANGLE_AT[problem['marked']]]
-
-        c.setFont('Helvetica-Bold', 12)
-        c.setFillColorRGB(*BLACK)
-        c.drawString(x, y + box_h + 8, f'Aufgabe {idx}')
-
-        draw_triangle(c, x, y, box_w, box_h, right_vertex, LEG_LENGTHS[right_vertex],
-                       side_display, angle_display, flip=flip)
-
-        ty = y - 10
-        c.setFont('Helvetica', 10)
-        if problem['mode'] == 'func2ratio':
-            fn_name = FN_NAME[problem['fn']]
-            c.drawString(x, ty, f'Welcher Bruch entspricht {fn_name}({marked_sym})?')
-            c.drawString(x, ty - 16, 'Antwort: __________')
-        else:
-            num, den = problem['ratio']
-            c.drawString(x, ty, f'Welche Funktion beschreibt den Bruch {num}/{den}')
-            c.drawString(x, ty - 14, f'bezogen auf {marked_sym}?')
-            c.drawString(x, ty - 30, 'Antwort: __________')
-
-    footer(c, page_num)
-    c.showPage()
-
-
-def solution_for(problem, idx):
-    right_vertex = problem['right']
-    marked_vertex = problem['marked']
-    marked_sym = GREEK[ANGLE_AT[marked_vertex]]
-    opp = opposite_side(marked_vertex)
-    adj = adjacent_side(right_vertex, marked_vertex)
-    hyp = hyp_side(right_vertex)
+def solution_for(problem, idx, sides, marked_sym):
+    opp, adj, hyp = sides['opp'], sides['adj'], sides['hyp']
 
     if problem['mode'] == 'func2ratio':
         fn = problem['fn']
@@ -177,36 +113,100 @@ def solution_for(problem, idx):
     return f'Aufgabe {idx}: {num}/{den} = {answer}', why
 
 
-def draw_solutions(c, page_num):
-    header(c, 'Lösungen', 'Sinus, Kosinus und Tangens erkennen')
-    y = PAGE_H - 45 * mm
-    for i, problem in enumerate(PROBLEMS):
-        idx = i + 1
-        title, why = solution_for(problem, idx)
-        c.setFont('Helvetica-Bold', 11)
-        c.setFillColorRGB(*BLACK)
-        c.drawString(20 * mm, y, title)
-        y -= 13
-        c.setFont('Helvetica', 9.5)
-        c.setFillColorRGB(*GRAY)
-        c.drawString(22 * mm, y, why)
+def resolve(problem, idx):
+    """Löst eine Aufgabe vollständig auf (Skizze, Fragetext, Lösung)."""
+    right_vertex, marked_vertex = problem['right'], problem['marked']
+    sides = ROLE_SIDES[(right_vertex, marked_vertex)]
+    marked_key, other_key, right_key = angle_keys(right_vertex, marked_vertex)
+    marked_sym = symbol(marked_vertex)
+
+    if problem['mode'] == 'func2ratio':
+        fn_name = FN_NAME[problem['fn']]
+        prompt = ((-10, f'Welcher Bruch entspricht {fn_name}({marked_sym})?'),
+                  (-26, 'Antwort: __________'))
+    else:
+        num, den = problem['ratio']
+        prompt = ((-10, f'Welche Funktion beschreibt den Bruch {num}/{den}'),
+                  (-24, f'bezogen auf {marked_sym}?'),
+                  (-40, 'Antwort: __________'))
+
+    title, why = solution_for(problem, idx, sides, marked_sym)
+    return ResolvedProblem(
+        idx=idx, right=right_vertex, marked=marked_vertex, flip=(idx % 2 == 0), sides=sides,
+        leg_lengths=LEG_LENGTHS[right_vertex],
+        side_display=SIDE_DISPLAY,
+        angle_display={marked_key: (marked_sym, RED), other_key: (GREEK[other_key], GRAY), right_key: None},
+        prompt=prompt,
+        solution=tuple([(20 * mm, 'Helvetica-Bold', 11, BLACK, title, 13)]
+                       + with_gap(wrapped_lines(22 * mm, 'Helvetica', 9.5, GRAY, why, 170 * mm, 12), 10)),
+    )
+
+
+def draw_problem_page(c, page_num, plans_on_page, reuse_forms=False):
+    header(c, 'Übungsaufgaben', f'Aufgaben {plans_on_page[0].idx}-{plans_on_page[-1].idx}')
+    box_w, box_h = 80 * mm, 55 * mm
+    cols_x = [18 * mm, 110 * mm]
+    rows_y = [PAGE_H - 50 * mm - box_h, PAGE_H - 50 * mm - box_h - 100 * mm]
+
+    for i, rp in enumerate(plans_on_page):
+        x, y = cols_x[i % 2], rows_y[i // 2]
+
+        c.setFont('Helvetica-Bold', 12)
         c.setFillColorRGB(*BLACK)
-        y -= 22
+        c.drawString(x, y + box_h + 8, f'Aufgabe {rp.idx}')
+
+        draw_triangle(c, x, y, box_w, box_h, rp.right, rp.leg_lengths,
+                       rp.side_display, rp.angle_display, flip=rp.flip, reuse_form=reuse_forms)
+
+        c.setFont('Helvetica', 10)
+        for dy, text in rp.prompt:
+            c.drawString(x, y + dy, text)
 
     footer(c, page_num)
     c.showPage()
 
 
-def main():
-    c = canvas.Canvas(OUT, pagesize=A4)
-    draw_cover(c)
+def solution_pages(plans):
+    """Verteilt die Rechenwege auf Lösungsseiten (automatischer Seitenumbruch)."""
+    return paginate([rp.solution for rp in plans], PAGE_H - 45 * mm, 20 * mm)
+
+
+def draw_solution_page(c, page_num, placed):
+    header(c, 'Lösungen', 'Sinus, Kosinus und Tangens erkennen')
+    draw_lines(c, placed)
+    footer(c, page_num)
+    c.showPage()
+
+
+def pages(plans, reuse_forms=False, student=None):
+    """Alle Seiten des Blatts in Reihenfolge: (Phase, Zeichenfunktion, Argumente nach c)."""
+    yield 'cover', draw_cover, (student,)
     page = 2
-    for start in range(0, len(PROBLEMS), 4):
-        draw_problem_page(c, page, PROBLEMS[start:start + 4], start)
+    for start in range(0, len(plans), 4):
+        yield 'problems', draw_problem_page, (page, plans[start:start + 4], reuse_forms)
+        page += 1
+    for placed in solution_pages(plans):
+        yield 'solutions', draw_solution_page, (page, placed)
         page += 1
-    draw_solutions(c, page)
-    c.save()
-    print('PDF erstellt:', OUT)
+
+
+def build(c, problems=PROBLEMS, reuse_forms=False, student=None, jobs=None):
+    """Zeichnet das komplette Arbeitsblatt auf c und liefert die Seitenzahl (jobs > 1: Seiten parallel)."""
+    return draw_pages(c, pages(plan(problems, resolve), reuse_forms, student), jobs)
+
+
+def main(out=OUT, reuse_forms=False, problems=PROBLEMS, chunk_pages=None, jobs=None, previews=None):
+    if jobs and jobs > 1 and not chunk_pages:
+        chunk_pages = CHUNK_PAGES  # parallele Seiten werden streamend zusammengesetzt
+    with atomic_output(out) as tmp:
+        c = new_canvas(tmp, trace_name=out, chunk_pages=chunk_pages)
+        if previews:
+            c.previews = []  # SVG-Skizzen aus demselben Layout-Durchlauf
+        build(c, problems, reuse_forms, jobs=jobs)
+        c.save()
+    if previews:
+        write_previews(previews, out, c.previews)
+    print('PDF erstellt:', out)
 
 
 if __name__ == '__main__':
@@ -1,31 +1,16 @@
 """PDF 3: Streckenlänge mit Sinus, Kosinus und Tangens berechnen."""
+import os
 import math
-from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
-from triangle_draw import draw_triangle, BLACK, RED, GRAY
+from pdf_output import CHUNK_PAGES, DOWNLOADS, atomic_output, draw_pages, new_canvas, write_previews
+from problem_plan import ROLE_SIDES, ResolvedProblem, angle_keys, plan, symbol
+from text_flow import draw_lines, paginate, with_gap, wrapped_lines
+from triangle_draw import draw_triangle, BLACK, RED, GRAY, GREEK
 
-OUT = '../../mathe-trainer/public/downloads/streckenlaenge-sinus-kosinus-tangens-uebungen.pdf'
+OUT = os.path.join(DOWNLOADS, 'streckenlaenge-sinus-kosinus-tangens-uebungen.pdf')
 PAGE_W, PAGE_H = A4
 
-ANGLE_AT = {'A': 'alpha', 'B': 'beta', 'C': 'gamma'}
-GREEK = {'alpha': 'α', 'beta': 'β', 'gamma': 'γ'}
-
-
-def hyp_side(rv):
-    return {'C': 'c', 'A': 'a', 'B': 'b'}[rv]
-
-
-def opposite_side(v):
-    return {'A': 'a', 'B': 'b', 'C': 'c'}[v]
-
-
-def adjacent_side(right_vertex, marked_vertex):
-    hyp = hyp_side(right_vertex)
-    opp = opposite_side(marked_vertex)
-    return [s for s in ('a', 'b', 'c') if s not in (hyp, opp)][0]
-
-
 # Jedes Problem: right_vertex, marked_vertex (Bezugswinkel), angle_deg,
 # given_side ('hyp'|'opp'|'adj' relativ zum Bezugswinkel), given_value,
 # target_side ('hyp'|'opp'|'adj'), unit
@@ -48,15 +33,6 @@ FN_FOR_ROLES = {
 ROLE_NAME = {'hyp': 'Hypotenuse', 'opp': 'Gegenkathete', 'adj': 'Ankathete'}
 
 
-def role_to_side(problem, role):
-    right_vertex, marked_vertex = problem['right'], problem['marked']
-    if role == 'hyp':
-        return hyp_side(right_vertex)
-    if role == 'opp':
-        return opposite_side(marked_vertex)
-    return adjacent_side(right_vertex, marked_vertex)
-
-
 def compute_triangle(problem):
     """Berechnet alle Seiten/Winkel des Dreiecks für die Skizze und die Lösung."""
     angle = problem['angle']
@@ -81,12 +57,8 @@ def compute_triangle(problem):
     values = {'hyp': hyp, 'opp': opp, 'adj': adj}
     target_val = values[target_role]
 
-    right_vertex, marked_vertex = problem['right'], problem['marked']
-    side_val = {
-        hyp_side(right_vertex): hyp,
-        opposite_side(marked_vertex): opp,
-        adjacent_side(right_vertex, marked_vertex): adj,
-    }
+    sides = ROLE_SIDES[(problem['right'], problem['marked'])]
+    side_val = {sides[role]: value for role, value in values.items()}
     return values, side_val, target_val
 
 
@@ -108,8 +80,11 @@ def footer(c, page_num):
     c.setFillColorRGB(*BLACK)
 
 
-def draw_cover(c):
+def draw_cover(c, student=None):
     header(c, 'Streckenlänge berechnen', 'Übungsblatt: Sinus, Kosinus und Tangens im rechtwinkligen Dreieck')
+    if student:
+        c.setFont('Helvetica', 11)
+        c.drawString(20 * mm, PAGE_H - 36 * mm, f'Name: {student}')
     c.setFont('Helvetica', 11)
     text = c.beginText(20 * mm, PAGE_H - 45 * mm)
     text.setLeading(15)
@@ -135,123 +110,136 @@ def draw_cover(c):
     c.showPage()
 
 
-def draw_problem_page(c, page_num, problems_on_page, start_index):
-    header(c, 'Übungsaufgaben', f'Aufgaben {start_index + 1}-{start_index + len(problems_on_page)}')
+def fn_for(problem):
+    pair = frozenset([problem['given_role'], problem['target_role']])
+    return FN_FOR_ROLES[pair]
+
+
+def resolve(problem, idx):
+    """Löst eine Aufgabe vollständig auf (Skizze, Fragetext, Rechenweg)."""
+    right_vertex, marked_vertex = problem['right'], problem['marked']
+    sides = ROLE_SIDES[(right_vertex, marked_vertex)]
+    marked_key, other_key, right_key = angle_keys(right_vertex, marked_vertex)
+    sym = symbol(marked_vertex)
+    _, side_val, target_val = compute_triangle(problem)
+    given_side = sides[problem['given_role']]
+    target_side = sides[problem['target_role']]
+    given_val = problem['given_value']
+    angle = problem['angle']
+
+    side_display = {}
+    for s in ('a', 'b', 'c'):
+        if s == target_side:
+            side_display[s] = (f'{s} = ?', RED)
+        elif s == given_side:
+            side_display[s] = (f'{s} = {side_val[s]:.0f} cm' if side_val[s] == int(side_val[s])
+                                else f'{s} = {side_val[s]:.1f} cm', BLACK)
+        else:
+            side_display[s] = (s, GRAY)
+
+    fn = fn_for(problem)
+    if fn == 'sin':
+        formula = f'sin({sym}) = Gegenkathete / Hypotenuse'
+    elif fn == 'cos':
+        formula = f'cos({sym}) = Ankathete / Hypotenuse'
+    else:
+        formula = f'tan({sym}) = Gegenkathete / Ankathete'
+
+    roles = (problem['given_role'], problem['target_role'])
+    if roles == ('hyp', 'opp'):
+        step = f'{target_side} = {given_side} · sin({sym}) = {given_val:g} · sin({angle}°)'
+    elif roles == ('opp', 'hyp'):
+        step = f'{target_side} = {given_side} / sin({sym}) = {given_val:g} / sin({angle}°)'
+    elif roles == ('hyp', 'adj'):
+        step = f'{target_side} = {given_side} · cos({sym}) = {given_val:g} · cos({angle}°)'
+    elif roles == ('adj', 'hyp'):
+        step = f'{target_side} = {given_side} / cos({sym}) = {given_val:g} / cos({angle}°)'
+    elif roles == ('adj', 'opp'):
+        step = f'{target_side} = {given_side} · tan({sym}) = {given_val:g} · tan({angle}°)'
+    else:  # opp -> adj
+        step = f'{target_side} = {given_side} / tan({sym}) = {given_val:g} / tan({angle}°)'
+
+    title = f'Aufgabe {idx}: {target_side} ≈ {target_val:.2f} cm'
+    given = f'Gegeben: {given_side} = {given_val:g} cm, {sym} = {angle}°  →  {formula}'
+    return ResolvedProblem(
+        idx=idx, right=right_vertex, marked=marked_vertex, flip=(idx % 2 == 0), sides=sides,
+        leg_lengths=side_val,
+        side_display=side_display,
+        angle_display={marked_key: (f'{sym} = {angle}°', BLACK), other_key: (GREEK[other_key], GRAY),
+                       right_key: None},
+        prompt=((-10, f'Berechne die Seite {target_side}.'), (-26, f'{target_side} = __________ cm')),
+        solution=tuple([(20 * mm, 'Helvetica-Bold', 11, BLACK, title, 13)]
+                       + wrapped_lines(22 * mm, 'Helvetica', 9.5, GRAY, given, 170 * mm, 12)
+                       + with_gap(wrapped_lines(22 * mm, 'Helvetica', 9.5, GRAY, f'{step}  ≈  {target_val:.2f} cm',
+                                                170 * mm, 12), 10)),
+    )
+
+
+def draw_problem_page(c, page_num, plans_on_page, reuse_forms=False):
+    header(c, 'Übungsaufgaben', f'Aufgaben {plans_on_page[0].idx}-{plans_on_page[-1].idx}')
     box_w, box_h = 80 * mm, 55 * mm
     cols_x = [18 * mm, 110 * mm]
     rows_y = [PAGE_H - 50 * mm - box_h, PAGE_H - 50 * mm - box_h - 100 * mm]
 
-    for i, problem in enumerate(problems_on_page):
-        idx = start_index + i + 1
-        col, row = i % 2, i // 2
-        x, y = cols_x[col], rows_y[row]
-        flip = (idx % 2 == 0)
-
-        right_vertex, marked_vertex = problem['right'], problem['marked']
-        marked_key = ANGLE_AT[marked_vertex]
-        _, side_val, _ = compute_triangle(problem)
-
-        given_side = role_to_side(problem, problem['given_role'])
-        target_side = role_to_side(problem, problem['target_role'])
-
-        side_display = {}
-        for s in ('a', 'b', 'c'):
-            if s == target_side:
-                side_display[s] = (f'{s} = ?', RED)
-            elif s == given_side:
-                side_display[s] = (f'{s} = {side_val[s]:.0f} cm' if side_val[s] == int(side_val[s])
-                                    else f'{s} = {side_val[s]:.1f} cm', BLACK)
-            else:
-                side_display[s] = (s, GRAY)
-
-        angle_display = {marked_key: (f"{GREEK[marked_key]} = {problem['angle']}°", BLACK)}
-        other_vertex = [v for v in ('A', 'B', 'C') if v not in (right_vertex, marked_vertex)][0]
-        angle_display[ANGLE_AT[other_vertex]] = (GREEK[ANGLE_AT[other_vertex]], GRAY)
-        angle_display[ANGLE_AT[right_vertex]] = None
+    for i, rp in enumerate(plans_on_page):
+        x, y = cols_x[i % 2], rows_y[i // 2]
 
         c.setFont('Helvetica-Bold', 12)
         c.setFillColorRGB(*BLACK)
-        c.drawString(x, y + box_h + 8, f'Aufgabe {idx}')
+        c.drawString(x, y + box_h + 8, f'Aufgabe {rp.idx}')
 
-        draw_triangle(c, x, y, box_w, box_h, right_vertex,
-                       {s: v for s, v in side_val.items()}, side_display, angle_display, flip=flip)
+        draw_triangle(c, x, y, box_w, box_h, rp.right, rp.leg_lengths,
+                       rp.side_display, rp.angle_display, flip=rp.flip, reuse_form=reuse_forms)
 
-        ty = y - 10
         c.setFont('Helvetica', 10)
-        c.drawString(x, ty, f'Berechne die Seite {target_side}.')
-        c.drawString(x, ty - 16, f'{target_side} = __________ cm')
+        for dy, text in rp.prompt:
+            c.drawString(x, y + dy, text)
 
     footer(c, page_num)
     c.showPage()
 
 
-def fn_for(problem):
-    pair = frozenset([problem['given_role'], problem['target_role']])
-    return FN_FOR_ROLES[pair]
+def solution_pages(plans):
+    """Verteilt die Rechenwege auf Lösungsseiten (automatischer Seitenumbruch)."""
+    return paginate([rp.solution for rp in plans], PAGE_H - 42 * mm, 20 * mm)
 
 
-def draw_solutions(c, page_num):
+def draw_solution_page(c, page_num, placed):
     header(c, 'Lösungen', 'Streckenlänge berechnen - Rechenwege')
-    y = PAGE_H - 42 * mm
-
-    for i, problem in enumerate(PROBLEMS):
-        idx = i + 1
-        marked_key = ANGLE_AT[problem['marked']]
-        sym = GREEK[marked_key]
-        fn = fn_for(problem)
-        _, side_val, target_val = compute_triangle(problem)
-        given_side = role_to_side(problem, problem['given_role'])
-        target_side = role_to_side(problem, problem['target_role'])
-        given_val = problem['given_value']
-        angle = problem['angle']
-
-        if fn == 'sin':
-            formula = f'sin({sym}) = Gegenkathete / Hypotenuse'
-        elif fn == 'cos':
-            formula = f'cos({sym}) = Ankathete / Hypotenuse'
-        else:
-            formula = f'tan({sym}) = Gegenkathete / Ankathete'
-
-        roles = (problem['given_role'], problem['target_role'])
-        if roles == ('hyp', 'opp'):
-            step = f'{target_side} = {given_side} · sin({sym}) = {given_val:g} · sin({angle}°)'
-        elif roles == ('opp', 'hyp'):
-            step = f'{target_side} = {given_side} / sin({sym}) = {given_val:g} / sin({angle}°)'
-        elif roles == ('hyp', 'adj'):
-            step = f'{target_side} = {given_side} · cos({sym}) = {given_val:g} · cos({angle}°)'
-        elif roles == ('adj', 'hyp'):
-            step = f'{target_side} = {given_side} / cos({sym}) = {given_val:g} / cos({angle}°)'
-        elif roles == ('adj', 'opp'):
-            step = f'{target_side} = {given_side} · tan({sym}) = {given_val:g} · tan({angle}°)'
-        else:  # opp -> adj
-            step = f'{target_side} = {given_side} / tan({sym}) = {given_val:g} / tan({angle}°)'
-
-        c.setFont('Helvetica-Bold', 11)
-        c.setFillColorRGB(*BLACK)
-        c.drawString(20 * mm, y, f'Aufgabe {idx}: {target_side} ≈ {target_val:.2f} cm')
-        y -= 13
-        c.setFont('Helvetica', 9.5)
-        c.setFillColorRGB(*GRAY)
-        c.drawString(22 * mm, y, f'Gegeben: {given_side} = {given_val:g} cm, {sym} = {angle}°  →  {formula}')
-        y -= 12
-        c.drawString(22 * mm, y, f'{step}  ≈  {target_val:.2f} cm')
-        c.setFillColorRGB(*BLACK)
-        y -= 22
-
+    draw_lines(c, placed)
     footer(c, page_num)
     c.showPage()
 
 
-def main():
-    c = canvas.Canvas(OUT, pagesize=A4)
-    draw_cover(c)
+def pages(plans, reuse_forms=False, student=None):
+    """Alle Seiten des Blatts in Reihenfolge: (Phase, Zeichenfunktion, Argumente nach c)."""
+    yield 'cover', draw_cover, (student,)
     page = 2
-    for start in range(0, len(PROBLEMS), 4):
-        draw_problem_page(c, page, PROBLEMS[start:start + 4], start)
+    for start in range(0, len(plans), 4):
+        yield 'problems', draw_problem_page, (page, plans[start:start + 4], reuse_forms)
+        page += 1
+    for placed in solution_pages(plans):
+        yield 'solutions', draw_solution_page, (page, placed)
         page += 1
-    draw_solutions(c, page)
-    c.save()
-    print('PDF erstellt:', OUT)
+
+
+def build(c, problems=PROBLEMS, reuse_forms=False, student=None, jobs=None):
+    """Zeichnet das komplette Arbeitsblatt auf c und liefert die Seitenzahl (jobs > 1: Seiten parallel)."""
+    return draw_pages(c, pages(plan(problems, resolve), reuse_forms, student), jobs)
+
+
+def main(out=OUT, reuse_forms=False, problems=PROBLEMS, chunk_pages=None, jobs=None, previews=None):
+    if jobs and jobs > 1 and not chunk_pages:
+        chunk_pages = CHUNK_PAGES  # parallele Seiten werden streamend zusammengesetzt
+    with atomic_output(out) as tmp:
+        c = new_canvas(tmp, trace_name=out, chunk_pages=chunk_pages)
+        if previews:
+            c.previews = []  # SVG-Skizzen aus demselben Layout-Durchlauf
+        build(c, problems, reuse_forms, jobs=jobs)
+        c.save()
+    if previews:
+        write_previews(previews, out, c.previews)
+    print('PDF erstellt:', out)
 
 
 if __name__ == '__main__':
@@ -1,39 +1,16 @@
 """PDF 4: Winkel berechnen mit Sinus, Kosinus und Tangens."""
+import os
 import math
-from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
-from triangle_draw import draw_triangle, BLACK, RED, GRAY
+from pdf_output import CHUNK_PAGES, DOWNLOADS, atomic_output, draw_pages, new_canvas, write_previews
+from problem_plan import ROLE_SIDES, ResolvedProblem, angle_keys, plan, symbol
+from text_flow import draw_lines, paginate, with_gap, wrapped_lines
+from triangle_draw import draw_triangle, BLACK, RED, GRAY, GREEK
 
-OUT = '../../mathe-trainer/public/downloads/winkel-berechnen-sinus-kosinus-tangens-uebungen.pdf'
+OUT = os.path.join(DOWNLOADS, 'winkel-berechnen-sinus-kosinus-tangens-uebungen.pdf')
 PAGE_W, PAGE_H = A4
 
-ANGLE_AT = {'A': 'alpha', 'B': 'beta', 'C': 'gamma'}
-GREEK = {'alpha': 'α', 'beta': 'β', 'gamma': 'γ'}
-
-
-def hyp_side(rv):
-    return {'C': 'c', 'A': 'a', 'B': 'b'}[rv]
-
-
-def opposite_side(v):
-    return {'A': 'a', 'B': 'b', 'C': 'c'}[v]
-
-
-def adjacent_side(right_vertex, marked_vertex):
-    hyp = hyp_side(right_vertex)
-    opp = opposite_side(marked_vertex)
-    return [s for s in ('a', 'b', 'c') if s not in (hyp, opp)][0]
-
-
-def role_to_side(right_vertex, marked_vertex, role):
-    if role == 'hyp':
-        return hyp_side(right_vertex)
-    if role == 'opp':
-        return opposite_side(marked_vertex)
-    return adjacent_side(right_vertex, marked_vertex)
-
-
 # right_vertex, marked_vertex (gesuchter Winkel), given side values nach Rolle
 # mode 'tan' -> beide Katheten gegeben (opp, adj); mode 'cos' -> adj + hyp gegeben
 PROBLEMS = [
@@ -49,8 +26,7 @@ PROBLEMS = [
 
 
 def compute_triangle(problem):
-    right_vertex, marked_vertex, mode = problem['right'], problem['marked'], problem['mode']
-    if mode == 'tan':
+    if problem['mode'] == 'tan':
         opp, adj = problem['opp'], problem['adj']
         angle = math.degrees(math.atan2(opp, adj))
         hyp = math.hypot(opp, adj)
@@ -59,11 +35,8 @@ def compute_triangle(problem):
         angle = math.degrees(math.acos(adj / hyp))
         opp = math.sqrt(max(hyp * hyp - adj * adj, 0))
 
-    side_val = {
-        hyp_side(right_vertex): hyp,
-        opposite_side(marked_vertex): opp,
-        adjacent_side(right_vertex, marked_vertex): adj,
-    }
+    sides = ROLE_SIDES[(problem['right'], problem['marked'])]
+    side_val = {sides['hyp']: hyp, sides['opp']: opp, sides['adj']: adj}
     return side_val, angle
 
 
@@ -85,8 +58,11 @@ def footer(c, page_num):
     c.setFillColorRGB(*BLACK)
 
 
-def draw_cover(c):
+def draw_cover(c, student=None):
     header(c, 'Winkel berechnen', 'Übungsblatt: Sinus, Kosinus und Tangens im rechtwinkligen Dreieck')
+    if student:
+        c.setFont('Helvetica', 11)
+        c.drawString(20 * mm, PAGE_H - 36 * mm, f'Name: {student}')
     c.setFont('Helvetica', 11)
     text = c.beginText(20 * mm, PAGE_H - 45 * mm)
     text.setLeading(15)
@@ -113,104 +89,114 @@ def draw_cover(c):
     c.showPage()
 
 
-def draw_problem_page(c, page_num, problems_on_page, start_index):
-    header(c, 'Übungsaufgaben', f'Aufgaben {start_index + 1}-{start_index + len(problems_on_page)}')
+def resolve(problem, idx):
+    """Löst eine Aufgabe vollständig auf (Skizze, Fragetext, Rechenweg)."""
+    right_vertex, marked_vertex, mode = problem['right'], problem['marked'], problem['mode']
+    sides = ROLE_SIDES[(right_vertex, marked_vertex)]
+    marked_key, other_key, right_key = angle_keys(right_vertex, marked_vertex)
+    sym = symbol(marked_vertex)
+    side_val, angle = compute_triangle(problem)
+
+    given_roles = ['opp', 'adj'] if mode == 'tan' else ['adj', 'hyp']
+    given_sides = {sides[r] for r in given_roles}
+    side_display = {}
+    for s in ('a', 'b', 'c'):
+        if s in given_sides:
+            val = side_val[s]
+            txt = f'{s} = {val:.0f} cm' if val == int(val) else f'{s} = {val:.1f} cm'
+            side_display[s] = (txt, BLACK)
+        else:
+            side_display[s] = (s, GRAY)
+
+    opp_side, adj_side, hyp_s = sides['opp'], sides['adj'], sides['hyp']
+    if mode == 'tan':
+        opp_v, adj_v = problem['opp'], problem['adj']
+        ratio = opp_v / adj_v
+        given = f'Gegeben: {opp_side} = {opp_v:g} cm, {adj_side} = {adj_v:g} cm  →  tan({sym}) = Gegenkathete / Ankathete'
+        step = f'tan({sym}) = {opp_side}/{adj_side} = {opp_v:g}/{adj_v:g} = {ratio:.3f}  →  {sym} = arctan({ratio:.3f}) ≈ {angle:.1f}°'
+    else:
+        adj_v, hyp_v = problem['adj'], problem['hyp']
+        ratio = adj_v / hyp_v
+        given = f'Gegeben: {adj_side} = {adj_v:g} cm, {hyp_s} = {hyp_v:g} cm  →  cos({sym}) = Ankathete / Hypotenuse'
+        step = f'cos({sym}) = {adj_side}/{hyp_s} = {adj_v:g}/{hyp_v:g} = {ratio:.3f}  →  {sym} = arccos({ratio:.3f}) ≈ {angle:.1f}°'
+
+    return ResolvedProblem(
+        idx=idx, right=right_vertex, marked=marked_vertex, flip=(idx % 2 == 0), sides=sides,
+        leg_lengths=side_val,
+        side_display=side_display,
+        angle_display={marked_key: (f'{sym} = ?', RED), other_key: (GREEK[other_key], GRAY), right_key: None},
+        prompt=((-10, f'Berechne den Winkel {sym}.'), (-26, f'{sym} = __________ °')),
+        solution=tuple([(20 * mm, 'Helvetica-Bold', 11, BLACK, f'Aufgabe {idx}: {sym} ≈ {angle:.1f}°', 13)]
+                       + wrapped_lines(22 * mm, 'Helvetica', 9.5, GRAY, given, 170 * mm, 12)
+                       + with_gap(wrapped_lines(22 * mm, 'Helvetica', 9.5, GRAY, step, 170 * mm, 12), 10)),
+    )
+
+
+def draw_problem_page(c, page_num, plans_on_page, reuse_forms=False):
+    header(c, 'Übungsaufgaben', f'Aufgaben {plans_on_page[0].idx}-{plans_on_page[-1].idx}')
     box_w, box_h = 80 * mm, 55 * mm
     cols_x = [18 * mm, 110 * mm]
     rows_y = [PAGE_H - 50 * mm - box_h, PAGE_H - 50 * mm - box_h - 100 * mm]
 
-    for i, problem in enumerate(problems_on_page):
-        idx = start_index + i + 1
-        col, row = i % 2, i // 2
-        x, y = cols_x[col], rows_y[row]
-        flip = (idx % 2 == 0)
-
-        right_vertex, marked_vertex = problem['right'], problem['marked']
-        marked_key = ANGLE_AT[marked_vertex]
-        side_val, _ = compute_triangle(problem)
-
-        given_roles = ['opp', 'adj'] if problem['mode'] == 'tan' else ['adj', 'hyp']
-        given_sides = {role_to_side(right_vertex, marked_vertex, r) for r in given_roles}
-
-        side_display = {}
-        for s in ('a', 'b', 'c'):
-            if s in given_sides:
-                val = side_val[s]
-                txt = f'{s} = {val:.0f} cm' if val == int(val) else f'{s} = {val:.1f} cm'
-                side_display[s] = (txt, BLACK)
-            else:
-                side_display[s] = (s, GRAY)
-
-        angle_display = {marked_key: (f'{GREEK[marked_key]} = ?', RED)}
-        other_vertex = [v for v in ('A', 'B', 'C') if v not in (right_vertex, marked_vertex)][0]
-        angle_display[ANGLE_AT[other_vertex]] = (GREEK[ANGLE_AT[other_vertex]], GRAY)
-        angle_display[ANGLE_AT[right_vertex]] = None
+    for i, rp in enumerate(plans_on_page):
+        x, y = cols_x[i % 2], rows_y[i // 2]
 
         c.setFont('Helvetica-Bold', 12)
         c.setFillColorRGB(*BLACK)
-        c.drawString(x, y + box_h + 8, f'Aufgabe {idx}')
+        c.drawString(x, y + box_h + 8, f'Aufgabe {rp.idx}')
 
-        draw_triangle(c, x, y, box_w, box_h, right_vertex, side_val, side_display, angle_display, flip=flip)
+        draw_triangle(c, x, y, box_w, box_h, rp.right, rp.leg_lengths,
+                       rp.side_display, rp.angle_display, flip=rp.flip, reuse_form=reuse_forms)
 
-        ty = y - 10
         c.setFont('Helvetica', 10)
-        c.drawString(x, ty, f'Berechne den Winkel {GREEK[marked_key]}.')
-        c.drawString(x, ty - 16, f'{GREEK[marked_key]} = __________ °')
+        for dy, text in rp.prompt:
+            c.drawString(x, y + dy, text)
 
     footer(c, page_num)
     c.showPage()
 
 
-def draw_solutions(c, page_num):
-    header(c, 'Lösungen', 'Winkel berechnen - Rechenwege')
-    y = PAGE_H - 42 * mm
-
-    for i, problem in enumerate(PROBLEMS):
-        idx = i + 1
-        right_vertex, marked_vertex, mode = problem['right'], problem['marked'], problem['mode']
-        sym = GREEK[ANGLE_AT[marked_vertex]]
-        opp_side = opposite_side(marked_vertex)
-        adj_side = adjacent_side(right_vertex, marked_vertex)
-        hyp_s = hyp_side(right_vertex)
-        _, angle = compute_triangle(problem)
-
-        c.setFont('Helvetica-Bold', 11)
-        c.setFillColorRGB(*BLACK)
-        c.drawString(20 * mm, y, f'Aufgabe {idx}: {sym} ≈ {angle:.1f}°')
-        y -= 13
-        c.setFont('Helvetica', 9.5)
-        c.setFillColorRGB(*GRAY)
+def solution_pages(plans):
+    """Verteilt die Rechenwege auf Lösungsseiten (automatischer Seitenumbruch)."""
+    return paginate([rp.solution for rp in plans], PAGE_H - 42 * mm, 20 * mm)
 
-        if mode == 'tan':
-            opp_v, adj_v = problem['opp'], problem['adj']
-            c.drawString(22 * mm, y, f'Gegeben: {opp_side} = {opp_v:g} cm, {adj_side} = {adj_v:g} cm  →  tan({sym}) = Gegenkathete / Ankathete')
-            y -= 12
-            ratio = opp_v / adj_v
-            c.drawString(22 * mm, y, f'tan({sym}) = {opp_side}/{adj_side} = {opp_v:g}/{adj_v:g} = {ratio:.3f}  →  {sym} = arctan({ratio:.3f}) ≈ {angle:.1f}°')
-        else:
-            adj_v, hyp_v = problem['adj'], problem['hyp']
-            c.drawString(22 * mm, y, f'Gegeben: {adj_side} = {adj_v:g} cm, {hyp_s} = {hyp_v:g} cm  →  cos({sym}) = Ankathete / Hypotenuse')
-            y -= 12
-            ratio = adj_v / hyp_v
-            c.drawString(22 * mm, y, f'cos({sym}) = {adj_side}/{hyp_s} = {adj_v:g}/{hyp_v:g} = {ratio:.3f}  →  {sym} = arccos({ratio:.3f}) ≈ {angle:.1f}°')
-
-        c.setFillColorRGB(*BLACK)
-        y -= 22
 
+def draw_solution_page(c, page_num, placed):
+    header(c, 'Lösungen', 'Winkel berechnen - Rechenwege')
+    draw_lines(c, placed)
     footer(c, page_num)
     c.showPage()
 
 
-def main():
-    c = canvas.Canvas(OUT, pagesize=A4)
-    draw_cover(c)
+def pages(plans, reuse_forms=False, student=None):
+    """Alle Seiten des Blatts in Reihenfolge: (Phase, Zeichenfunktion, Argumente nach c)."""
+    yield 'cover', draw_cover, (student,)
     page = 2
-    for start in range(0, len(PROBLEMS), 4):
-        draw_problem_page(c, page, PROBLEMS[start:start + 4], start)
+    for start in range(0, len(plans), 4):
+        yield 'problems', draw_problem_page, (page, plans[start:start + 4], reuse_forms)
         page += 1
-    draw_solutions(c, page)
-    c.save()
-    print('PDF erstellt:', OUT)
+    for placed in solution_pages(plans):
+        yield 'solutions', draw_solution_page, (page, placed)
+        page += 1
+
+
+def build(c, problems=PROBLEMS, reuse_forms=False, student=None, jobs=None):
+    """Zeichnet das komplette Arbeitsblatt auf c und liefert die Seitenzahl (jobs > 1: Seiten parallel)."""
+    return draw_pages(c, pages(plan(problems, resolve), reuse_forms, student), jobs)
+
+
+def main(out=OUT, reuse_forms=False, problems=PROBLEMS, chunk_pages=None, jobs=None, previews=None):
+    if jobs and jobs > 1 and not chunk_pages:
+        chunk_pages = CHUNK_PAGES  # parallele Seiten werden streamend zusammengesetzt
+    with atomic_output(out) as tmp:
+        c = new_canvas(tmp, trace_name=out, chunk_pages=chunk_pages)
+        if previews:
+            c.previews = []  # SVG-Skizzen aus demselben Layout-Durchlauf
+        build(c, problems, reuse_forms, jobs=jobs)
+        c.save()
+    if previews:
+        write_previews(previews, out, c.previews)
+    print('PDF erstellt:', out)
 
 
 if __name__ == '__main__':
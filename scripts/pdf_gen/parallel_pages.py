@@ -0,0 +1,80 @@
+"""Paralleles Rendern der Seiten eines einzelnen Arbeitsblatts.
+
+build() zeichnet alle Seiten nacheinander auf einen Canvas - ein Blatt mit 1000+
+Aufgaben läuft damit auf einem Kern. Hier wird die Seitenliste aus pages() (siehe
+gen_pdf*) in zusammenhängende Blöcke geteilt; jeder Worker zeichnet seinen Block auf
+einen eigenen StreamingCanvas mit PageCollector und liefert die fertig komprimierten
+Content-Streams zurück. Der Elternprozess hängt sie in Seitenreihenfolge an den
+ChunkedPDFWriter des Ziel-Canvas; Schriften und Forms landen wie bei pdf_stream in
+einem gemeinsamen Ressourcen-Dictionary.
+
+Seitenzahlen, Kopf-/Fußzeilen und die Umbrüche der Lösungsseiten stehen schon in
+pages() fest - das Ergebnis sieht genauso aus wie der serielle Build.
+
+    python problem_gen.py winkel --count 2000 --jobs 8 --out pool.pdf
+"""
+import importlib
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from pdf_stream import ChunkedOutput, PageCollector, StreamingCanvas
+
+# in jedem Worker in dieser Reihenfolge registriert, damit /F1, /F2, ... überall dieselbe Schrift meinen
+FONTS = ('Helvetica', 'Helvetica-Bold', 'Symbol')
+# Seiten pro Auftrag an einen Worker
+BATCH_PAGES = 32
+
+
+def module_name(func):
+    """Importierbarer Modulname einer Zeichenfunktion (auch wenn das Skript als __main__ läuft)."""
+    name = func.__module__
+    if name == '__main__':
+        name = os.path.splitext(os.path.basename(sys.modules['__main__'].__file__))[0]
+    return name
+
+
+def render_batch(batch, canvas_kwargs, previews=False):
+    """Worker: zeichnet [(modul, funktion, argumente)] und liefert (Seiten, Forms, Schrift-Zuordnung, Vorschauen)."""
+    collector = PageCollector()
+    c = StreamingCanvas(os.devnull, writer=collector, **canvas_kwargs)
+    c.previews = [] if previews else None
+    for font in FONTS:
+        c._doc.getInternalFontName(font)
+    for module, func, args in batch:
+        getattr(importlib.import_module(module), func)(c, *args)
+    return collector.pages, collector.forms, dict(c._doc.fontMapping), c.previews
+
+
+def render_parallel(c, pages, jobs=None, batch_pages=BATCH_PAGES):
+    """
+    Zeichnet pages - (Phase, Zeichenfunktion, Argumente nach c) - mit jobs Worker-Prozessen
+    (Standard: ein Prozess pro Kern) auf c. c muss streamend schreiben, also aus
+    new_canvas(..., chunk_pages=...) kommen. Hat c eine Liste c.previews, werden die
+    SVG-Vorschauen der Worker in Seitenreihenfolge angehängt. Liefert die Seitenzahl.
+    """
+    if not isinstance(c, ChunkedOutput):
+        raise TypeError('Paralleles Rendern braucht einen streamenden Canvas (new_canvas(..., chunk_pages=...))')
+    tasks = [(module_name(draw), draw.__name__, args) for _, draw, args in pages]
+    batches = [tasks[i:i + batch_pages] for i in range(0, len(tasks), batch_pages)]
+    canvas_kwargs = dict(pagesize=c._pagesize, pageCompression=c._pageCompression)
+    writer = c._writer
+    previews = getattr(c, 'previews', None)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        results = pool.map(render_batch, batches, itertools.repeat(canvas_kwargs),
+                           itertools.repeat(previews is not None))
+        for encoded_pages, forms, fonts, batch_previews in results:
+            # nach interner Nummer registrieren - dann vergibt der Ziel-Canvas dieselben Namen
+            for font, internal in sorted(fonts.items(), key=lambda item: int(item[1][2:])):
+                if c._doc.getInternalFontName(font) != internal:
+                    raise RuntimeError(f'Schrift {font} hat in einem Worker den Namen {internal} - in FONTS eintragen')
+            for name, (encoded, bbox) in forms.items():
+                # gleicher Form-Name = gleiche Geometrie (triangle_draw._form_name); der erste Worker gewinnt
+                if name not in writer.forms:
+                    writer.add_encoded_form(name, encoded, bbox)
+            for encoded, width, height in encoded_pages:
+                writer.add_encoded_page(encoded, width, height)
+            if previews is not None:
+                previews.extend(batch_previews)
+    return len(tasks)
@@ -0,0 +1,97 @@
+"""Gemeinsame Ausgabe-Hilfen für die PDF-Generatoren (Zielordner, atomisches Schreiben aus
+mathe-trainer/atomic_write.py, reproduzierbarer Canvas)."""
+import itertools
+import json
+import os
+import sys
+from contextlib import contextmanager
+from operator import itemgetter
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from compact_canvas import CompactCanvas
+from parallel_pages import render_parallel
+from pdf_stream import CHUNK_PAGES, StreamingCanvas  # noqa: F401  (CHUNK_PAGES für die Generatoren)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MATHE_TRAINER = os.path.normpath(os.path.join(HERE, '..', '..', 'mathe-trainer'))
+DOWNLOADS = os.path.join(MATHE_TRAINER, 'public', 'downloads')
+if MATHE_TRAINER not in sys.path:
+    sys.path.insert(0, MATHE_TRAINER)
+
+# atomisches Schreiben teilen sich alle Generatoren; die PDF-Skripte nutzen es über pdf_output
+from atomic_write import atomic_output  # noqa: E402,F401  (braucht MATHE_TRAINER in sys.path)
+
+
+def new_canvas(path, trace_name=None, chunk_pages=None, **kwargs):
+    """
+    Canvas im invariant-Modus: feste Erstellungszeit (2000-01-01 bzw. SOURCE_DATE_EPOCH)
+    und eine Dokument-ID, die nur vom Inhalt abhängt. Gleiche Eingaben ergeben damit
+    byte-identische PDFs - kein Git-Rauschen und kein unnötiges CDN-Invalidieren.
+
+    Ist PDF_TRACE gesetzt (Ordner), kommt stattdessen ein render_trace.TracingCanvas, der
+    beim Speichern <PDF_TRACE>/<trace_name>.trace.json schreibt; trace_name ist der
+    endgültige Dateiname, path meist nur die temporäre Datei von atomic_output.
+
+    Standardmäßig ein compact_canvas.CompactCanvas (keine doppelten Zustandswechsel,
+    gesammelte Textobjekte); PDF_PLAIN_CANVAS=1 schaltet zum Vergleich auf den
+    unveränderten reportlab-Canvas zurück (nicht zusammen mit PDF_TRACE).
+
+    Mit chunk_pages kommt ein pdf_stream.StreamingCanvas, der fertige Seiten in Blöcken
+    dieser Größe auf die Platte schreibt statt sie bis save() zu sammeln (für sehr große
+    Blätter; ohne Tracing).
+    """
+    kwargs.setdefault('pagesize', A4)
+    kwargs.setdefault('invariant', 1)
+    if chunk_pages:
+        return StreamingCanvas(path, chunk_pages=chunk_pages, **kwargs)
+    trace_dir = os.environ.get('PDF_TRACE')
+    if not trace_dir:
+        plain = os.environ.get('PDF_PLAIN_CANVAS') == '1'
+        return (canvas.Canvas if plain else CompactCanvas)(path, **kwargs)
+    from render_trace import TracingCanvas  # erst hier: Tracing ist opt-in, render_trace importiert pdf_output
+    name = os.path.basename(trace_name or path)
+    return TracingCanvas(path, os.path.join(trace_dir, name + '.trace.json'), name=name,
+                         malloc=os.environ.get('PDF_TRACE_MALLOC') == '1', **kwargs)
+
+
+@contextmanager
+def trace_phase(c, name):
+    """Markiert eine Renderphase (cover, problems, solutions); ohne Tracing ein reiner Durchlauf."""
+    trace = getattr(c, 'trace', None)
+    if trace is None:
+        yield
+    else:
+        with trace.phase(name):
+            yield
+
+
+def draw_pages(c, pages, jobs=None):
+    """
+    Zeichnet die Seiten eines Blatts - (Phase, Zeichenfunktion, Argumente nach c), siehe
+    pages() in den gen_pdf-Skripten - nacheinander auf c; aufeinanderfolgende Seiten
+    derselben Phase laufen in einem trace_phase-Block. Liefert die Seitenzahl.
+    Mit jobs > 1 rendern Worker-Prozesse die Seiten (parallel_pages.render_parallel).
+    """
+    if jobs and jobs > 1:
+        return render_parallel(c, pages, jobs)
+    count = 0
+    for phase, group in itertools.groupby(pages, key=itemgetter(0)):
+        with trace_phase(c, phase):
+            for _, draw, args in group:
+                draw(c, *args)
+                count += 1
+    return count
+
+
+def write_previews(path, pdf, svgs):
+    """
+    Schreibt die SVG-Vorschauen eines Blatts als JSON für die Web-App: Eintrag i ist die
+    Skizze von Aufgabe i + 1, gesammelt über c.previews beim Rendern des PDFs (siehe
+    triangle_draw.draw_triangle) - Web und Druck zeigen also dasselbe Dreieck.
+    """
+    with atomic_output(path) as tmp:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(dict(pdf=os.path.basename(pdf), triangles=svgs), f, ensure_ascii=False, indent=1)
+            f.write('\n')
@@ -0,0 +1,208 @@
+"""Streamende PDF-Ausgabe für sehr große Arbeitsblätter (z.B. ein Prüfungspool mit 5000 Seiten).
+
+reportlab hält jede fertige Seite als Objekt im Dokument, bis c.save() alles auf einmal
+schreibt - der Speicher wächst also mit der Seitenzahl. StreamingCanvas schreibt dagegen
+jede fertige Seite (und jedes Form-XObject) sofort als PDF-Objekt in einen Puffer, der
+alle chunk_pages Seiten auf die Platte geleert wird. Im Speicher bleiben nur die
+Byte-Offsets für die xref-Tabelle; Seitenbaum, Schriften, Ressourcen und Trailer werden
+bei save() ans Dateiende gehängt.
+
+Alle Seiten und Forms teilen sich ein Ressourcen-Dictionary (Schriften + Forms). Nicht
+unterstützt sind, was die Arbeitsblätter nicht brauchen: Bilder, Links/Annotationen,
+Lesezeichen, TrueType-Schriften und Schnittmarken. Ebenso fehlt getpdfdata(): das PDF steht
+nie komplett im Speicher.
+
+    c = new_canvas(tmp, chunk_pages=64)   # siehe pdf_output.new_canvas
+
+Dieselbe Schicht sammelt in parallel_pages die Seiten der Worker ein (PageCollector
+statt ChunkedPDFWriter).
+"""
+import hashlib
+import zlib
+from array import array
+
+from reportlab.lib.rl_accel import fp_str
+from reportlab.pdfgen import canvas
+
+from compact_canvas import CompactCanvas
+
+CHUNK_PAGES = 64
+HEADER = b'%PDF-1.4\n%\x93\x8c\x8b\x9e ReportLab Generated PDF document\n'
+# feste Objektnummern; Info und alles Weitere wird fortlaufend vergeben
+CATALOG, PAGES, RESOURCES = 1, 2, 3
+
+
+def encode_stream(content, compress):
+    """Kodiert einen Content-Stream; liefert (zusätzliche Dictionary-Einträge, Bytes)."""
+    data = content.encode('utf8')
+    if compress:
+        return b' /Filter [ /FlateDecode ]', zlib.compress(data)
+    return b'', data
+
+
+class ChunkedPDFWriter:
+    """Schreibt PDF-Objekte fortlaufend in eine Datei und merkt sich nur deren Offsets."""
+
+    def __init__(self, path, chunk_pages=CHUNK_PAGES):
+        self.path = path
+        self.chunk_pages = chunk_pages
+        self.file = None
+        self.buffer = []
+        self.buffered_pages = 0
+        self.position = 0
+        self.digest = hashlib.md5()
+        # offsets[n] = Byte-Position von Objekt n (Index 0 ist der freie Eintrag der xref)
+        self.offsets = array('Q', [0] * (RESOURCES + 1))
+        self.kids = array('L')
+        self.forms = {}
+        self._append(HEADER)
+
+    def _append(self, data):
+        self.buffer.append(data)
+        self.digest.update(data)
+        self.position += len(data)
+
+    def reserve(self):
+        self.offsets.append(0)
+        return len(self.offsets) - 1
+
+    def add_object(self, number, body):
+        self.offsets[number] = self.position
+        self._append(b'%d 0 obj\n%s\nendobj\n' % (number, body))
+
+    def add_stream(self, number, entries, encoded):
+        filters, data = encoded
+        self.add_object(number, b'<< %s%s /Length %d >>\nstream\n%s\nendstream'
+                        % (entries, filters, len(data), data))
+
+    def add_page(self, content, width, height, compress):
+        self.add_encoded_page(encode_stream(content, compress), width, height)
+
+    def add_encoded_page(self, encoded, width, height):
+        contents, page = self.reserve(), self.reserve()
+        self.add_stream(contents, b'', encoded)
+        self.add_object(page, b'<< /Contents %d 0 R /MediaBox [ 0 0 %s ] /Parent %d 0 R /Resources %d 0 R '
+                              b'/Rotate 0 /Trans << >> /Type /Page >>'
+                        % (contents, fp_str(width, height).encode('ascii'), PAGES, RESOURCES))
+        self.kids.append(page)
+        self.buffered_pages += 1
+        if self.buffered_pages >= self.chunk_pages:
+            self.flush()
+
+    def add_form(self, internal_name, content, bbox, compress):
+        self.add_encoded_form(internal_name, encode_stream(content, compress), bbox)
+
+    def add_encoded_form(self, internal_name, encoded, bbox):
+        number = self.forms[internal_name] = self.reserve()
+        self.add_stream(number, b'/BBox [ %s ] /FormType 1 /Matrix [ 1 0 0 1 0 0 ] /Resources %d 0 R '
+                                b'/Subtype /Form /Type /XObject' % (fp_str(*bbox).encode('ascii'), RESOURCES),
+                        encoded)
+
+    def flush(self):
+        """Leert den Puffer (einen Chunk fertiger Seiten) in die Datei."""
+        if self.file is None:
+            self.file = open(self.path, 'wb')
+        self.file.write(b''.join(self.buffer))
+        self.buffer = []
+        self.buffered_pages = 0
+
+    def close(self, fonts, info):
+        """Hängt Ressourcen, Seitenbaum, Katalog, Info, xref und Trailer an und schließt die Datei.
+        fonts: interner Name -> formatiertes Schrift-Dictionary, info: formatiertes Info-Dictionary."""
+        font_refs = []
+        for internal_name in sorted(fonts):
+            number = self.reserve()
+            self.add_object(number, fonts[internal_name])
+            font_refs.append(b'/%s %d 0 R' % (internal_name.encode('ascii'), number))
+        forms = b' '.join(b'/%s %d 0 R' % (name.encode('ascii'), number) for name, number in self.forms.items())
+        self.add_object(RESOURCES, b'<< /Font << %s >> /ProcSet [ /PDF /Text /ImageB /ImageC /ImageI ] '
+                                   b'/XObject << %s >> >>' % (b' '.join(font_refs), forms))
+        kids = b' '.join(b'%d 0 R' % n for n in self.kids)
+        self.add_object(PAGES, b'<< /Count %d /Kids [ %s ] /Type /Pages >>' % (len(self.kids), kids))
+        self.add_object(CATALOG, b'<< /PageMode /UseNone /Pages %d 0 R /Type /Catalog >>' % PAGES)
+        info_number = self.reserve()
+        self.add_object(info_number, info)
+
+        xref_at = self.position
+        entries = [b'xref\n0 %d\n0000000000 65535 f\r\n' % len(self.offsets)]
+        entries.extend(b'%010d 00000 n\r\n' % offset for offset in self.offsets[1:])
+        self._append(b''.join(entries))
+        # die ID hängt nur vom Inhalt ab - gleiche Seiten ergeben dieselbe Datei
+        file_id = self.digest.hexdigest().encode('ascii')
+        self._append(b'trailer\n<< /ID [ <%s> <%s> ] /Info %d 0 R /Root %d 0 R /Size %d >>\nstartxref\n%d\n%%%%EOF\n'
+                     % (file_id, file_id, info_number, CATALOG, len(self.offsets), xref_at))
+        self.flush()
+        self.file.close()
+        self.file = None
+
+
+class PageCollector:
+    """
+    Writer-Ersatz für Worker-Prozesse (parallel_pages): sammelt kodierte Seiten
+    (encoded, width, height) und Forms (name -> (encoded, bbox)), statt sie zu schreiben.
+    """
+
+    def __init__(self):
+        self.pages = []
+        self.forms = {}
+
+    def add_page(self, content, width, height, compress):
+        self.pages.append((encode_stream(content, compress), width, height))
+
+    def add_form(self, internal_name, content, bbox, compress):
+        self.forms[internal_name] = (encode_stream(content, compress), bbox)
+
+    def close(self, fonts, info):
+        pass
+
+
+class ChunkedOutput(canvas.Canvas):
+    """
+    Ersetzt die Seiten- und Form-Ablage von reportlab durch einen ChunkedPDFWriter.
+    Sitzt in der MRO direkt über canvas.Canvas, damit Zwischenschichten wie
+    CompactCanvas unverändert davor laufen.
+    """
+
+    def __init__(self, filename, *args, chunk_pages=CHUNK_PAGES, writer=None, **kwargs):
+        super().__init__(filename, *args, **kwargs)
+        self._writer = ChunkedPDFWriter(filename, chunk_pages) if writer is None else writer
+
+    def _compress(self):
+        return bool(self._pageCompression)
+
+    def showPage(self):
+        if self._cropMarks or self._annotationrefs:
+            raise ValueError('Streamende Ausgabe unterstützt keine Schnittmarken oder Annotationen')
+        code = [self._preamble] + self._code + [' ']
+        self._writer.add_page('\n'.join(code) + '\n', self._pagesize[0], self._pagesize[1], self._compress())
+        if self._onPage:
+            self._onPage(self._pageNumber)
+        self._startPage()
+
+    def endForm(self, **extra_attributes):
+        name, lowerx, lowery, upperx, uppery = self._formData
+        width, height = self._pagesize
+        bbox = (lowerx, lowery, width if upperx is None else upperx, height if uppery is None else uppery)
+        self._writer.add_form(self._doc.getXObjectName(name), '\n'.join([self._preamble] + self._code) + '\n',
+                              bbox, self._compress())
+        self._doc.inObject = None
+        self._restartAccumulators()
+        self.pop_state_stack()
+
+    def hasForm(self, name):
+        return self._doc.getXObjectName(name) in self._writer.forms
+
+    def save(self):
+        if len(self._code):
+            self.showPage()
+        doc = self._doc
+        fonts = {name: font.format(doc) for name, font in doc.idToObject['BasicFonts'].dict.items()}
+        self._writer.close(fonts, doc.info.format(doc))
+
+    def getpdfdata(self):
+        # reportlabs Fassung würde aus dem leeren Dokument ein PDF ohne Seiten bauen
+        raise RuntimeError('Streamende Ausgabe hat kein PDF im Speicher - die Seiten stehen schon in der Datei')
+
+
+class StreamingCanvas(CompactCanvas, ChunkedOutput):
+    """CompactCanvas mit streamender Ausgabe (siehe Moduldoku); getpdfdata() gibt es nicht."""
@@ -0,0 +1,147 @@
+"""Reproduzierbare Zufallsaufgaben für die Arbeitsblätter Streckenlänge (gen_pdf3)
+und Winkel berechnen (gen_pdf4).
+
+Die erzeugten dicts haben dasselbe Format wie die handgeschriebenen PROBLEMS und
+können direkt an compute_triangle / draw_problem_page / main(problems=...) gehen.
+
+    python problem_gen.py strecken --seed 7 --count 40 --out strecken-7.pdf
+    python problem_gen.py winkel --seed 7 --count 40 --out winkel-7.pdf
+    python problem_gen.py winkel --count 10000 --chunk-pages 64 --out pool.pdf   # streamend
+    python problem_gen.py winkel --count 2000 --jobs 8 --out pool.pdf           # Seiten parallel
+"""
+import argparse
+import importlib
+import math
+import random
+
+VERTICES = ('A', 'B', 'C')
+# alle Kombinationen (rechter Winkel, Bezugswinkel)
+VERTEX_PAIRS = tuple((r, m) for r in VERTICES for m in VERTICES if r != m)
+# (gegebene Rolle, gesuchte Rolle) für Streckenlänge
+ROLE_PAIRS = (('hyp', 'opp'), ('opp', 'hyp'), ('hyp', 'adj'),
+              ('adj', 'hyp'), ('adj', 'opp'), ('opp', 'adj'))
+# "schöne" gegebene Werte in cm
+NICE_VALUES = tuple(float(v) for v in range(3, 16))
+# beim Winkel-Blatt sind beide Seiten gegeben - halbe Zentimeter erlauben (wie 9.5 in PROBLEMS)
+WINKEL_VALUES = tuple(v / 2 for v in range(4, 51))
+WINKEL_MODES = ('tan', 'cos')
+
+
+def _cycle(rnd, items):
+    """Endlose, blockweise gemischte Wiederholung - jede Variante kommt gleich oft dran."""
+    items = list(items)
+    while True:
+        rnd.shuffle(items)
+        yield from items
+
+
+def _check_count(count, capacity):
+    if count > capacity:
+        raise ValueError(f'{count} Aufgaben angefordert, mit diesen Vorgaben gibt es nur {capacity} verschiedene')
+
+
+def _draw_unique(count, capacity, seen, make, max_attempts):
+    """Ruft make() auf, bis count neue Schlüssel gefunden sind (set als Hash-Index, O(1) je Prüfung)."""
+    problems = []
+    attempts = 0
+    while len(problems) < count:
+        key, problem = make()
+        attempts += 1
+        if key is not None and key not in seen:
+            seen.add(key)
+            problems.append(problem)
+        elif attempts > max_attempts:
+            raise ValueError(f'Nach {attempts} Versuchen nur {len(problems)} von {count} eindeutigen Aufgaben '
+                             f'gefunden (höchstens {capacity} möglich) - Vorgaben lockern')
+    return problems
+
+
+def generate_strecken(seed, count, angle_range=(20, 70), values=NICE_VALUES,
+                      role_pairs=ROLE_PAIRS, vertex_pairs=VERTEX_PAIRS, seen=None):
+    """
+    Aufgaben für gen_pdf3_strecken: ganzzahlige Winkel aus angle_range (inklusive),
+    gegebener Wert aus values. role_pairs und vertex_pairs werden reihum (gemischt)
+    verwendet, damit Rollen-Mix und Ecken gleichmäßig abgedeckt sind; Mehrfachnennungen
+    in role_pairs gewichten. seen kann ein gemeinsames set über mehrere Aufrufe sein.
+    """
+    rnd = random.Random(seed)
+    angles = range(angle_range[0], angle_range[1] + 1)
+    capacity = len(angles) * len(values) * len(set(role_pairs)) * len(set(vertex_pairs))
+    _check_count(count, capacity)
+    roles_iter, vertex_iter = _cycle(rnd, role_pairs), _cycle(rnd, vertex_pairs)
+    seen = set() if seen is None else seen
+
+    def make():
+        right, marked = next(vertex_iter)
+        given_role, target_role = next(roles_iter)
+        angle = rnd.choice(angles)
+        value = rnd.choice(values)
+        key = (right, marked, angle, given_role, value, target_role)
+        return key, dict(right=right, marked=marked, angle=angle, given_role=given_role,
+                         given_value=value, target_role=target_role)
+
+    return _draw_unique(count, capacity, seen, make, max_attempts=count * 50 + 1000)
+
+
+def generate_winkel(seed, count, angle_range=(15, 75), values=WINKEL_VALUES,
+                    modes=WINKEL_MODES, vertex_pairs=VERTEX_PAIRS, seen=None):
+    """
+    Aufgaben für gen_pdf4_winkel: mode 'tan' gibt beide Katheten (opp, adj), mode 'cos'
+    Ankathete und Hypotenuse (adj, hyp). Die Werte kommen aus values; Kombinationen,
+    deren Winkel außerhalb von angle_range liegt, werden verworfen.
+    """
+    rnd = random.Random(seed)
+    lo, hi = angle_range
+    # gültige Wertepaare je Modus einmal vorab bestimmen, dann nur noch daraus ziehen
+    valid = {
+        'tan': [(o, a) for o in values for a in values if lo <= math.degrees(math.atan2(o, a)) <= hi],
+        'cos': [(a, h) for a in values for h in values if a < h and lo <= math.degrees(math.acos(a / h)) <= hi],
+    }
+    modes = [m for m in modes if valid[m]]
+    if not modes:
+        raise ValueError('Keine Wertepaare liefern einen Winkel im gewünschten Bereich')
+    capacity = sum(len(valid[m]) for m in set(modes)) * len(set(vertex_pairs))
+    _check_count(count, capacity)
+    mode_iter, vertex_iter = _cycle(rnd, modes), _cycle(rnd, vertex_pairs)
+    seen = set() if seen is None else seen
+
+    def make():
+        right, marked = next(vertex_iter)
+        mode = next(mode_iter)
+        v1, v2 = rnd.choice(valid[mode])
+        key = (right, marked, mode, v1, v2)
+        if mode == 'tan':
+            return key, dict(right=right, marked=marked, mode='tan', opp=v1, adj=v2)
+        return key, dict(right=right, marked=marked, mode='cos', adj=v1, hyp=v2)
+
+    return _draw_unique(count, capacity, seen, make, max_attempts=count * 50 + 1000)
+
+
+GENERATORS = {
+    'strecken': ('gen_pdf3_strecken', generate_strecken),
+    'winkel': ('gen_pdf4_winkel', generate_winkel),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Zufällige Aufgaben erzeugen und als PDF rendern.')
+    parser.add_argument('sheet', choices=sorted(GENERATORS))
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--count', type=int, default=8)
+    parser.add_argument('--out', required=True, help='Ziel-PDF')
+    parser.add_argument('--chunk-pages', type=int, default=None,
+                        help='Seiten blockweise auf die Platte schreiben (pdf_stream, für sehr große Blätter)')
+    parser.add_argument('--previews', metavar='JSON',
+                        help='SVG-Vorschauen der Skizzen für die Web-App zusätzlich als JSON schreiben')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Seiten mit so vielen Worker-Prozessen rendern (parallel_pages)')
+    args = parser.parse_args(argv)
+
+    module_name, generate = GENERATORS[args.sheet]
+    problems = generate(args.seed, args.count)
+    importlib.import_module(module_name).main(out=args.out, problems=problems, chunk_pages=args.chunk_pages,
+                                                   jobs=args.jobs, previews=args.previews)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Planungsstufe für die Arbeitsblätter: jede Aufgabe wird genau einmal aufgelöst.
+
+Die Generatoren übersetzen ihre PROBLEMS-dicts vorab in ResolvedProblem-Datensätze
+(Seiten, Rollen, Werte, alle Anzeigetexte und die Lösungszeilen). Aufgabenseiten und
+Lösungsseiten lesen danach nur noch diese Datensätze - Trigonometrie, Seitenzuordnung
+und das Zusammenbauen der Texte laufen nicht doppelt.
+"""
+from types import MappingProxyType
+
+from triangle_draw import ANGLE_AT, GREEK
+
+VERTICES = ('A', 'B', 'C')
+SIDE_OPPOSITE = {'A': 'a', 'B': 'b', 'C': 'c'}
+
+# 3x3-Tabellen über (rechter Winkel, Bezugswinkel); die Diagonale gibt es nicht.
+# ROLE_SIDES[(right, marked)] -> {'hyp': .., 'opp': .., 'adj': ..} (Seitenbuchstaben)
+ROLE_SIDES = {}
+# THIRD_VERTEX[(right, marked)] -> die verbleibende Ecke
+THIRD_VERTEX = {}
+for _right in VERTICES:
+    for _marked in VERTICES:
+        if _right == _marked:
+            continue
+        _hyp, _opp = SIDE_OPPOSITE[_right], SIDE_OPPOSITE[_marked]
+        _adj = next(s for s in ('a', 'b', 'c') if s not in (_hyp, _opp))
+        ROLE_SIDES[(_right, _marked)] = {'hyp': _hyp, 'opp': _opp, 'adj': _adj}
+        THIRD_VERTEX[(_right, _marked)] = next(v for v in VERTICES if v not in (_right, _marked))
+
+
+def angle_keys(right, marked):
+    """(Schlüssel des Bezugswinkels, Schlüssel des anderen spitzen Winkels, Schlüssel des rechten Winkels)."""
+    return ANGLE_AT[marked], ANGLE_AT[THIRD_VERTEX[(right, marked)]], ANGLE_AT[right]
+
+
+def symbol(vertex):
+    """Griechischer Buchstabe des Winkels an einer Ecke."""
+    return GREEK[ANGLE_AT[vertex]]
+
+
+def _restore(values):
+    record = object.__new__(ResolvedProblem)
+    for name, value in zip(ResolvedProblem.__slots__, values):
+        object.__setattr__(record, name, MappingProxyType(value) if name in ResolvedProblem.MAPPINGS else value)
+    return record
+
+
+class ResolvedProblem:
+    """
+    Unveränderlicher, fertig aufgelöster Datensatz einer Aufgabe.
+
+    idx: Aufgabennummer (ab 1), right/marked: Ecken, flip: Spiegelung der Skizze,
+    sides: Rolle -> Seitenbuchstabe, leg_lengths/side_display/angle_display: Argumente
+    für draw_triangle, prompt: Zeilen (dy, text) unter der Skizze, relativ zur Box-Unterkante,
+    solution: Zeilen-Tupel für text_flow (ein Eintrag der Lösungsseiten).
+
+    Die dict-Felder (MAPPINGS) werden kopiert und nur lesend (MappingProxyType) abgelegt,
+    prompt und solution als Tupel - so kann kein Leser die gemeinsamen Tabellen wie
+    ROLE_SIDES oder die LEG_LENGTHS der Generatoren verändern.
+    """
+    __slots__ = ('idx', 'right', 'marked', 'flip', 'sides', 'leg_lengths',
+                 'side_display', 'angle_display', 'prompt', 'solution')
+    MAPPINGS = frozenset(('sides', 'leg_lengths', 'side_display', 'angle_display'))
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            value = fields.pop(name)
+            if name in self.MAPPINGS:
+                value = MappingProxyType(dict(value))
+            elif name in ('prompt', 'solution'):
+                value = tuple(value)
+            object.__setattr__(self, name, value)
+        if fields:
+            raise TypeError(f'Unbekannte Felder: {sorted(fields)}')
+
+    def __setattr__(self, name, value):
+        raise AttributeError('ResolvedProblem ist unveränderlich')
+
+    def __delattr__(self, name):
+        raise AttributeError('ResolvedProblem ist unveränderlich')
+
+    def __reduce__(self):
+        # für multiprocessing: Slots ohne __setattr__ wiederherstellen; MappingProxyType
+        # lässt sich nicht picklen, die Kopie als dict schon
+        return _restore, (tuple(dict(getattr(self, name)) if name in self.MAPPINGS else getattr(self, name)
+                                for name in self.__slots__),)
+
+    def __repr__(self):
+        return f'ResolvedProblem(idx={self.idx}, right={self.right!r}, marked={self.marked!r})'
+
+
+def plan(problems, resolve):
+    """Löst alle Aufgaben mit resolve(problem, idx) auf; liefert ein Tupel von ResolvedProblem."""
+    return tuple(resolve(problem, idx) for idx, problem in enumerate(problems, 1))
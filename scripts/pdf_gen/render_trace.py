@@ -0,0 +1,253 @@
+"""Opt-in Tracing für die PDF-Generatoren: wohin gehen Renderzeit und Content-Stream-Bytes?
+
+Eingeschaltet über die Umgebungsvariable PDF_TRACE=<ordner> (oder build_all.py --trace
+<ordner>); pdf_output.new_canvas liefert dann einen TracingCanvas, der beim Speichern
+<ordner>/<pdf-name>.trace.json schreibt. PDF_TRACE_MALLOC=1 (--trace-malloc) nimmt
+zusätzlich pro Phase tracemalloc-Snapshots auf.
+
+Gezählt wird pro Seite, pro draw_triangle-Aufruf und pro Phase (cover, problems,
+solutions - siehe pdf_output.trace_phase in den build-Funktionen):
+  - Zustandswechsel: setFont, setFillColorRGB, setStrokeColorRGB, setLineWidth
+  - Pfad-Operationen: drawPath, line, rect, circle, arc, ...
+  - Textobjekte: drawString, drawCentredString, drawRightString, drawText
+  - Bytes im Content-Stream
+
+Zwei Traces vergleichen:
+    python render_trace.py diff alt.trace.json neu.trace.json
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from compact_canvas import CompactCanvas
+from pdf_output import atomic_output
+
+STATE_METHODS = ('setFont', 'setFillColorRGB', 'setStrokeColorRGB', 'setLineWidth')
+PATH_METHODS = ('drawPath', 'line', 'lines', 'rect', 'roundRect', 'circle', 'ellipse', 'arc', 'wedge', 'bezier')
+TEXT_METHODS = ('drawString', 'drawCentredString', 'drawRightString', 'drawText')
+# Anzahl der Allokationsstellen, die pro Phase aus dem tracemalloc-Vergleich übernommen werden
+MALLOC_TOP = 5
+
+
+def new_counts():
+    return dict(state_changes={name: 0 for name in STATE_METHODS}, path_ops=0, text_objects=0, forms=0,
+                stream_bytes=0)
+
+
+def _stream_bytes(code, start=0):
+    # reportlab fügt die Einträge von _code mit '\n' zusammen
+    return sum(len(entry) + 1 for entry in code[start:])
+
+
+class TracingCanvas(CompactCanvas):
+    """
+    CompactCanvas, der seine Aufrufe mitzählt. Verschachtelte Aufrufe (circle -> ellipse ->
+    drawPath) zählen nur einmal. Gezählt werden die Aufrufe, nicht die geschriebenen
+    Operatoren; gesammelte Texte schreibt der CompactCanvas erst an der nächsten Barriere,
+    ihre Bytes landen also bei Seite und Phase, aber nicht zwingend beim Dreieck.
+    """
+
+    def __init__(self, filename, trace_path, name=None, malloc=False, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.trace = Trace(self, trace_path, name or filename, malloc)
+
+    def showPage(self):
+        self.flush_text()
+        self.trace.end_page()
+        super().showPage()
+        self.trace.start_page()
+
+    def save(self):
+        super().save()
+        self.trace.write()
+
+
+def _counting(name, kind):
+    method = getattr(CompactCanvas, name)
+
+    def wrapper(self, *args, **kwargs):
+        trace = self.trace
+        if trace.depth:
+            return method(self, *args, **kwargs)
+        trace.depth += 1
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            trace.depth -= 1
+            trace.count(kind, name)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+for _name in STATE_METHODS:
+    setattr(TracingCanvas, _name, _counting(_name, 'state'))
+for _name in PATH_METHODS:
+    setattr(TracingCanvas, _name, _counting(_name, 'path'))
+for _name in TEXT_METHODS:
+    setattr(TracingCanvas, _name, _counting(_name, 'text'))
+TracingCanvas.doForm = _counting('doForm', 'form')
+
+
+class Trace:
+    """Sammelt die Zähler eines TracingCanvas und schreibt sie als JSON."""
+
+    def __init__(self, c, path, name, malloc=False):
+        self.c = c
+        self.path = path
+        self.name = name
+        self.malloc = malloc
+        self.depth = 0
+        self.pages, self.triangles, self.phases = [], [], []
+        # laufende Zähler: aktuelle Seite, Phase und draw_triangle-Aufruf
+        self.page = self.phase_counts = self.triangle_counts = None
+        self.phase_name = None
+        self.started = time.perf_counter()
+        if malloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.start_page()
+
+    def count(self, kind, name):
+        for counts in (self.page, self.phase_counts, self.triangle_counts):
+            if counts is None:
+                continue
+            if kind == 'state':
+                counts['state_changes'][name] += 1
+            elif kind == 'path':
+                counts['path_ops'] += 1
+            elif kind == 'text':
+                counts['text_objects'] += 1
+            else:
+                counts['forms'] += 1
+
+    def start_page(self):
+        self.page = new_counts()
+        self.page_triangles = 0
+        self.page_started = time.perf_counter()
+
+    def end_page(self):
+        self.page['stream_bytes'] = _stream_bytes(self.c._code)
+        if self.phase_counts is not None:
+            self.phase_counts['stream_bytes'] += self.page['stream_bytes']
+        self.pages.append(dict(page=self.c.getPageNumber(), phase=self.phase_name, triangles=self.page_triangles,
+                               seconds=round(time.perf_counter() - self.page_started, 6), **self.page))
+
+    @contextmanager
+    def triangle(self):
+        """Misst einen draw_triangle-Aufruf (Aufruf aus triangle_draw)."""
+        counts = self.triangle_counts = new_counts()
+        code_start = len(self.c._code)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.triangle_counts = None
+            counts['stream_bytes'] = _stream_bytes(self.c._code, code_start)
+            self.page_triangles += 1
+            self.triangles.append(dict(page=self.c.getPageNumber(), phase=self.phase_name,
+                                       seconds=round(seconds, 6), **counts))
+
+    @contextmanager
+    def phase(self, name):
+        """Misst eine Renderphase (Aufruf über pdf_output.trace_phase)."""
+        counts = self.phase_counts = new_counts()
+        first_page = self.c.getPageNumber()
+        snapshot = None
+        if self.malloc:
+            tracemalloc.reset_peak()
+            snapshot = tracemalloc.take_snapshot()
+        self.phase_name = name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.phase_counts = self.phase_name = None
+            record = dict(name=name, seconds=round(seconds, 6), first_page=first_page,
+                          pages=self.c.getPageNumber() - first_page, **counts)
+            if snapshot is not None:
+                current, peak = tracemalloc.get_traced_memory()
+                top = tracemalloc.take_snapshot().compare_to(snapshot, 'lineno')[:MALLOC_TOP]
+                record['malloc'] = dict(current=current, peak=peak, top=[
+                    dict(where=str(stat.traceback), size_diff=stat.size_diff, count_diff=stat.count_diff)
+                    for stat in top])
+            self.phases.append(record)
+
+    def totals(self):
+        totals = new_counts()
+        for page in self.pages:
+            for name in STATE_METHODS:
+                totals['state_changes'][name] += page['state_changes'][name]
+            for key in ('path_ops', 'text_objects', 'forms', 'stream_bytes'):
+                totals[key] += page[key]
+        totals.update(pages=len(self.pages), triangles=len(self.triangles),
+                      seconds=round(time.perf_counter() - self.started, 6))
+        return totals
+
+    def write(self):
+        data = dict(file=self.name, totals=self.totals(), phases=self.phases, pages=self.pages,
+                    triangles=self.triangles)
+        with atomic_output(self.path) as tmp:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=1)
+                f.write('\n')
+
+
+def summary(data):
+    """Flache Kennzahlen eines Traces (für Vergleiche, z.B. im Benchmark)."""
+    totals = data['totals']
+    flat = {f'total.{k}': v for k, v in totals.items() if k != 'state_changes'}
+    flat.update({f'total.state_changes.{k}': v for k, v in totals['state_changes'].items()})
+    for ph in data['phases']:
+        flat[f"phase.{ph['name']}.seconds"] = ph['seconds']
+        flat[f"phase.{ph['name']}.stream_bytes"] = ph['stream_bytes']
+    triangles = data['triangles']
+    if triangles:
+        n = len(triangles)
+        flat['triangle.seconds'] = round(sum(t['seconds'] for t in triangles) / n, 6)
+        flat['triangle.stream_bytes'] = round(sum(t['stream_bytes'] for t in triangles) / n, 1)
+        flat['triangle.path_ops'] = round(sum(t['path_ops'] for t in triangles) / n, 2)
+        flat['triangle.text_objects'] = round(sum(t['text_objects'] for t in triangles) / n, 2)
+        flat['triangle.state_changes'] = round(sum(sum(t['state_changes'].values()) for t in triangles) / n, 2)
+    return flat
+
+
+def diff(old, new):
+    """Liste (kennzahl, alt, neu) für alle Kennzahlen, die sich unterscheiden."""
+    a, b = summary(old), summary(new)
+    return [(key, a.get(key), b.get(key)) for key in sorted(set(a) | set(b)) if a.get(key) != b.get(key)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render-Traces auswerten.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    show = sub.add_parser('show', help='Kennzahlen eines Traces ausgeben')
+    show.add_argument('trace')
+    cmp_ = sub.add_parser('diff', help='zwei Traces vergleichen')
+    cmp_.add_argument('old')
+    cmp_.add_argument('new')
+    args = parser.parse_args(argv)
+
+    def load(path):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    if args.command == 'show':
+        for key, value in summary(load(args.trace)).items():
+            print(f'{key:<40} {value}')
+        return 0
+    for key, before, after in diff(load(args.old), load(args.new)):
+        change = ''
+        if isinstance(before, (int, float)) and isinstance(after, (int, float)) and before:
+            change = f'  ({(after / before - 1) * 100:+.1f}%)'
+        print(f'{key:<40} {before} -> {after}{change}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""Individuelle Arbeitsblätter für eine ganze Klassenliste (ein PDF pro Schüler:in).
+
+Die Klassenliste ist eine CSV-Datei mit Spalte `name` und optional `seed`. Fehlt der
+Seed, wird er stabil aus Name und --seed abgeleitet, dieselbe Liste liefert also
+immer dieselben Aufgaben. Jedes PDF enthält die eigenen Lösungen.
+
+    python roster_batch.py klasse-9a.csv --sheet winkel --count 12 --out-dir ausgabe/
+
+Die Liste wird in Shards auf Worker-Prozesse verteilt. Jedes PDF wird sofort nach dem
+Rendern geschrieben und verworfen, der Speicherbedarf hängt also nicht von der Länge
+der Liste ab. Am Ende steht eine Zusammenfassung (Seiten/s, Spitzen-RSS) in
+<out-dir>/summary.json.
+"""
+import argparse
+import csv
+import hashlib
+import importlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pdf_output import atomic_output, new_canvas
+from problem_gen import GENERATORS
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+UMLAUTS = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss', 'Ä': 'Ae', 'Ö': 'Oe', 'Ü': 'Ue'})
+
+
+def read_roster(path, base_seed=0):
+    """Liest die Klassenliste; liefert Liste von (laufende Nummer, Name, Seed)."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        rows = []
+        for row in csv.DictReader(f):
+            name = (row.get('name') or '').strip()
+            if not name:
+                continue
+            seed = (row.get('seed') or '').strip()
+            if seed:
+                seed = int(seed)
+            else:
+                digest = hashlib.sha256(f'{base_seed}:{name}'.encode('utf-8')).hexdigest()
+                seed = int(digest[:12], 16)
+            rows.append((len(rows) + 1, name, seed))
+    return rows
+
+
+def slug(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.translate(UMLAUTS).lower()).strip('-') or 'schueler'
+
+
+def peak_rss_mb():
+    """Spitzen-RSS des eigenen Prozesses in MB, None ohne resource-Modul."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    # Linux liefert KB, macOS Bytes
+    return round(usage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def render_shard(sheet, count, out_dir, shard):
+    """Worker: rendert die Schüler:innen eines Shards nacheinander, jedes PDF wird sofort geschrieben."""
+    module_name, generate = GENERATORS[sheet]
+    module = importlib.import_module(module_name)
+    pages = 0
+    for number, name, seed in shard:
+        problems = generate(seed, count)
+        out = os.path.join(out_dir, f'{sheet}-{number:03d}-{slug(name)}.pdf')
+        with atomic_output(out) as tmp:
+            c = new_canvas(tmp, trace_name=out)
+            c.setTitle(f'{name} - {sheet} (Seed {seed})')
+            pages += module.build(c, problems, student=name)
+            c.save()
+    return len(shard), pages, peak_rss_mb()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Ein individuelles Arbeitsblatt pro Schüler:in erzeugen.')
+    parser.add_argument('roster', help='CSV mit Spalte name (optional seed)')
+    parser.add_argument('--sheet', choices=sorted(GENERATORS), default='strecken')
+    parser.add_argument('--count', type=int, default=8, help='Aufgaben pro Blatt')
+    parser.add_argument('--seed', type=int, default=0, help='Basis für abgeleitete Seeds')
+    parser.add_argument('--out-dir', required=True)
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    roster = read_roster(args.roster, args.seed)
+    os.makedirs(args.out_dir, exist_ok=True)
+    jobs = max(1, min(args.jobs, len(roster)))
+    shards = [roster[i::jobs] for i in range(jobs)]
+
+    start = time.perf_counter()
+    students = pages = 0
+    worker_rss = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(render_shard, args.sheet, args.count, args.out_dir, shard) for shard in shards]
+        for future in futures:
+            done, shard_pages, rss = future.result()
+            students += done
+            pages += shard_pages
+            worker_rss.append(rss)
+    elapsed = time.perf_counter() - start
+
+    summary = dict(
+        sheet=args.sheet, students=students, pages=pages, jobs=jobs,
+        seconds=round(elapsed, 3), pages_per_second=round(pages / elapsed, 1) if elapsed else None,
+        peak_rss_mb_parent=peak_rss_mb(),
+        peak_rss_mb_worker=max((r for r in worker_rss if r is not None), default=None),
+    )
+    with atomic_output(os.path.join(args.out_dir, 'summary.json')) as tmp:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+    print(f"{students} PDFs, {pages} Seiten in {elapsed:.2f}s ({summary['pages_per_second']} Seiten/s, "
+          f"Spitzen-RSS Worker {summary['peak_rss_mb_worker']} MB)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
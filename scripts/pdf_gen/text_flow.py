@@ -0,0 +1,104 @@
+"""Fließtext für die Lösungsseiten: Glyphbreiten-Cache, Zeilenumbruch in linearer Zeit
+und automatischer Seitenumbruch.
+
+Eine Zeile ist ein Tupel (x, font, size, color, text, advance) - advance ist der
+Abstand bis zur nächsten Grundlinie. Ein Eintrag (z.B. die Lösung einer Aufgabe) ist
+eine Liste solcher Zeilen und wird nicht über zwei Seiten verteilt. paginate() verteilt
+die Einträge rein rechnerisch auf Seiten, draw_lines() zeichnet eine Seite davon; so
+steht die Seitenzahl schon vor dem Zeichnen fest.
+"""
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+_glyph_widths = {}
+
+
+def glyph_widths(font, size):
+    """Breiten-Cache (Zeichen -> Breite in Punkt) für eine Schrift/Größe, wird beim Messen befüllt."""
+    key = (font, size)
+    widths = _glyph_widths.get(key)
+    if widths is None:
+        widths = _glyph_widths[key] = {}
+    return widths
+
+
+def text_width(text, font, size):
+    """Wie stringWidth, aber jede Glyphe wird pro Schrift/Größe nur einmal gemessen."""
+    widths = glyph_widths(font, size)
+    total = 0.0
+    for ch in text:
+        w = widths.get(ch)
+        if w is None:
+            w = widths[ch] = stringWidth(ch, font, size)
+        total += w
+    return total
+
+
+def wrap(text, font, size, max_width):
+    """
+    Bricht text an Leerzeichen so um, dass jede Zeile höchstens max_width breit ist.
+    Leerzeichen innerhalb einer Zeile bleiben erhalten (z.B. '  →  '), an den
+    Umbruchstellen fallen sie weg. Über die Präfixsummen der Wortbreiten ist die Breite
+    jedes Zeilenkandidaten in O(1) bekannt - insgesamt linear in der Textlänge.
+    Ein einzelnes Wort, das allein zu breit ist, bekommt eine eigene Zeile.
+    """
+    words = text.strip(' ').split(' ')
+    if words == ['']:
+        return []
+    space = text_width(' ', font, size)
+    prefix = [0.0]
+    for word in words:
+        prefix.append(prefix[-1] + text_width(word, font, size))
+
+    lines = []
+    first = 0
+    for i in range(1, len(words)):
+        if not words[i]:
+            continue
+        # Breite der Wörter first..i inklusive Leerzeichen dazwischen
+        width = prefix[i + 1] - prefix[first] + space * (i - first)
+        if width > max_width:
+            lines.append(' '.join(words[first:i]).rstrip(' '))
+            first = i
+    lines.append(' '.join(words[first:]))
+    return lines
+
+
+def wrapped_lines(x, font, size, color, text, max_width, leading):
+    """Zeilen-Tupel für einen umbrochenen Absatz, jede Zeile mit Vorschub leading."""
+    return [(x, font, size, color, line, leading) for line in wrap(text, font, size, max_width)]
+
+
+def with_gap(lines, gap):
+    """Vergrößert den Vorschub nach der letzten Zeile um gap (Abstand zum nächsten Eintrag)."""
+    if lines:
+        lines[-1] = lines[-1][:5] + (lines[-1][5] + gap,)
+    return lines
+
+
+def paginate(entries, top, bottom):
+    """
+    Verteilt Einträge auf Seiten. Liefert eine Liste von Seiten, jede Seite eine Liste
+    von (y, zeile). Ein Eintrag wandert komplett auf die nächste Seite, wenn seine letzte
+    Grundlinie unter bottom läge; der Vorschub nach der letzten Zeile zählt dabei nicht mit.
+    """
+    pages = [[]]
+    y = top
+    for entry in entries:
+        if not entry:
+            continue
+        height = sum(line[5] for line in entry[:-1])
+        if y - height < bottom and pages[-1]:
+            pages.append([])
+            y = top
+        for line in entry:
+            pages[-1].append((y, line))
+            y -= line[5]
+    return pages
+
+
+def draw_lines(c, placed):
+    """Zeichnet eine von paginate() gelieferte Seite."""
+    for y, (x, font, size, color, text, _) in placed:
+        c.setFont(font, size)
+        c.setFillColorRGB(*color)
+        c.drawString(x, y, text)
@@ -0,0 +1,158 @@
+"""Zeichen-Backends für triangle_draw: dieselben Primitive (path, circle, arc, text) für
+einen reportlab-Canvas und für kompaktes Inline-SVG.
+
+Koordinaten sind immer PDF-Punkte mit y nach oben. SvgBackend bildet einen Ausschnitt
+(die Box eines Dreiecks) auf eine viewBox mit y nach unten ab; so zeigt die Web-App
+exakt das Dreieck aus dem PDF.
+
+    out = SvgBackend(box_x, box_y, box_w, box_h)
+    out.path([(0, 0), (40, 0), (0, 30)], BLACK, 1.3, closed=True)
+    html = out.svg()
+
+SvgBackend rundet auf precision Nachkommastellen und fasst gleich gestaltete, direkt
+aufeinanderfolgende Elemente zusammen (siehe Klassendoku).
+"""
+import math
+from xml.sax.saxutils import escape, quoteattr
+
+# reportlab-Schriftname -> CSS (Familie, Gewicht)
+SVG_FONTS = {
+    'Helvetica': ('Helvetica,Arial,sans-serif', None),
+    'Helvetica-Bold': ('Helvetica,Arial,sans-serif', 'bold'),
+}
+SVG_ANCHOR = {'left': None, 'centre': 'middle', 'right': 'end'}
+
+
+class ReportlabBackend:
+    """Zeichnet auf einen reportlab-Canvas; Zustand (Farbe, Breite, Schrift) wird pro Primitiv gesetzt."""
+
+    def __init__(self, c):
+        self.c = c
+
+    def path(self, points, color, width, closed=False):
+        c = self.c
+        c.setLineWidth(width)
+        c.setStrokeColorRGB(*color)
+        p = c.beginPath()
+        p.moveTo(*points[0])
+        for pt in points[1:]:
+            p.lineTo(*pt)
+        if closed:
+            p.close()
+        c.drawPath(p, stroke=1, fill=0)
+
+    def circle(self, x, y, r, color):
+        self.c.setFillColorRGB(*color)
+        self.c.circle(x, y, r, stroke=0, fill=1)
+
+    def arc(self, x, y, r, start, extent, color, width):
+        c = self.c
+        c.setStrokeColorRGB(*color)
+        c.setLineWidth(width)
+        c.arc(x - r, y - r, x + r, y + r, start, extent)
+
+    def text(self, x, y, text, font, size, color, align='left'):
+        c = self.c
+        c.setFont(font, size)
+        c.setFillColorRGB(*color)
+        if align == 'left':
+            c.drawString(x, y, text)
+        elif align == 'right':
+            c.drawRightString(x, y, text)
+        else:
+            c.drawCentredString(x, y, text)
+
+
+# Nachkommastellen der SVG-Koordinaten (SVG ist Bildschirm, kein Druck)
+SVG_PRECISION = 1
+
+
+def _num(v, precision=SVG_PRECISION):
+    """Zahl mit höchstens precision Nachkommastellen, ohne überflüssige Nullen und ohne '-0'."""
+    s = '%.*f' % (precision, v)
+    if '.' in s:
+        s = s.rstrip('0').rstrip('.')
+    return '0' if s == '-0' else s
+
+
+def _color(rgb):
+    return '#%02x%02x%02x' % tuple(round(v * 255) for v in rgb)
+
+
+class SvgBackend:
+    """
+    Sammelt die Primitive als SVG-Elemente für den Ausschnitt (x, y, width, height).
+    Aufeinanderfolgende Striche mit gleicher Farbe und Breite werden ein <path>,
+    aufeinanderfolgende Kreise bzw. Texte mit gleichen Attributen teilen sich ein <g>.
+    """
+
+    def __init__(self, x, y, width, height, precision=SVG_PRECISION):
+        self.x, self.top = x, y + height
+        self.width, self.height = width, height
+        self.precision = precision
+        # [Art, gemeinsame Attribute, Teile]; Art 'path' (Teile = Pfaddaten) oder Elementname
+        self.elements = []
+
+    def _n(self, v):
+        return _num(v, self.precision)
+
+    def _xy(self, x, y):
+        return self._n(x - self.x), self._n(self.top - y)
+
+    def _add(self, kind, attrs, part):
+        last = self.elements[-1] if self.elements else None
+        if last is not None and last[0] == kind and last[1] == attrs:
+            last[2].append(part)
+        else:
+            self.elements.append([kind, attrs, [part]])
+
+    def _stroke(self, d, color, width):
+        self._add('path', f'fill="none" stroke="{_color(color)}" stroke-width="{self._n(width)}"', d)
+
+    def path(self, points, color, width, closed=False):
+        d = 'M' + 'L'.join('%s %s' % self._xy(*pt) for pt in points) + ('Z' if closed else '')
+        self._stroke(d, color, width)
+
+    def circle(self, x, y, r, color):
+        cx, cy = self._xy(x, y)
+        self._add('circle', f'fill="{_color(color)}"', (f'cx="{cx}" cy="{cy}" r="{self._n(r)}"', None))
+
+    def arc(self, x, y, r, start, extent, color, width):
+        a1, a2 = math.radians(start), math.radians(start + extent)
+        x1, y1 = self._xy(x + r * math.cos(a1), y + r * math.sin(a1))
+        x2, y2 = self._xy(x + r * math.cos(a2), y + r * math.sin(a2))
+        # positive extent = gegen den Uhrzeigersinn, auch nach dem Spiegeln von y; in SVG
+        # (y nach unten) ist das die negative Winkelrichtung, also sweep-flag 0
+        large, sweep = int(abs(extent) > 180), int(extent < 0)
+        self._stroke(f'M{x1} {y1}A{self._n(r)} {self._n(r)} 0 {large} {sweep} {x2} {y2}', color, width)
+
+    def text(self, x, y, text, font, size, color, align='left'):
+        family, weight = SVG_FONTS.get(font, (font, None))
+        tx, ty = self._xy(x, y)
+        attrs = f'font-family={quoteattr(family)} font-size="{self._n(size)}" fill="{_color(color)}"'
+        if weight:
+            attrs += f' font-weight="{weight}"'
+        if SVG_ANCHOR.get(align):
+            attrs += f' text-anchor="{SVG_ANCHOR[align]}"'
+        self._add('text', attrs, (f'x="{tx}" y="{ty}"', escape(text)))
+
+    def _markup(self):
+        out = []
+        for kind, attrs, parts in self.elements:
+            if kind == 'path':
+                out.append(f'<path d="{"".join(parts)}" {attrs}/>')
+                continue
+            inner = [f'<{kind} {pos}/>' if body is None else f'<{kind} {pos}>{body}</{kind}>' for pos, body in parts]
+            if len(parts) == 1:
+                pos, body = parts[0]
+                out.append(f'<{kind} {pos} {attrs}/>' if body is None else f'<{kind} {pos} {attrs}>{body}</{kind}>')
+            else:
+                out.append(f'<g {attrs}>{"".join(inner)}</g>')
+        return ''.join(out)
+
+    def svg(self):
+        # Labels dürfen wie im PDF über die Box hinausragen
+        w, h = self._n(self.width), self._n(self.height)
+        return (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {w} {h}" width="{w}" height="{h}" '
+                'overflow="visible">'
+                + self._markup() + '</svg>')
@@ -1,7 +1,14 @@
 """Wiederverwendbare Hilfsfunktionen zum Zeichnen rechtwinkliger Dreiecke
-auf einem reportlab-Canvas (Vektorgrafik, kein Raster)."""
+auf einem reportlab-Canvas (Vektorgrafik, kein Raster).
+
+Gezeichnet wird über die Backends aus triangle_backends (path, circle, arc, text); aus
+einer Geometrie entstehen so das Dreieck im PDF und - über triangle_svg - dasselbe
+Dreieck als Inline-SVG für die Web-App.
+"""
 import math
 
+from triangle_backends import ReportlabBackend, SvgBackend
+
 BLACK = (0.12, 0.16, 0.22)
 RED = (0.86, 0.15, 0.15)
 GRAY = (0.42, 0.45, 0.5)
@@ -35,23 +42,30 @@ def _arc_params(vx, vy, p1x, p1y, p2x, p2y):
     return a1, delta
 
 
-def draw_triangle(c, box_x, box_y, box_w, box_h, right_vertex,
-                   leg_lengths, side_display, angle_display, flip=False):
+# Abstände der Labels (PDF-Punkte)
+MARGIN = 30
+VERTEX_LABEL_OFFSET = 15
+SIDE_LABEL_OFFSET = 17
+RIGHT_ANGLE_SQUARE = 9
+ARC_RADIUS = 16
+ARC_LABEL_OFFSET = 13
+BASELINE_SHIFT = 3
+
+
+def triangle_geometry(box_x, box_y, box_w, box_h, right_vertex, leg_lengths, flip=False):
     """
-    box_x, box_y: untere linke Ecke des verfügbaren Zeichenbereichs (PDF-Punkte)
-    box_w, box_h: verfügbare Breite/Höhe
-    right_vertex: 'A' | 'B' | 'C' -- an dieser Ecke liegt der rechte Winkel
-    leg_lengths: dict mit den realen Längen der beiden Schenkel, keyed by side letter (a/b/c),
-                 wird genutzt um das Dreieck proportional zu skalieren
-    side_display: dict side_letter -> (text, color) für jede der drei Seiten a,b,c
-    angle_display: dict angle_key('alpha'/'beta'/'gamma') -> (text, color) oder None (keine Anzeige)
-    flip: horizontale Spiegelung für visuelle Abwechslung
+    Layout-Stufe: berechnet alle Koordinaten des Dreiecks, ohne zu zeichnen.
+    Parameter wie bei draw_triangle. Das Ergebnis enthält neben den Eckpunkten
+    (corner/top/right, positions nach Name A/B/C) bereits alle Label-Anker,
+    die Punkte des rechter-Winkel-Quadrats und die Bogenparameter, sodass
+    draw_geometry nur noch abspielen muss. triangle_layout.geometry_at liefert
+    dasselbe Format aus einer vektorisierten Batch-Berechnung.
     """
     layout = LAYOUT[right_vertex]
     corner_top_len = leg_lengths[layout['corner_top']]
     corner_right_len = leg_lengths[layout['corner_right']]
 
-    margin = 30
+    margin = MARGIN
     avail_w = box_w - 2 * margin
     avail_h = box_h - 2 * margin
     scale = min(avail_w / corner_right_len, avail_h / corner_top_len)
@@ -70,88 +84,158 @@ def draw_triangle(c, box_x, box_y, box_w, box_h, right_vertex,
 
     positions = {layout['corner']: corner, layout['top']: top, layout['right']: right}
     pA, pB, pC = positions['A'], positions['B'], positions['C']
-
-    # Dreieck (Umriss)
-    c.setLineWidth(1.3)
-    c.setStrokeColorRGB(*BLACK)
-    c.setFillColorRGB(*BLACK)
-    p = c.beginPath()
-    p.moveTo(*pA)
-    p.lineTo(*pB)
-    p.lineTo(*pC)
-    p.close()
-    c.drawPath(p, stroke=1, fill=0)
-
-    # Eckpunkte (kleine Punkte)
-    for pt in (pA, pB, pC):
-        c.circle(pt[0], pt[1], 1.6, stroke=0, fill=1)
+    centroid = ((pA[0] + pB[0] + pC[0]) / 3, (pA[1] + pB[1] + pC[1]) / 3)
 
     # Punktlabels A/B/C nach außen versetzt (Schwerpunkt-Methode)
-    centroid = ((pA[0] + pB[0] + pC[0]) / 3, (pA[1] + pB[1] + pC[1]) / 3)
-    c.setFont('Helvetica-Bold', 10)
+    vertex_labels = []
     for name, pt in (('A', pA), ('B', pB), ('C', pC)):
         dx, dy = pt[0] - centroid[0], pt[1] - centroid[1]
         ux, uy = _norm(dx, dy)
-        lx, ly = pt[0] + ux * 15, pt[1] + uy * 15
-        if dx > 4:
-            c.drawString(lx, ly - 3, name)
-        elif dx < -4:
-            c.drawRightString(lx, ly - 3, name)
-        else:
-            c.drawCentredString(lx, ly - 3, name)
+        lx, ly = pt[0] + ux * VERTEX_LABEL_OFFSET, pt[1] + uy * VERTEX_LABEL_OFFSET
+        align = 'left' if dx > 4 else 'right' if dx < -4 else 'centre'
+        vertex_labels.append((name, lx, ly - BASELINE_SHIFT, align))
 
     # Rechter-Winkel-Markierung an "corner" (kleines Quadrat)
-    sq = 9
+    sq = RIGHT_ANGLE_SQUARE
     cx, cy = corner
     dir_top = _norm(top[0] - cx, top[1] - cy)
     dir_right = _norm(right[0] - cx, right[1] - cy)
     p1 = (cx + dir_top[0] * sq, cy + dir_top[1] * sq)
     p2 = (cx + dir_top[0] * sq + dir_right[0] * sq, cy + dir_top[1] * sq + dir_right[1] * sq)
     p3 = (cx + dir_right[0] * sq, cy + dir_right[1] * sq)
-    c.setLineWidth(1)
-    c.setStrokeColorRGB(*GRAY)
-    sqpath = c.beginPath()
-    sqpath.moveTo(*p1)
-    sqpath.lineTo(*p2)
-    sqpath.lineTo(*p3)
-    c.drawPath(sqpath, stroke=1, fill=0)
 
     # Seitenlabels (Mittelpunkt + nach außen versetzt, weg vom Schwerpunkt)
-    c.setFont('Helvetica', 9.5)
-    sides = {
-        layout['corner_top']: (corner, top),
-        layout['corner_right']: (corner, right),
-        layout['hyp']: (top, right),
-    }
-    for side_letter, (p_start, p_end) in sides.items():
-        text, color = side_display[side_letter]
+    side_labels = []
+    for side_letter, (p_start, p_end) in ((layout['corner_top'], (corner, top)),
+                                          (layout['corner_right'], (corner, right)),
+                                          (layout['hyp'], (top, right))):
         mid = ((p_start[0] + p_end[0]) / 2, (p_start[1] + p_end[1]) / 2)
         dx, dy = mid[0] - centroid[0], mid[1] - centroid[1]
         ux, uy = _norm(dx, dy)
-        lx, ly = mid[0] + ux * 17, mid[1] + uy * 17
-        c.setFillColorRGB(*color)
-        c.drawCentredString(lx, ly - 3, text)
+        lx, ly = mid[0] + ux * SIDE_LABEL_OFFSET, mid[1] + uy * SIDE_LABEL_OFFSET
+        side_labels.append((side_letter, lx, ly - BASELINE_SHIFT))
 
     # Winkel-Bögen an "top" und "right" (corner hat das rechte-Winkel-Quadrat)
-    radius = 16
+    arcs = []
+    radius = ARC_RADIUS
     for vertex_name in (layout['top'], layout['right']):
-        angle_key = ANGLE_AT[vertex_name]
-        if angle_display.get(angle_key) is None:
-            continue
-        text, color = angle_display[angle_key]
         vx, vy = positions[vertex_name]
         others = [positions[v] for v in ('A', 'B', 'C') if v != vertex_name]
         start, extent = _arc_params(vx, vy, others[0][0], others[0][1], others[1][0], others[1][1])
-        c.setStrokeColorRGB(*color)
-        c.setLineWidth(1.1)
-        c.arc(vx - radius, vy - radius, vx + radius, vy + radius, start, extent)
         a1 = math.radians(start)
         a2 = math.radians(start + extent)
         bis_x, bis_y = math.cos((a1 + a2) / 2), math.sin((a1 + a2) / 2)
-        lx, ly = vx + bis_x * (radius + 13), vy + bis_y * (radius + 13)
-        c.setFillColorRGB(*color)
-        c.setFont('Helvetica', 10)
-        c.drawCentredString(lx, ly - 3, text)
+        lx, ly = vx + bis_x * (radius + ARC_LABEL_OFFSET), vy + bis_y * (radius + ARC_LABEL_OFFSET)
+        arcs.append((vertex_name, vx, vy, start, extent, lx, ly - BASELINE_SHIFT))
 
+    return dict(box=(box_x, box_y, box_w, box_h), right_vertex=right_vertex, flip=flip,
+                layout=layout, corner=corner, top=top, right=right,
+                positions=positions, centroid=centroid, w=w, h=h,
+                vertex_labels=vertex_labels, square=(p1, p2, p3),
+                side_labels=side_labels, arcs=arcs)
+
+
+def _draw_static(out, geom):
+    """Alles, was nur von der Geometrie abhängt: Umriss, Eckpunkte, Punktlabels, rechter Winkel."""
+    positions = geom['positions']
+    pA, pB, pC = positions['A'], positions['B'], positions['C']
+
+    # Dreieck (Umriss)
+    out.path((pA, pB, pC), BLACK, 1.3, closed=True)
+
+    # Eckpunkte (kleine Punkte)
+    for pt in (pA, pB, pC):
+        out.circle(pt[0], pt[1], 1.6, BLACK)
+
+    for name, lx, ly, align in geom['vertex_labels']:
+        out.text(lx, ly, name, 'Helvetica-Bold', 10, BLACK, align)
+
+    out.path(geom['square'], GRAY, 1)
+
+
+def _draw_labels(out, geom, side_display, angle_display):
+    """Alles, was sich pro Aufgabe ändert: Seitenlabels, Winkelbögen und Winkellabels (mit Farben)."""
+    for side_letter, lx, ly in geom['side_labels']:
+        text, color = side_display[side_letter]
+        out.text(lx, ly, text, 'Helvetica', 9.5, color, 'centre')
+
+    for vertex_name, vx, vy, start, extent, lx, ly in geom['arcs']:
+        angle_key = ANGLE_AT[vertex_name]
+        if angle_display.get(angle_key) is None:
+            continue
+        text, color = angle_display[angle_key]
+        out.arc(vx, vy, ARC_RADIUS, start, extent, color, 1.1)
+        out.text(lx, ly, text, 'Helvetica', 10, color, 'centre')
+
+
+def _form_name(geom):
+    # Name kodiert alles, wovon _draw_static abhängt -> gleiche Geometrie, gleiche Form
+    _, _, box_w, box_h = geom['box']
+    return 'tri%s%d_%d_%d_%d_%d' % (geom['right_vertex'], geom['flip'], round(geom['w'] * 100),
+                                    round(geom['h'] * 100), round(box_w * 100), round(box_h * 100))
+
+
+def draw_geometry(c, geom, side_display, angle_display, reuse_form=False):
+    """
+    Zeichen-Stufe: spielt eine fertig berechnete Geometrie (triangle_geometry oder
+    triangle_layout.geometry_at) auf dem Canvas ab. Parameter wie bei draw_triangle.
+    Danach sind Füll- und Strichfarbe wieder schwarz.
+    """
+    out = ReportlabBackend(c)
+    if reuse_form:
+        box_x, box_y, box_w, box_h = geom['box']
+        name = _form_name(geom)
+        if not c.hasForm(name):
+            # Form in Box-Koordinaten anlegen, damit sie an jeder Position passt
+            c.beginForm(name, -20, -20, box_w + 20, box_h + 20)
+            c.translate(-box_x, -box_y)
+            _draw_static(out, geom)
+            c.endForm()
+        c.saveState()
+        c.translate(box_x, box_y)
+        c.doForm(name)
+        c.restoreState()
+    else:
+        _draw_static(out, geom)
+    _draw_labels(out, geom, side_display, angle_display)
     c.setFillColorRGB(*BLACK)
     c.setStrokeColorRGB(*BLACK)
+
+
+def triangle_svg(geom, side_display, angle_display):
+    """Dieselbe Skizze wie draw_geometry als Inline-SVG (Ausschnitt: die Box des Dreiecks)."""
+    out = SvgBackend(*geom['box'])
+    _draw_static(out, geom)
+    _draw_labels(out, geom, side_display, angle_display)
+    return out.svg()
+
+
+def draw_triangle(c, box_x, box_y, box_w, box_h, right_vertex,
+                   leg_lengths, side_display, angle_display, flip=False, reuse_form=False):
+    """
+    box_x, box_y: untere linke Ecke des verfügbaren Zeichenbereichs (PDF-Punkte)
+    box_w, box_h: verfügbare Breite/Höhe
+    right_vertex: 'A' | 'B' | 'C' -- an dieser Ecke liegt der rechte Winkel
+    leg_lengths: dict mit den realen Längen der beiden Schenkel, keyed by side letter (a/b/c),
+                 wird genutzt um das Dreieck proportional zu skalieren
+    side_display: dict side_letter -> (text, color) für jede der drei Seiten a,b,c
+    angle_display: dict angle_key('alpha'/'beta'/'gamma') -> (text, color) oder None (keine Anzeige)
+    flip: horizontale Spiegelung für visuelle Abwechslung
+    reuse_form: statische Geometrie (Umriss, Eckpunkte, A/B/C, rechter Winkel) einmal pro
+                Dokument als Form-XObject ablegen und per doForm wiederverwenden; nur Labels,
+                Bögen und Farben werden pro Aufgabe gezeichnet
+
+    Hat der Canvas eine Liste c.previews (siehe pdf_output.write_previews), wird aus
+    derselben Geometrie zusätzlich triangle_svg angehängt.
+    """
+    trace = getattr(c, 'trace', None)  # render_trace.TracingCanvas (PDF_TRACE)
+    if trace is not None:
+        with trace.triangle():
+            geom = triangle_geometry(box_x, box_y, box_w, box_h, right_vertex, leg_lengths, flip)
+            draw_geometry(c, geom, side_display, angle_display, reuse_form)
+    else:
+        geom = triangle_geometry(box_x, box_y, box_w, box_h, right_vertex, leg_lengths, flip)
+        draw_geometry(c, geom, side_display, angle_display, reuse_form)
+    previews = getattr(c, 'previews', None)
+    if previews is not None:
+        previews.append(triangle_svg(geom, side_display, angle_display))
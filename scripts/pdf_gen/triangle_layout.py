@@ -0,0 +1,158 @@
+"""Vektorisierte Layout-Stufe für viele rechtwinklige Dreiecke auf einmal (NumPy).
+
+Rechnet dieselben Koordinaten wie triangle_draw.triangle_geometry, aber für N Dreiecke
+gleichzeitig als struct-of-arrays. Damit lassen sich große zufällige Aufgabenbanken
+in einem Rutsch layouten und prüfen; gezeichnet wird anschließend mit
+triangle_draw.draw_geometry(c, geometry_at(lay, i), ...).
+
+    lay = layout_batch([(x, y, w, h, 'C', {'a': 7, 'b': 5}, False), ...])
+    ok = validate(lay)
+"""
+import numpy as np
+
+from triangle_draw import (LAYOUT, MARGIN, VERTEX_LABEL_OFFSET, SIDE_LABEL_OFFSET,
+                           RIGHT_ANGLE_SQUARE, ARC_RADIUS, ARC_LABEL_OFFSET, BASELINE_SHIFT)
+
+VERTICES = ('A', 'B', 'C')
+SIDES = ('a', 'b', 'c')
+ALIGN = ('left', 'right', 'centre')
+
+# Index-Tabellen je right_vertex (Zeile 0/1/2 = 'A'/'B'/'C'): welche Ecke ist corner/top/right
+_CORNER = np.array([VERTICES.index(LAYOUT[v]['corner']) for v in VERTICES])
+_TOP = np.array([VERTICES.index(LAYOUT[v]['top']) for v in VERTICES])
+_RIGHT = np.array([VERTICES.index(LAYOUT[v]['right']) for v in VERTICES])
+# Zu jeder Ecke die beiden anderen in A/B/C-Reihenfolge (wie in triangle_geometry)
+_OTHERS = np.array([[j for j in range(3) if j != i] for i in range(3)])
+
+
+def _unit(v):
+    length = np.hypot(v[..., 0], v[..., 1])
+    length = np.where(length == 0, 1.0, length)
+    return v / length[..., None]
+
+
+def layout_arrays(box_x, box_y, box_w, box_h, right_idx, top_len, right_len, flip):
+    """
+    Kern der Batch-Berechnung, alle Argumente sind Arrays der Länge N:
+    right_idx 0/1/2 für rechten Winkel bei A/B/C, top_len/right_len sind die realen Längen
+    des senkrechten bzw. waagrechten Schenkels, flip ist bool.
+    Liefert ein dict von Arrays (siehe geometry_at für die Bedeutung der Felder).
+    """
+    box_x, box_y, box_w, box_h, top_len, right_len = (
+        np.asarray(a, dtype=float) for a in (box_x, box_y, box_w, box_h, top_len, right_len))
+    right_idx = np.asarray(right_idx, dtype=np.intp)
+    flip = np.asarray(flip, dtype=bool)
+    n = right_idx.shape[0]
+    rows = np.arange(n)
+
+    scale = np.minimum((box_w - 2 * MARGIN) / right_len, (box_h - 2 * MARGIN) / top_len)
+    w = right_len * scale
+    h = top_len * scale
+
+    cx = np.where(flip, box_x + box_w - MARGIN, box_x + MARGIN)
+    cy = box_y + MARGIN
+    corner = np.stack([cx, cy], axis=1)
+    top = np.stack([cx, cy + h], axis=1)
+    right = np.stack([np.where(flip, cx - w, cx + w), cy], axis=1)
+
+    corner_i, top_i, right_i = _CORNER[right_idx], _TOP[right_idx], _RIGHT[right_idx]
+    vertices = np.empty((n, 3, 2))
+    vertices[rows, corner_i] = corner
+    vertices[rows, top_i] = top
+    vertices[rows, right_i] = right
+    centroid = (vertices[:, 0] + vertices[:, 1] + vertices[:, 2]) / 3
+
+    # Punktlabels
+    d = vertices - centroid[:, None, :]
+    vertex_anchor = vertices + _unit(d) * VERTEX_LABEL_OFFSET
+    vertex_anchor[..., 1] -= BASELINE_SHIFT
+    vertex_align = np.where(d[..., 0] > 4, 0, np.where(d[..., 0] < -4, 1, 2))
+
+    # Rechter-Winkel-Quadrat
+    dir_top = _unit(top - corner) * RIGHT_ANGLE_SQUARE
+    dir_right = _unit(right - corner) * RIGHT_ANGLE_SQUARE
+    square = np.stack([corner + dir_top, corner + dir_top + dir_right, corner + dir_right], axis=1)
+
+    # Seitenlabels: Seite a/b/c liegt gegenüber A/B/C, also zwischen den beiden anderen Ecken
+    mids = (vertices[:, _OTHERS[:, 0]] + vertices[:, _OTHERS[:, 1]]) / 2
+    side_anchor = mids + _unit(mids - centroid[:, None, :]) * SIDE_LABEL_OFFSET
+    side_anchor[..., 1] -= BASELINE_SHIFT
+
+    # Winkelbögen an top und right
+    arc_vertex = np.stack([top_i, right_i], axis=1)
+    v = vertices[rows[:, None], arc_vertex]
+    o1 = vertices[rows[:, None], _OTHERS[arc_vertex, 0]]
+    o2 = vertices[rows[:, None], _OTHERS[arc_vertex, 1]]
+    a1 = np.degrees(np.arctan2(o1[..., 1] - v[..., 1], o1[..., 0] - v[..., 0]))
+    a2 = np.degrees(np.arctan2(o2[..., 1] - v[..., 1], o2[..., 0] - v[..., 0]))
+    extent = a2 - a1
+    extent = np.where(extent <= -180, extent + 360, extent)
+    extent = np.where(extent > 180, extent - 360, extent)
+    bis = (np.radians(a1) + np.radians(a1 + extent)) / 2
+    reach = ARC_RADIUS + ARC_LABEL_OFFSET
+    arc_anchor = np.stack([v[..., 0] + np.cos(bis) * reach,
+                           v[..., 1] + np.sin(bis) * reach - BASELINE_SHIFT], axis=-1)
+
+    return dict(box=np.stack([box_x, box_y, box_w, box_h], axis=1), right_idx=right_idx, flip=flip,
+                w=w, h=h, vertices=vertices, centroid=centroid,
+                corner_idx=corner_i, top_idx=top_i, right_vertex_idx=right_i,
+                vertex_anchor=vertex_anchor, vertex_align=vertex_align, square=square,
+                side_anchor=side_anchor, arc_vertex=arc_vertex, arc_start=a1, arc_extent=extent,
+                arc_anchor=arc_anchor)
+
+
+def layout_batch(specs):
+    """
+    specs: Folge von (box_x, box_y, box_w, box_h, right_vertex, leg_lengths, flip) -
+    dieselben Argumente wie bei triangle_draw.triangle_geometry.
+    """
+    box_x, box_y, box_w, box_h, right_vertex, leg_lengths, flip = zip(*specs)
+    top_len = [legs[LAYOUT[rv]['corner_top']] for rv, legs in zip(right_vertex, leg_lengths)]
+    right_len = [legs[LAYOUT[rv]['corner_right']] for rv, legs in zip(right_vertex, leg_lengths)]
+    right_idx = [VERTICES.index(rv) for rv in right_vertex]
+    return layout_arrays(box_x, box_y, box_w, box_h, right_idx, top_len, right_len, flip)
+
+
+def validate(lay, min_leg=12.0, pad=0.0):
+    """
+    Bool-Maske der brauchbaren Layouts: alle Koordinaten endlich, beide Schenkel
+    mindestens min_leg Punkte lang und sämtliche Label-Anker innerhalb der Box
+    (um pad erweitert).
+    """
+    box = lay['box']
+    x0, y0 = box[:, 0] - pad, box[:, 1] - pad
+    x1, y1 = box[:, 0] + box[:, 2] + pad, box[:, 1] + box[:, 3] + pad
+    anchors = np.concatenate([lay['vertices'], lay['vertex_anchor'], lay['side_anchor'],
+                              lay['arc_anchor']], axis=1)
+    finite = np.isfinite(anchors).all(axis=(1, 2))
+    inside = ((anchors[..., 0] >= x0[:, None]) & (anchors[..., 0] <= x1[:, None])
+              & (anchors[..., 1] >= y0[:, None]) & (anchors[..., 1] <= y1[:, None])).all(axis=1)
+    return finite & inside & (lay['w'] >= min_leg) & (lay['h'] >= min_leg)
+
+
+def geometry_at(lay, i):
+    """Baut für Dreieck i das dict im Format von triangle_geometry (für draw_geometry)."""
+    right_vertex = VERTICES[lay['right_idx'][i]]
+    layout = LAYOUT[right_vertex]
+    vertices = lay['vertices'][i]
+    positions = {name: tuple(vertices[j].tolist()) for j, name in enumerate(VERTICES)}
+    side_anchor = lay['side_anchor'][i]
+    side_order = (layout['corner_top'], layout['corner_right'], layout['hyp'])
+    arcs = []
+    for k in range(2):
+        j = lay['arc_vertex'][i, k]
+        vx, vy = vertices[j].tolist()
+        lx, ly = lay['arc_anchor'][i, k].tolist()
+        arcs.append((VERTICES[j], vx, vy, float(lay['arc_start'][i, k]), float(lay['arc_extent'][i, k]), lx, ly))
+    return dict(
+        box=tuple(lay['box'][i].tolist()), right_vertex=right_vertex, flip=bool(lay['flip'][i]),
+        layout=layout,
+        corner=positions[layout['corner']], top=positions[layout['top']], right=positions[layout['right']],
+        positions=positions, centroid=tuple(lay['centroid'][i].tolist()),
+        w=float(lay['w'][i]), h=float(lay['h'][i]),
+        vertex_labels=[(name, *lay['vertex_anchor'][i, j].tolist(), ALIGN[lay['vertex_align'][i, j]])
+                       for j, name in enumerate(VERTICES)],
+        square=tuple(tuple(p) for p in lay['square'][i].tolist()),
+        side_labels=[(s, *side_anchor[SIDES.index(s)].tolist()) for s in side_order],
+        arcs=arcs,
+    )